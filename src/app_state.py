@@ -1,19 +1,21 @@
+import sys
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any, Set # Dict might be for current_search_results if not List[Article]
+from typing import Deque, Iterable, List, Optional, Dict, Any, Set # Dict might be for current_search_results if not List[Article]
 
 # Assuming Article model is defined and can be imported
 from src.models.article import Article
 # Assuming constants for defaults are available
 from src.utils import constants
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ReadingPreferences:
-    """Stores user's reading preferences."""
+    """Stores user's reading preferences. Frozen: replace the whole value (dataclasses.replace) to change it."""
     font_family: str = constants.DEFAULT_FONT_FAMILY
     font_size: int = constants.DEFAULT_FONT_SIZE
     theme: str = constants.DEFAULT_THEME # Expected values: "light", "dark", "sepia"
 
-@dataclass
+@dataclass(slots=True)
 class AppState:
     """Holds the application-wide state."""
     
@@ -25,7 +27,7 @@ class AppState:
     last_search_query: Optional[str] = None
     # Assuming search results ideally return Article objects for consistency in UI.
     # If SearchManager returns dicts, this could be List[Dict[str, Any]].
-    current_search_results: List[Article] = field(default_factory=list) 
+    current_search_results: List[Article] = field(default_factory=list)
                                              
     # User preferences (some loaded from settings.yml via ConfigManager into AppState)
     reading_prefs: ReadingPreferences = field(default_factory=ReadingPreferences)
@@ -40,8 +42,10 @@ class AppState:
     last_successful_sync_time_iso: Optional[str] = None # ISO 8601 timestamp
     
     # UI related state
-    status_messages: List[str] = field(default_factory=list) # For displaying messages in a status bar/area
-    all_tags_in_library: Set[str] = field(default_factory=set) # Set of all unique tags in the library
+    # For displaying messages in a status bar/area. Bounded ring buffer: appends are O(1) and old messages fall off.
+    status_messages: Deque[str] = field(default_factory=lambda: deque(maxlen=constants.MAX_STATUS_MESSAGES))
+    # Set of all unique tags in the library; filled via add_article_tags(), which interns them.
+    all_tags_in_library: Set[str] = field(default_factory=set)
     
     # Reference to a Toga widget for status updates, if direct manipulation is chosen.
     # Using Any to avoid direct Toga import dependency at this level if possible,
@@ -54,3 +58,8 @@ class AppState:
     # - current_filter_criteria: Optional[Dict[str, Any]] = None
     # - is_offline_mode: bool = False # Though offline-first is a principle
     # - active_cloud_service_client: Optional[Any] = None # If storing the client instance here (less common)
+
+
+def add_article_tags(state: AppState, tags: Optional[Iterable[str]]) -> None:
+    """Adds an article's tags to the library tag set. Tags are interned since many articles share them."""
+    state.all_tags_in_library.update(map(sys.intern, tags or ()))
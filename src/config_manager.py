@@ -1,55 +1,239 @@
-import yaml
+import functools
+import hashlib
 import os
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from types import MappingProxyType, ModuleType
+from typing import Any, Dict, Mapping, Optional, Set, Tuple, Union
 import logging # For internal logging of config loading issues
 
+from src.utils import constants
+
+try: # Optional: faster JSON sidecar cache for the base config (see _read_sidecar)
+    import orjson
+except ImportError:
+    orjson = None
+
+try: # Optional: typed, attribute-access view of the effective config (see ConfigManager.typed)
+    import msgspec
+    from src.models import config_schema
+except ImportError:
+    msgspec = None
+    config_schema = None
+
+# PyYAML is imported lazily on the first load/save so that processes which never
+# touch configuration files (CLI helpers, tests mocking ConfigManager) skip the
+# import and the _yaml C-extension dlopen entirely. See _yaml().
+_yaml_mod: Optional[ModuleType] = None
+_Loader: Any = None
+_Dumper: Any = None
+
+def _yaml() -> ModuleType:
+    """Imports PyYAML on first use and resolves the fastest available safe loader/dumper."""
+    global _yaml_mod, _Loader, _Dumper
+    if _yaml_mod is None:
+        import yaml as _yaml_mod
+        # Prefer the libyaml C bindings when PyYAML was built with them; fall back to the
+        # pure-Python safe loader/dumper otherwise. Both are "safe" variants.
+        _Loader = getattr(_yaml_mod, "CSafeLoader", _yaml_mod.SafeLoader)
+        _Dumper = getattr(_yaml_mod, "CSafeDumper", _yaml_mod.SafeDumper)
+        if _Loader is _yaml_mod.SafeLoader:
+            logging.getLogger(__name__).warning("🟡 libyaml not available; using pure-Python YAML loader (slower config parsing).")
+        else:
+            logging.getLogger(__name__).debug("Using libyaml C loader/dumper for configuration files.")
+    return _yaml_mod
+
+# Sentinel distinguishing "key absent" from a stored None in dict walks.
+_MISSING = object()
+
+# Mapping types produced by the loader: plain dicts (mutable copies) and read-only proxies (frozen).
+_NESTED_TYPES = (dict, MappingProxyType)
+
+# Latest parse per resolved path: (mtime_ns, size, content hash, frozen mapping). Frozen so it can
+# be handed out without copying. One entry per file, replaced when the file changes, so repeated
+# saves don't grow the cache. The hash lets a file that was touched or re-synced without changing
+# (new mtime, same bytes) skip the parse.
+_YAML_CACHE: Dict[str, Tuple[int, int, str, Mapping[str, Any]]] = {}
+
+def _content_hash(buf: bytes) -> str:
+    return hashlib.blake2b(buf, digest_size=16).hexdigest()
+
+def _freeze(value: Any) -> Any:
+    """Recursively wraps dicts in MappingProxyType and turns lists into tuples, so accidental writes raise."""
+    if type(value) is dict:
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if type(value) is list:
+        return tuple(_freeze(i) for i in value)
+    return value
+
+def _thaw(value: Any) -> Any:
+    """Copies a frozen structure back into plain dicts/lists for callers that mutate it."""
+    if type(value) is MappingProxyType:
+        return {k: _thaw(v) for k, v in value.items()}
+    if type(value) is tuple or type(value) is list:
+        return [_thaw(i) for i in value]
+    return value
+
+# Bump when the sidecar layout changes so old .jsoncache files are ignored.
+_SIDECAR_VERSION = 2
+_SIDECAR_MAGIC = "__purse_config_cache__"
+
+@functools.lru_cache(maxsize=512)
+def _split_path(key_path: str) -> Tuple[str, ...]:
+    """Splits a dotted key path once per process; hot keys are looked up repeatedly by the UI."""
+    return tuple(key_path.split('.'))
+
+def _merge_effective(base: Mapping[str, Any], override: Mapping[str, Any]) -> Dict[str, Any]:
+    """Nested config with settings overrides applied; a None override falls through to base, like get()."""
+    out = _thaw(base)
+    for k, v in override.items():
+        if v is None:
+            continue
+        if type(v) is dict and type(out.get(k)) is dict:
+            out[k] = _merge_effective(out[k], v)
+        else:
+            out[k] = v
+    return out
+
+def _flatten(d: Mapping[str, Any], prefix: str = '', out: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Flattens a nested dict into {dotted_path: value}.
+    Intermediate mappings are emitted as well as leaves so get() on a section
+    (e.g. 'cloud_providers.onedrive') keeps returning the sub-dict. Lists are leaves.
+    """
+    if out is None:
+        out = {}
+    for k, v in d.items():
+        path = f"{prefix}{k}"
+        out[path] = v
+        if type(v) in _NESTED_TYPES:
+            _flatten(v, f"{path}.", out)
+    return out
+
 class ConfigManager:
+    # Keys read on UI hot paths, pre-resolved into plain attributes: (attribute, dotted key, default).
+    # Refreshed whenever settings change; everything else goes through get().
+    _HOT_KEYS: Tuple[Tuple[str, str, Any], ...] = (
+        ('reading_font_family', 'ui.reading_view.font_family', constants.DEFAULT_FONT_FAMILY),
+        ('reading_font_size', 'ui.reading_view.font_size', constants.DEFAULT_FONT_SIZE),
+        ('reading_theme', 'ui.reading_view.theme', constants.DEFAULT_THEME),
+        ('cloud_provider_name', 'cloud.provider_name', None),
+    )
+
     def __init__(self, base_config_path: Union[str, Path] = 'config.yml'):
         self.logger = logging.getLogger(__name__) # Basic logger for now
         self.base_config_path = Path(base_config_path)
-        self.config: Dict[str, Any] = self._load_yaml(self.base_config_path)
+        # Base config is never mutated by the app, so it is shared read-only with the parse cache.
+        self.config: Mapping[str, Any] = self._load_base_yaml(self.base_config_path)
         if not self.config:
-            self.logger.critical(f"🛑 Base configuration '{self.base_config_path}' not found or empty. Application cannot start.")
+            self.logger.critical("🛑 Base configuration '%s' not found or empty. Application cannot start.", self.base_config_path)
             # In a real app, this might be a custom exception or sys.exit
             raise FileNotFoundError(f"Base configuration '{self.base_config_path}' not found or was empty.")
 
         self.settings: Dict[str, Any] = {} # To be loaded later by load_settings()
         self.settings_path: Optional[Path] = None
+        self._ensured_dirs: Set[Path] = set() # Settings parent dirs already mkdir'd this session
 
-    def _load_yaml(self, file_path: Path) -> Dict[str, Any]:
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+        # Dotted-path views of config/settings so get() is a dict probe instead of a nested walk.
+        # The nested dicts stay authoritative (save_settings dumps self.settings).
+        self._flat_config: Dict[str, Any] = _flatten(self.config)
+        self._flat_settings: Dict[str, Any] = {}
+        # Merged view answering get() in one probe: config overlaid with non-None settings
+        # (a None in settings falls through to config, as before).
+        self._lookup: Dict[str, Any] = dict(self._flat_config)
+
+        self.reading_font_family: str = constants.DEFAULT_FONT_FAMILY
+        self.reading_font_size: int = constants.DEFAULT_FONT_SIZE
+        self.reading_theme: str = constants.DEFAULT_THEME
+        self.cloud_provider_name: Optional[str] = None
+        self._refresh_hot()
+        # Typed view behind the `typed` property, built on first access after a settings change
+        # so update_setting() stays O(keys touched) for callers that never read it.
+        self._typed: Optional["config_schema.ConfigSchema"] = None
+        self._typed_stale = True
+
+    def _parse_yaml(self, file_path: Path, sidecar: bool = False) -> Mapping[str, Any]:
+        """
+        Returns the frozen parsed mapping for file_path (cached per path by mtime/size, then by content hash). Errors propagate.
+        With sidecar=True (and orjson installed) a JSON copy next to the file is used to skip YAML parsing.
+        """
+        yaml = _yaml()
+        log = self.logger
+        st = file_path.stat()
+        cache_key = str(file_path.resolve())
+        cached = _YAML_CACHE.get(cache_key)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[3]
+        # Read the whole file in one shot; hashing it is far cheaper than parsing it.
+        buf = file_path.read_bytes()
+        digest = _content_hash(buf)
+        if cached is not None and cached[2] == digest:
+            frozen = cached[3]
+        else:
+            sidecar_path = file_path.with_suffix(file_path.suffix + '.jsoncache') if sidecar and orjson else None
+            data = self._read_sidecar(sidecar_path, digest) if sidecar_path else None
+            if data is None:
+                # Let libyaml decode the UTF-8 bytes in C.
+                data = yaml.load(buf, Loader=_Loader)
                 if data is None: # File is empty
-                    self.logger.warning(f"🟡 Configuration file is empty: {file_path}")
+                    log.warning("🟡 Configuration file is empty: %s", file_path)
                     return {}
                 if not isinstance(data, dict): # File content is not a dict
-                    self.logger.error(f"🛑 Configuration file content is not a dictionary: {file_path}")
-                    # Depending on strictness, could raise error or return empty dict
+                    log.error("🛑 Configuration file content is not a dictionary: %s", file_path)
                     raise ValueError(f"Invalid format in {file_path}: Expected a dictionary.")
-                return data
+                if sidecar_path:
+                    self._write_sidecar(sidecar_path, digest, data)
+            frozen = _freeze(data)
+        _YAML_CACHE[cache_key] = (st.st_mtime_ns, st.st_size, digest, frozen)
+        return frozen
+
+    def _read_sidecar(self, sidecar_path: Path, digest: str) -> Optional[Dict[str, Any]]:
+        """Returns the sidecar's data if it was written by this format version from the same YAML bytes."""
+        try:
+            cached = orjson.loads(sidecar_path.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+        if (type(cached) is dict and cached.get(_SIDECAR_MAGIC) == _SIDECAR_VERSION
+                and cached.get('blake2b') == digest):
+            return cached.get('data')
+        return None
+
+    def _write_sidecar(self, sidecar_path: Path, digest: str, data: Dict[str, Any]) -> None:
+        """Best-effort sidecar refresh; skipped if the YAML doesn't round-trip through JSON unchanged (dates, non-str keys)."""
+        try:
+            payload = orjson.dumps({_SIDECAR_MAGIC: _SIDECAR_VERSION, 'blake2b': digest, 'data': data})
+            if orjson.loads(payload)['data'] != data:
+                self.logger.debug("Config %s not JSON-representable as-is; no sidecar cache written.", sidecar_path)
+                return
+            sidecar_path.write_bytes(payload)
+        except (OSError, TypeError) as e: # Read-only install dir, unserializable values: just parse YAML next time
+            self.logger.debug("Could not write config sidecar cache %s: %s", sidecar_path, e)
+
+    def _load_base_yaml(self, file_path: Path) -> Mapping[str, Any]:
+        """Loads base config read-only. A missing file yields {} (rejected by __init__); other errors raise."""
+        try:
+            # Sidecar only for the base config: settings.yml lives in the cloud-synced folder,
+            # where an extra cache file would be uploaded along with it.
+            return self._parse_yaml(file_path, sidecar=True)
         except FileNotFoundError:
-            # This is critical for base_config_path, handled in __init__
-            # For settings_path, it's a warning as settings might not exist yet.
-            if file_path == self.base_config_path:
-                 # This log might be redundant due to check in __init__ but good for clarity
-                self.logger.error(f"🛑 Base configuration file not found: {file_path}")
-            else:
-                self.logger.warning(f"🟡 Settings file not found (this may be normal): {file_path}")
-            return {}
-        except yaml.YAMLError as e:
-            self.logger.error(f"🛑 Error parsing YAML file {file_path}: {e}")
-            # Depending on strictness, could raise error or return empty dict
-            if file_path == self.base_config_path:
-                raise # Critical for base config
+            return {} # __init__ logs and raises for a missing base config
+        except Exception as e: # YAML syntax, permissions, non-dict content: all fatal for base config
+            self.logger.error("🛑 Error loading base configuration file %s: %s", file_path, e)
+            raise
+
+    def _load_user_yaml(self, file_path: Path) -> Dict[str, Any]:
+        """
+        Loads a user settings file; any failure is logged and yields {} (settings may not exist yet).
+        Returns a plain-dict copy, since self.settings is mutated by update_setting().
+        """
+        try:
+            frozen = self._parse_yaml(file_path)
+        except FileNotFoundError:
+            self.logger.warning("🟡 Settings file not found (this may be normal): %s", file_path)
             return {}
-        except Exception as e: # Catch other potential errors like permission issues
-            self.logger.error(f"🛑 An unexpected error occurred while loading YAML file {file_path}: {e}")
-            if file_path == self.base_config_path:
-                raise # Critical for base config
+        except Exception as e:
+            self.logger.error("🛑 Error loading settings file %s: %s", file_path, e)
             return {}
-
+        return _thaw(frozen)
 
     def get(self, key_path: str, default: Optional[Any] = None) -> Any:
         """
@@ -57,72 +241,140 @@ class ConfigManager:
         Searches settings first, then base config.
         Key_path uses dot notation, e.g., 'logging.log_level'.
         """
-        # Try settings first
-        value = self._get_value_from_dict(self.settings, key_path)
-        if value is not None:
-            return value
+        value = self._lookup.get(key_path, _MISSING)
+        if value is _MISSING:
+            # Not in the merged view (e.g. a caller mutated self.settings directly): walk the nested dicts.
+            keys = _split_path(key_path)
+            value = self._get_value_from_dict(self.settings, keys)
+            if value is None:
+                value = self._get_value_from_dict(self.config, keys)
 
-        # Try base config
-        value = self._get_value_from_dict(self.config, key_path)
-        if value is not None:
-            return value
+        return default if value is None else value
 
-        return default
+    def _get_value_from_dict(self, config_dict: Mapping[str, Any], keys: Tuple[str, ...]) -> Optional[Any]:
+        # Sentinel-based walk: misses are common (settings fall through to base config),
+        # so avoid paying for raising/unwinding a KeyError on each one.
+        value: Any = config_dict
+        for key in keys:
+            if type(value) not in _NESTED_TYPES: # Only mapping navigation; lists/scalars end the walk.
+                return None
+            value = value.get(key, _MISSING)
+            if value is _MISSING:
+                return None
+        return value
 
-    def _get_value_from_dict(self, config_dict: Dict[str, Any], key_path: str) -> Optional[Any]:
-        keys = key_path.split('.')
-        value = config_dict
-        try:
-            for key in keys:
-                if isinstance(value, dict):
-                    value = value[key]
-                # elif isinstance(value, list): # Example: handle list index access if needed, e.g. key[index]
-                #     # This part is not in the workplan spec but could be an extension
-                #     # For now, only dict navigation
-                #     return None 
-                else:
-                    return None # Current key is not a dict, so cannot go deeper
-            return value
-        except (KeyError, TypeError): # KeyError for dict, TypeError if trying to index non-dict/list
-            return None
+    def _refresh_hot(self) -> None:
+        """Re-resolves the _HOT_KEYS attributes from the current config/settings."""
+        for attr, key_path, default in self._HOT_KEYS:
+            setattr(self, attr, self.get(key_path, default))
+
+    @property
+    def typed(self) -> Optional["config_schema.ConfigSchema"]:
+        """
+        Effective config validated into the msgspec ConfigSchema (cfg.typed.ui.reading_view.font_size).
+        Rebuilt lazily after settings change; None without msgspec.
+        """
+        if self._typed_stale and config_schema is not None:
+            self._typed_stale = False
+            try:
+                self._typed = msgspec.convert(_merge_effective(self.config, self.settings), config_schema.ConfigSchema, strict=False)
+            except msgspec.ValidationError as e:
+                # Leave the previous typed view in place; get() still serves the raw values.
+                self.logger.warning("🟡 Configuration does not match the expected schema, typed view not updated: %s", e)
+        return self._typed
+
+    def _settings_changed(self) -> None:
+        """Rebuilds the whole flat settings view (after a full reload)."""
+        self._flat_settings = _flatten(self.settings)
+        self._lookup = dict(self._flat_config)
+        self._lookup.update((k, v) for k, v in self._flat_settings.items() if v is not None)
+        self._refresh_hot()
+        self._typed_stale = True
+
+    def _patch_lookup(self, key_path: str) -> None:
+        """Re-resolves one key of the merged view after its flat settings entry changed."""
+        value = self._flat_settings.get(key_path)
+        if value is None:
+            value = self._flat_config.get(key_path, _MISSING)
+        if value is _MISSING:
+            self._lookup.pop(key_path, None)
+        else:
+            self._lookup[key_path] = value
 
     def load_settings(self, settings_file_path: Union[str, Path]) -> None:
         """Loads user-specific settings from settings.yml."""
         self.settings_path = Path(settings_file_path)
-        self.settings = self._load_yaml(self.settings_path) # _load_yaml handles FileNotFoundError by returning {}
+        self.settings = self._load_user_yaml(self.settings_path) # Returns {} if missing or unreadable
+        self._settings_changed()
         if not self.settings:
-            self.logger.info(f"🟢 User settings file '{self.settings_path}' not found or empty. Using defaults from base config or get() fallbacks.")
+            self.logger.info("🟢 User settings file '%s' not found or empty. Using defaults from base config or get() fallbacks.", self.settings_path)
         else:
-            self.logger.info(f"🟢 User settings loaded from '{self.settings_path}'.")
+            self.logger.info("🟢 User settings loaded from '%s'.", self.settings_path)
 
     def save_settings(self) -> None:
         """Saves current settings to settings.yml."""
-        if not self.settings_path:
+        path = self.settings_path
+        if not path:
             self.logger.warning("🟡 Cannot save settings, path not set. Call load_settings first (even with a non-existent path to define it).")
             return
 
+        tmp_path: Optional[Path] = None
         try:
-            self.settings_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.settings_path, 'w', encoding='utf-8') as f:
-                yaml.dump(self.settings, f, sort_keys=False, indent=2, allow_unicode=True)
-            self.logger.info(f"🟢 Settings saved to '{self.settings_path}'.")
+            yaml = _yaml()
+            parent = path.parent
+            if parent not in self._ensured_dirs: # Skip the mkdir syscall on repeat saves
+                parent.mkdir(parents=True, exist_ok=True)
+                self._ensured_dirs.add(parent)
+            # Write to a sibling temp file and swap it in, so a crash mid-write never leaves a truncated settings.yml.
+            tmp_path = path.with_suffix(path.suffix + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                yaml.dump(self.settings, f, Dumper=_Dumper, sort_keys=False, indent=2, allow_unicode=True)
+            os.replace(tmp_path, path)
+            self.logger.info("🟢 Settings saved to '%s'.", path)
         except Exception as e:
-            self.logger.error(f"🛑 Failed to save settings to '{self.settings_path}': {e}")
+            if tmp_path is not None: # Don't leave it in the synced folder for cloud sync to upload
+                try:
+                    tmp_path.unlink(missing_ok=True)
+                except OSError:
+                    pass
+            self.logger.error("🛑 Failed to save settings to '%s': %s", path, e)
 
     def update_setting(self, key_path: str, value: Any) -> None:
         """Updates a setting in the self.settings dictionary and optionally saves."""
-        keys = key_path.split('.')
+        keys = _split_path(key_path)
         current_level = self.settings # Target self.settings for updates
+        flat = self._flat_settings
+        touched = [key_path] # Flat keys whose merged-view entry must be re-resolved
 
         for i, key in enumerate(keys[:-1]):
             # If a key in the path doesn't exist or is not a dict, create/overwrite it as a dict
             if key not in current_level or not isinstance(current_level.get(key), dict):
                 current_level[key] = {}
+                section_path = '.'.join(keys[:i + 1])
+                flat[section_path] = current_level[key] # New section needs its own flat entry
+                touched.append(section_path)
             current_level = current_level[key]
-        
+
+        # Drop flat entries of the subtree being replaced (only a dict has any), then patch in the new value.
+        # Keeps the update O(keys under the changed node) instead of re-flattening all settings.
+        previous = current_level.get(keys[-1])
+        if isinstance(previous, dict):
+            for stale_key in _flatten(previous, f"{key_path}."):
+                flat.pop(stale_key, None)
+                touched.append(stale_key)
+
         # Set the final key's value
         current_level[keys[-1]] = value
-        self.logger.debug(f"Updated setting '{key_path}' to '{value}' in memory.")
+        flat[key_path] = value
+        if isinstance(value, dict):
+            subtree = _flatten(value, f"{key_path}.")
+            flat.update(subtree)
+            touched.extend(subtree)
+        for touched_key in touched:
+            self._patch_lookup(touched_key)
+        self._refresh_hot()
+        self._typed_stale = True
+        self.logger.debug("Updated setting '%s' to '%s' in memory.", key_path, value)
         # The workplan mentions: "Consider if auto-save is desired or should be explicit call"
         # For now, it's an explicit call to save_settings().
         # If auto-save is desired:
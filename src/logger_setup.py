@@ -1,9 +1,10 @@
+import atexit
 import logging
 import logging.handlers
-from datetime import datetime
+import queue
+import time
 from pathlib import Path
-from typing import TYPE_CHECKING, List, Optional
-import os # Required for os.path.getmtime for sorting log files
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 # Conditional import for ConfigManager to avoid circular dependency at runtime
 # if actual type checking is needed. For a .py file, can often just import.
@@ -14,15 +15,107 @@ if TYPE_CHECKING:
 # Adjust import path if necessary based on project structure
 from src.utils import constants
 
+class CachedTimeFormatter(logging.Formatter):
+    """
+    Formatter that runs time.strftime for %(asctime)s at most once per second instead of once per record.
+    Date formats have one-second resolution (time.strftime has no sub-second directives), so records
+    logged within the same second share the formatted string; default-format milliseconds are added per record.
+    """
+    _cached_second: Optional[int] = None
+    _cached_time: str = ""
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        second = int(record.created)
+        if second != self._cached_second:
+            self._cached_time = time.strftime(datefmt or self.default_time_format, self.converter(record.created))
+            self._cached_second = second
+        if datefmt:
+            return self._cached_time
+        return self.default_msec_format % (self._cached_time, record.msecs)
+
 class EmojiFormatter(logging.Formatter):
     """
     A custom log formatter that adds an emoji based on the log level.
     Uses LOG_EMOJI_MAP from constants.
     """
+    def __init__(self, fmt: Optional[str] = None, datefmt: Optional[str] = None, style: str = '%', validate: bool = True, **kwargs):
+        super().__init__(fmt, datefmt, style, validate, **kwargs)
+        # One plain Formatter per standard level with its emoji baked into the %(emoji_level)s slot of the format
+        # string, indexed like LOG_EMOJI_TUPLE (levelno // 10), so format() just picks one by index instead of
+        # setting record.emoji_level on every record.
+        fmt = fmt or "%(message)s"
+        self._per_level: Tuple[logging.Formatter, ...] = tuple(
+            CachedTimeFormatter(fmt.replace('%(emoji_level)s', emoji), datefmt, style, validate, **kwargs)
+            for emoji in constants.LOG_EMOJI_TUPLE
+        )
+        # Custom (non-multiple-of-10 or above CRITICAL) levels get an empty slot, as before
+        self._default = CachedTimeFormatter(fmt.replace('%(emoji_level)s', ""), datefmt, style, validate, **kwargs)
+
     def format(self, record: logging.LogRecord) -> str:
-        # Get the emoji for the current log level, default to empty string if not found
-        record.emoji_level = constants.LOG_EMOJI_MAP.get(record.levelno, "")
-        return super().format(record)
+        levelno = record.levelno
+        if levelno % 10 == 0 and 0 <= levelno <= logging.CRITICAL:
+            return self._per_level[levelno // 10].format(record)
+        return self._default.format(record)
+
+class BufferedTimedRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """
+    TimedRotatingFileHandler writing through a LOG_FILE_BUFFER_BYTES buffer. StreamHandler flushes after every
+    record (one write syscall per line); here only WARNING and above force a flush, so routine INFO/DEBUG output
+    reaches the disk in large chunks. The buffer is written out on rollover and close (logging.shutdown() at exit).
+    """
+    _flush_now = True
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=LOG_FILE_BUFFER_BYTES, encoding=self.encoding, errors=self.errors)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self._flush_now = record.levelno >= logging.WARNING # Problems should be on disk even if the app then dies
+        super().emit(record)
+
+    def flush(self) -> None:
+        if self._flush_now:
+            super().flush()
+
+# Current log file in the logs directory; rotated copies are LOG_FILE_NAME + ".YYYY-MM-DD"
+LOG_FILE_NAME = "purse.log"
+# Write buffer for the log file; at most this much routine output is lost if the process is killed
+LOG_FILE_BUFFER_BYTES = 64 * 1024
+
+# logging.* config keys setup_logging reads, with the defaults used when they aren't configured
+LOGGING_DEFAULTS: Tuple[Tuple[str, Any], ...] = (
+    ('log_level', 'INFO'),
+    ('logs_dir', 'logs'),
+    ('log_format_console', "%(asctime)s %(emoji_level)s%(name)s - %(message)s"),
+    ('log_format_file', "%(asctime)s [%(levelname)s] %(name)s:%(lineno)d - %(message)s"),
+    ('date_format', "%Y-%m-%d %H:%M:%S"),
+    ('max_log_files', 10),
+)
+
+# Background thread writing queued log records to the real handlers, and the root logger's handler feeding
+# it (see setup_logging)
+_log_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+
+def stop_logging() -> None:
+    """
+    Writes out any queued log records and stops the listener thread. The console/file handlers are then
+    attached to the root logger directly, so records logged afterwards (atexit handlers, threads winding
+    down) are still written, synchronously; logging.shutdown() closes them at exit. Safe to call more than once.
+    """
+    global _log_listener, _queue_handler
+    if _log_listener is None:
+        return
+    root_logger = logging.getLogger()
+    if _queue_handler is not None:
+        root_logger.removeHandler(_queue_handler) # New records stop going to the queue before it's drained
+        _queue_handler = None
+    _log_listener.stop() # Processes what's still queued before returning
+    for handler in _log_listener.handlers:
+        root_logger.addHandler(handler)
+    _log_listener = None
+
+# Records still queued at interpreter exit would be lost with the (daemon) listener thread
+atexit.register(stop_logging)
 
 def setup_logging(config_manager: 'ConfigManager', logs_base_path: Optional[Path] = None) -> Path:
     """
@@ -38,11 +131,13 @@ def setup_logging(config_manager: 'ConfigManager', logs_base_path: Optional[Path
     Returns:
         The absolute path to the initialized logs directory.
     """
-    log_level_str = config_manager.get('logging.log_level', 'INFO').upper()
+    # All logging.* settings read once up front
+    log_cfg: Dict[str, Any] = {key: config_manager.get(f'logging.{key}', default) for key, default in LOGGING_DEFAULTS}
+    log_level_str = log_cfg['log_level'].upper()
     log_level = getattr(logging, log_level_str, logging.INFO)
 
     # Determine logs directory path
-    logs_dir_fragment = config_manager.get('logging.logs_dir', 'logs') # e.g., "logs" or "user_data/logs"
+    logs_dir_fragment = log_cfg['logs_dir'] # e.g., "logs" or "user_data/logs"
     
     if logs_base_path:
         logs_dir_abs = logs_base_path / logs_dir_fragment 
@@ -78,15 +173,13 @@ def setup_logging(config_manager: 'ConfigManager', logs_base_path: Optional[Path
             pass
 
 
-    # Generate timestamped log file name
-    current_time_str = datetime.now().strftime(config_manager.get('logging.date_format_logfile_suffix', '%Y-%m-%d-%H-%M-%S'))
-    log_file_name = f"log-{current_time_str}.log"
-    log_file_path = logs_dir_abs / log_file_name
+    # One log file, rotated at midnight by the handler (previous days get a .YYYY-MM-DD suffix)
+    log_file_path = logs_dir_abs / LOG_FILE_NAME
 
     # Get format strings from config
-    console_format_str = config_manager.get('logging.log_format_console', "%(asctime)s %(emoji_level)s%(name)s - %(message)s")
-    file_format_str = config_manager.get('logging.log_format_file', "%(asctime)s [%(levelname)s] %(name)s:%(lineno)d - %(message)s")
-    date_format_str = config_manager.get('logging.date_format', "%Y-%m-%d %H:%M:%S")
+    console_format_str = log_cfg['log_format_console']
+    file_format_str = log_cfg['log_format_file']
+    date_format_str = log_cfg['date_format']
 
     # Root logger configuration
     root_logger = logging.getLogger()
@@ -98,6 +191,7 @@ def setup_logging(config_manager: 'ConfigManager', logs_base_path: Optional[Path
 
     # Remove any existing handlers to avoid duplication if setup_logging is called multiple times
     # (e.g., in tests or due to app lifecycle).
+    stop_logging() # Flushes and stops the previous call's listener thread, if any
     for handler in root_logger.handlers[:]:
         # Check if it's one of our handlers to be safer, though workplan implies clearing all.
         # For now, clear all as per workplan's spirit.
@@ -109,43 +203,42 @@ def setup_logging(config_manager: 'ConfigManager', logs_base_path: Optional[Path
     console_handler.setLevel(log_level) # Console handler respects the global log level
     console_formatter = EmojiFormatter(fmt=console_format_str, datefmt=date_format_str)
     console_handler.setFormatter(console_formatter)
-    root_logger.addHandler(console_handler)
+    output_handlers: List[logging.Handler] = [console_handler]
 
-    # File Handler (only if logs_dir_abs is valid and writable)
-    if logs_dir_abs.exists() and os.access(logs_dir_abs, os.W_OK):
-        try:
-            file_handler = logging.FileHandler(log_file_path, encoding='utf-8')
-            file_handler.setLevel(log_level) # File handler also respects the global log level
-            file_formatter = logging.Formatter(fmt=file_format_str, datefmt=date_format_str)
-            file_handler.setFormatter(file_formatter)
-            root_logger.addHandler(file_handler)
-
-            # Clean up old log files
-            max_log_files = config_manager.get('logging.max_log_files', 10)
-            if max_log_files > 0: # Ensure max_log_files is positive
-                # List log files, sort by modification time (oldest first)
-                # Glob for "log-*.log" to match the timestamped format
-                existing_logs: List[Path] = sorted(
-                    [p for p in logs_dir_abs.glob('log-*.log') if p.is_file()],
-                    key=os.path.getmtime # os.path.getmtime for Path objects
-                )
-                
-                files_to_delete_count = len(existing_logs) - max_log_files
-                if files_to_delete_count > 0:
-                    logs_to_delete = existing_logs[:files_to_delete_count]
-                    for old_log_file in logs_to_delete:
-                        try:
-                            old_log_file.unlink()
-                        except OSError as e:
-                            # Use a basic print or pre-existing basicConfig logger if root_logger is not fully set up
-                            logging.warning(f"🟡 Could not delete old log file {old_log_file}: {e}")
-            root_logger.info(f"Logging initialized. Level: {log_level_str}. Log file: {log_file_path}")
-        except Exception as e:
-            # Fallback to console if file handler fails for any reason (e.g. disk full)
-            logging.basicConfig(level=log_level) # Ensure basicConfig is set if we only have console
-            root_logger.error(f"🛑 Failed to set up file logging to {log_file_path}: {e}. File logging disabled.")
+    # File Handler: just try to open the file; a missing or unwritable logs directory shows up as OSError
+    file_logging_error: Optional[str] = None
+    try:
+        # Rotation (and deleting files beyond max_log_files) happens inside the handler as it writes, so long
+        # sessions don't grow one giant file and startup doesn't scan the logs directory.
+        max_log_files = log_cfg['max_log_files']
+        file_handler = BufferedTimedRotatingFileHandler(
+            log_file_path, when='midnight', backupCount=max(0, max_log_files), encoding='utf-8', utc=False
+        )
+        file_handler.setLevel(log_level) # File handler also respects the global log level
+        file_formatter = CachedTimeFormatter(fmt=file_format_str, datefmt=date_format_str)
+        file_handler.setFormatter(file_formatter)
+        output_handlers.append(file_handler)
+    except OSError as e: # Includes PermissionError and FileNotFoundError
+        file_logging_error = f"🟡 Log directory {logs_dir_abs} is not writable or does not exist ({e}). File logging disabled."
+    except Exception as e:
+        # Fallback to console if file handler fails for any other reason
+        file_logging_error = f"🛑 Failed to set up file logging to {log_file_path}: {e}. File logging disabled."
+
+    # Log calls only enqueue the record; a listener thread formats it and does the console/file writes,
+    # so logging from the asyncio event loop never blocks on I/O. Handlers still filter by their own level.
+    global _log_listener, _queue_handler
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    root_logger.addHandler(_queue_handler)
+    _log_listener = logging.handlers.QueueListener(log_queue, *output_handlers, respect_handler_level=True)
+    _log_listener.start()
+
+    if file_logging_error is None:
+        root_logger.info(f"Logging initialized. Level: {log_level_str}. Log file: {log_file_path}")
+    elif file_logging_error.startswith("🛑"):
+        root_logger.error(file_logging_error)
     else:
-        root_logger.warning(f"🟡 Log directory {logs_dir_abs} is not writable or does not exist. File logging disabled.")
+        root_logger.warning(file_logging_error)
 
 
     # Example of how to get a logger in other modules:
@@ -169,8 +262,7 @@ else:
                 'logging.max_log_files': 3,
                 'logging.log_format_console': "%(asctime)s %(emoji_level)s[%(levelname)s] %(name)s - %(message)s",
                 'logging.log_format_file': "%(asctime)s [%(levelname)s] %(name)s:%(lineno)d - %(message)s",
-                'logging.date_format': "%Y-%m-%d %H:%M:%S",
-                'logging.date_format_logfile_suffix': '%Y-%m-%d-%H-%M-%S' # Added for testing
+                'logging.date_format': "%Y-%m-%d %H:%M:%S"
             }
         def get(self, key, default=None):
             return self._settings.get(key, default)
@@ -217,17 +309,9 @@ if __name__ == '__main__':
     another_logger.info("Info from another module.")
 
     print(f"Test complete. Check console output and the '{mock_config_manager.get('logging.logs_dir')}' directory for log files.")
-    # Create a few dummy log files to test cleanup
+    # Re-run setup_logging: it should reuse the same purse.log rather than starting a new file
     logs_test_dir = Path(mock_config_manager.get('logging.logs_dir'))
-    if logs_test_dir.exists():
-        for i in range(5):
-            (logs_test_dir / f"log-old-dummy-{i}.log").touch()
-        print(f"Created dummy old log files in {logs_test_dir} to test cleanup on next run.")
-    else:
-        print(f"Log test directory {logs_test_dir} not created, skipping dummy file creation.")
-
-    # Re-run setup_logging to test log cleanup
-    print("\nRe-running setup_logging to test log file cleanup...")
+    print("\nRe-running setup_logging to test handler replacement...")
     setup_logging(mock_config_manager)
-    test_logger.info("Log message after second setup_logging call (for cleanup test).")
-    print(f"Cleanup test complete. Check {logs_test_dir} for number of log files.")
+    test_logger.info("Log message after second setup_logging call.")
+    print(f"Re-run complete. Check {logs_test_dir / LOG_FILE_NAME} for both sets of messages.")
@@ -1,9 +1,15 @@
 import toga
 from toga.style import Pack
 from toga.style.pack import COLUMN, ROW, LEFT, RIGHT, CENTER, BOLD # For potential future use in UI
+import asyncio
+import dataclasses
+import importlib
 import logging
+import threading
+from collections import OrderedDict
+from functools import cached_property
 from pathlib import Path # For type hinting if needed, though mostly handled by services
-from typing import TYPE_CHECKING, List, Optional, Set # Added TYPE_CHECKING and other used types
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple # Added TYPE_CHECKING and other used types
 
 if TYPE_CHECKING:
     from src.models.article import Article
@@ -15,8 +21,8 @@ if TYPE_CHECKING:
 
 # Core application components
 from src.config_manager import ConfigManager
-from src.logger_setup import setup_logging # setup_logging needs ConfigManager
-from src.app_state import AppState, ReadingPreferences # ReadingPreferences for type hinting
+from src.logger_setup import setup_logging, stop_logging # setup_logging needs ConfigManager
+from src.app_state import AppState, ReadingPreferences, add_article_tags # ReadingPreferences for type hinting
 from src.utils import constants, common # For APP_NAME, APP_ID, etc.
 
 # Services
@@ -29,11 +35,8 @@ from src.services.notification_service import NotificationService
 from src.services.tts_service import TTSService
 from src.services.sync_manager import SyncManager
 
-# Cloud Service Implementations (import all, but only instantiate configured one)
+# Cloud Service Implementations: each pulls in its provider SDK, so only the configured one is imported (see cloud_service)
 from src.services.cloud_storage.base_cloud_service import BaseCloudService
-from src.services.cloud_storage.dropbox_service import DropboxService
-from src.services.cloud_storage.google_drive_service import GoogleDriveService
-from src.services.cloud_storage.onedrive_service import OneDriveService
 
 # UI Placeholders (not fully used in this step, but good for structure)
 # from src.ui.main_app_window import MainAppWindow # Example if UI was more built out
@@ -44,45 +47,61 @@ from src.services.cloud_storage.onedrive_service import OneDriveService
 logger = logging.getLogger(__name__)
 
 
+# config.yml at the project root (src/main.py -> ../config.yml), fixed relative to this file rather than the CWD
+PROJECT_CONFIG_PATH = Path(__file__).resolve().parent.parent / "config.yml"
+# Resolved config.yml location, cached for the process (see PurseApp._resolve_config_path)
+_config_file_path: Optional[Path] = None
+
+# Pocket import pipeline: concurrent per-article workers, and how many yielded articles may wait for one
+POCKET_IMPORT_WORKERS = 8
+POCKET_IMPORT_QUEUE_SIZE = 32
+# Imported articles are indexed in batches of this many (SearchManager.add_or_update_bulk, one commit each)
+POCKET_IMPORT_INDEX_BATCH_SIZE = 500
+# Per-URL record of imported articles (in the app data dir) so re-running an import skips them
+POCKET_IMPORT_CACHE_FILENAME = "pocket-import-cache.json"
+# Thumbnail source URLs remembered this session (LRU) with the file already saved for them
+THUMBNAIL_URL_CACHE_MAX = 512
+
+# Main window styles, built once. Widgets copy the style they're given, so sharing these templates is safe.
+MAIN_BOX_STYLE = Pack(direction=COLUMN, padding=10)
+WELCOME_LABEL_STYLE = Pack(text_align=CENTER, padding_bottom=10)
+STATUS_LABEL_STYLE = Pack(padding_top=5)
+
+# ReadingPreferences field -> ConfigManager hot attribute it's refreshed from (defaults already applied there)
+_READING_PREFS_MAP: Tuple[Tuple[str, str], ...] = (
+    ('font_family', 'reading_font_family'),
+    ('font_size', 'reading_font_size'),
+    ('theme', 'reading_theme'),
+)
+
+
 class PurseApp(toga.App):
+    # Cloud provider name (each service's PROVIDER_NAME) -> (module, class). Only the configured provider's module
+    # is imported, since each pulls in its SDK (see cloud_service).
+    _CLOUD_PROVIDERS: Dict[str, Tuple[str, str]] = {
+        "Dropbox": ("src.services.cloud_storage.dropbox_service", "DropboxService"),
+        "GoogleDrive": ("src.services.cloud_storage.google_drive_service", "GoogleDriveService"),
+        "OneDrive": ("src.services.cloud_storage.onedrive_service", "OneDriveService"),
+    }
+
+    def _resolve_config_path(self) -> Path:
+        """
+        Where config.yml is: the project root in a source checkout, else the app bundle's resources
+        directory (Briefcase puts bundled files under self.paths.app). Looked up once per process.
+        If neither exists, ConfigManager raises FileNotFoundError for the bundle path.
+        """
+        global _config_file_path
+        if _config_file_path is None:
+            _config_file_path = PROJECT_CONFIG_PATH if PROJECT_CONFIG_PATH.is_file() else self.paths.app / "config.yml"
+        return _config_file_path
+
     def startup(self):
         """
         Construct and show the Toga application.
         This method is called once when the application is starting.
         """
         # 0. Base configuration (config.yml - provides defaults before any user settings)
-        # The workplan implies config.yml is at project root, or relative to where app runs.
-        # For a packaged app, it might be bundled. Assuming 'config.yml' is findable.
-        # If packaged with Briefcase, path might need to be self.paths.app / 'config.yml'
-        # For now, direct path, assuming CWD or Python path allows finding it.
-        # If purse/config.yml, then path should be relative to main.py location.
-        # Assuming main.py is in purse/src/purse/, then config.yml is ../../config.yml
-        # This needs to be robust for packaged app. For now, relative to expected execution.
-        # Let's assume config.yml is in the same directory as the main module or easily found.
-        # For Briefcase, resources are often in `self.paths.app`.
-        # A common pattern: if `self.paths.app / 'config.yml'` doesn't exist, copy from template.
-        # For now, let's assume it's at a location findable by a simple path.
-        # If `main.py` is in `src/purse`, then `config.yml` at project root is `Path(__file__).parent.parent.parent / 'config.yml'`
-        
-        # For simplicity, assume config.yml is in the expected location relative to where the app is run
-        # or that PYTHONPATH is set up. If running `python -m purse` from project root,
-        # `config.yml` should be found. If running from `src/purse`, then `../../config.yml`.
-        # Briefcase places resources under `self.paths.app`.
-        # Let's use a path relative to this file for development, assuming standard project structure.
-        # `main.py` is in `src/purse/`. `config.yml` is in `purse/` at project root.
-        # So, path from `src/purse/main.py` to `config.yml` is `../../../config.yml` (if project root is `purse`)
-        # Or, if project root is parent of `purse`, then `../../config.yml`.
-        # The subtask assumes 'config.yml'. This implies it's in the CWD or Python path.
-        # To make it more robust for typical execution from project root (`python -m purse`):
-        config_file_path = Path("config.yml") # Assumes in CWD (e.g. project root)
-        if not config_file_path.exists():
-            # Fallback for when running from src/purse or if structure is different
-            # This is heuristic. A proper app would use appdirs or defined resource paths.
-            alt_path1 = Path(__file__).parent.parent.parent / "config.yml" # if project root is parent of "purse" dir
-            alt_path2 = Path(__file__).parent.parent / "config.yml" # if main.py is in "purse/src" and config.yml in "purse"
-            if alt_path1.exists(): config_file_path = alt_path1
-            elif alt_path2.exists(): config_file_path = alt_path2
-            # If still not found, ConfigManager will raise FileNotFoundError.
+        config_file_path = self._resolve_config_path()
 
         self.config_manager = ConfigManager(base_config_path=config_file_path)
 
@@ -111,50 +130,38 @@ class PurseApp(toga.App):
         self.fs_manager = FileSystemManager(self.config_manager, toga_app=self)
         logger.info(f"FileSystemManager initialized. App data dir: {self.fs_manager.app_data_dir}")
 
+        # --- Remaining services are built on first use (see the properties below), not here: only what the
+        # main window needs is on the startup path. Cloud/sync setup and the article load run after it's shown.
+        self._content_parser: Optional[ContentParserService] = None
+        self._search_manager: Optional[SearchManager] = None
+        # Built from worker threads (see _service_off_loop); the lock keeps two threads from opening the index twice
+        self._search_manager_lock = threading.Lock()
+        self._tts_service: Optional[TTSService] = None
+        self._notification_service: Optional[NotificationService] = None
+        self._pocket_importer: Optional[PocketImporterService] = None
+        # Thumbnail source URL -> saved thumbnail (relative to the sync root), most recently used last.
+        # Articles sharing an image (site logos, category og:images) get a copy instead of another download.
+        self._thumb_url_cache: "OrderedDict[str, str]" = OrderedDict()
+
+        # cloud_service and sync_manager are cached properties, first built by _initialize_deferred_services
+        # Set once _initialize_deferred_services has finished; actions that need those services wait on it.
+        self.services_ready = asyncio.Event()
+
         # --- Load settings after core services that might provide paths or need early config ---
         self._load_device_specific_settings() # Loads local, non-synced settings
         self._attempt_load_synced_settings()  # Loads synced settings.yml if configured
 
-        # --- Initialize remaining services that might depend on fully configured ConfigManager/AppState ---
-        self.content_parser = ContentParserService(self.http_client, self.config_manager)
-        logger.info("ContentParserService initialized.")
-        
-        self.search_manager = SearchManager(self.fs_manager) # Needs fs_manager for index path
-        logger.info("SearchManager initialized.")
-        
-        self.tts_service = TTSService()
-        logger.info("TTSService initialized.")
-        
-        # NotificationService needs fs_manager to load/save seen notification IDs
-        self.notification_service = NotificationService(
-            self.config_manager, self.http_client, self.fs_manager, toga_app=self
-        )
-        logger.info("NotificationService initialized.")
-
-        # Cloud Service and Sync Manager (conditionally initialized based on settings)
-        self.cloud_service: Optional[BaseCloudService] = None
-        self.sync_manager: Optional[SyncManager] = None
-        self._initialize_cloud_and_sync() # Sets up self.cloud_service and self.sync_manager
-
-        self.pocket_importer = PocketImporterService(
-            self.config_manager, self.content_parser, self.fs_manager, self.search_manager
-        )
-        logger.info("PocketImporterService initialized.")
-        
-        # --- Load initial data ---
-        self.load_initial_articles_and_tags()
-
         # 4. Create Main Window and UI
         self.main_window = toga.MainWindow(title=self.formal_name) # self.formal_name from toga.App
         
-        main_box = toga.Box(style=Pack(direction=COLUMN, padding=10))
+        main_box = toga.Box(style=MAIN_BOX_STYLE)
         main_box.add(toga.Label(
             f"Welcome to {constants.APP_NAME}! UI is under construction.", 
-            style=Pack(text_align=CENTER, padding_bottom=10))
+            style=WELCOME_LABEL_STYLE)
         )
         
         # Status label for messages
-        self.status_label = toga.Label("Status: Initialized.", style=Pack(padding_top=5))
+        self.status_label = toga.Label("Status: Initialized.", style=STATUS_LABEL_STYLE)
         self.app_state.status_label_widget = self.status_label # Store in app_state for global access
         main_box.add(self.status_label)
         
@@ -166,8 +173,104 @@ class PurseApp(toga.App):
         self.main_window.show()
         logger.info("Main window shown.")
 
-        # 5. Initial background tasks (optional for this step, but good practice)
-        # self.add_background_task(self.initial_background_tasks)
+        # 5. Deferred initialization: runs on the event loop once the window is up
+        self.add_background_task(self._initialize_deferred_services)
+
+    async def _initialize_deferred_services(self, app, **kwargs) -> None:
+        """
+        Startup work that isn't needed to show the main window. The pieces are independent disk/keyring I/O,
+        so they run concurrently in worker threads; a failure in one doesn't stop the others.
+        """
+        try:
+            search_init = asyncio.ensure_future(self._init_search_async()) # Also awaited by _init_cloud_async
+            results = await asyncio.gather(
+                self._init_notification_async(),
+                self._init_cloud_async(search_init),
+                search_init,
+                asyncio.to_thread(self.load_initial_articles_and_tags),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    logger.error(f"🛑 Deferred startup initialization step failed: {result}", exc_info=result)
+            if self.app_state.status_label_widget:
+                self.app_state.status_label_widget.text = "Status: Ready."
+            logger.info("Deferred startup initialization complete.")
+        finally:
+            self.services_ready.set()
+
+    async def _init_notification_async(self) -> None:
+        await asyncio.to_thread(getattr, self, 'notification_service') # Reads seen IDs from device settings
+
+    async def _init_search_async(self) -> None:
+        await asyncio.to_thread(getattr, self, 'search_manager') # Opens the index on disk
+
+    async def _init_cloud_async(self, search_init: "asyncio.Future[None]") -> None:
+        # Cloud clients load their tokens from the keyring in their constructors
+        cloud_service = await asyncio.to_thread(getattr, self, 'cloud_service')
+        if cloud_service:
+            await search_init # SyncManager needs the SearchManager being built concurrently
+            await self._service_off_loop('sync_manager') # Build it now rather than on the first sync
+
+    async def _service_off_loop(self, name: str) -> Optional[Any]:
+        """
+        A lazily built service, constructed in a worker thread if it doesn't exist yet (constructors do disk I/O;
+        SearchManager may rebuild the whole index). None, with the error logged, if construction fails.
+        """
+        try:
+            return await asyncio.to_thread(getattr, self, name)
+        except Exception as e:
+            logger.error(f"🛑 Could not initialize {name}: {e}", exc_info=True)
+            return None
+
+    # --- Lazily constructed services: each is created on first access and reused afterwards ---
+
+    @property
+    def content_parser(self) -> ContentParserService:
+        if self._content_parser is None:
+            self._content_parser = ContentParserService(self.http_client, self.config_manager)
+            logger.info("ContentParserService initialized.")
+        return self._content_parser
+
+    @property
+    def search_manager(self) -> SearchManager:
+        """Opens the index on first access, which can mean a full rebuild: reach it via _service_off_loop on the loop."""
+        if self._search_manager is None:
+            with self._search_manager_lock:
+                if self._search_manager is None:
+                    self._search_manager = SearchManager(self.fs_manager) # Needs fs_manager for index path
+                    logger.info("SearchManager initialized.")
+        return self._search_manager
+
+    @property
+    def tts_service(self) -> TTSService:
+        if self._tts_service is None:
+            self._tts_service = TTSService()
+            logger.info("TTSService initialized.")
+        return self._tts_service
+
+    @property
+    def notification_service(self) -> NotificationService:
+        if self._notification_service is None:
+            # NotificationService needs fs_manager to load/save seen notification IDs (loaded in its constructor)
+            self._notification_service = NotificationService(
+                self.config_manager, self.http_client, self.fs_manager, toga_app=self
+            )
+            # Apply a settings.yml override that was loaded before the service existed
+            if self.app_state.developer_notification_url:
+                self._notification_service.developer_notifications_url = self.app_state.developer_notification_url
+            logger.info("NotificationService initialized.")
+        return self._notification_service
+
+    @property
+    def pocket_importer(self) -> PocketImporterService:
+        if self._pocket_importer is None:
+            self._pocket_importer = PocketImporterService(
+                self.config_manager, self.content_parser, self.search_manager,
+                results_cache_path=self.fs_manager.app_data_dir / POCKET_IMPORT_CACHE_FILENAME,
+            )
+            logger.info("PocketImporterService initialized.")
+        return self._pocket_importer
 
     # def test_notification_action(self, widget):
     #     logger.info("Test button pressed.")
@@ -199,7 +302,9 @@ class PurseApp(toga.App):
         Triggers the import of articles from a Pocket export HTML file.
         Processes each article by fetching thumbnails, saving, and indexing.
         """
-        if not self.pocket_importer or not self.fs_manager or not self.search_manager:
+        await self.services_ready.wait() # Deferred startup builds the search index handle and loads the library
+        # Normally already built; if deferred startup failed to, retry in a worker thread rather than on the loop
+        if not await self._service_off_loop('pocket_importer') or not self.fs_manager or not self._search_manager:
             logger.error("Cannot start Pocket import, core services (PocketImporter, FileSystemManager, or SearchManager) not initialized.")
             if self.app_state.status_label_widget:
                 self.app_state.status_label_widget.text = "Error: Import services not ready."
@@ -218,37 +323,56 @@ class PurseApp(toga.App):
         #        self.app_state.status_label_widget.text = f"Importing Pocket: {current}/{total}"
         #    logger.debug(f"Pocket import progress: {current}/{total}")
 
-        try:
-            # The pocket_importer.import_from_pocket_file is now an async generator
-            async for article_from_importer in self.pocket_importer.import_from_pocket_file(
-                export_html_filepath, 
-                # progress_callback=ui_progress_callback # Pass UI callback if implemented
-            ):
-                try:
-                    logger.debug(f"Processing yielded article from Pocket: '{article_from_importer.title}'")
-                    # 1. Fetch and store thumbnail (if potential URL exists)
-                    await self._fetch_and_store_article_thumbnail(article_from_importer)
-
-                    # 2. Save article to file system
-                    saved_path = self.fs_manager.save_article(article_from_importer)
-                    
-                    if saved_path:
-                        logger.info(f"Pocket import: Article '{article_from_importer.title}' saved to {saved_path}")
-                        # 3. Add/Update article in search index
-                        self.search_manager.add_or_update_article(article_from_importer)
-                        successful_imports += 1
-                        
-                        # 4. Update AppState and UI (placeholders)
-                        # self.app_state.current_article_list.insert(0, article_from_importer) # Add to top
-                        # self.app_state.all_tags_in_library.update(article_from_importer.tags or [])
-                        # self.refresh_ui_article_list() # Placeholder for UI update method
-                        logger.debug(f"Pocket import: Successfully processed and saved '{article_from_importer.title}'.")
-                    else:
-                        failed_or_skipped_articles += 1
-                        logger.warning(f"Pocket import: Failed to save article '{article_from_importer.title}'.")
-                except Exception as e_article: # Catch errors during processing of a single article
+        # The importer yields articles into a bounded queue drained by a few workers, so one article's thumbnail
+        # download overlaps other articles' file writes and indexing. None tells a worker the import is over.
+        pending: "asyncio.Queue[Optional[Article]]" = asyncio.Queue(maxsize=POCKET_IMPORT_QUEUE_SIZE)
+        # Saved articles (with their file paths) waiting to be indexed; handed to the search index in bulk
+        # (one commit per batch). They enter the import cache only once their batch was indexed.
+        to_index: List[Tuple['Article', Path]] = []
+
+        async def index_saved(batch: List[Tuple['Article', Path]]) -> None:
+            try:
+                indexed = await asyncio.to_thread(self.search_manager.add_or_update_bulk, [article for article, _ in batch])
+            except Exception as e_index:
+                logger.error(f"Pocket import: Error indexing {len(batch)} imported articles: {e_index}", exc_info=True)
+                return
+            if not indexed:
+                logger.warning(f"Pocket import: {len(batch)} imported articles were not indexed; a re-run will import them again.")
+                return
+            for article, saved_path in batch:
+                self.pocket_importer.record_imported(article, saved_path)
+
+        async def import_worker() -> None:
+            nonlocal successful_imports, failed_or_skipped_articles, to_index
+            while (article := await pending.get()) is not None:
+                # Counters and to_index are only touched on the event loop, so no lock is needed
+                saved_path = await self._import_pocket_article(article)
+                if saved_path:
+                    successful_imports += 1
+                    to_index.append((article, saved_path))
+                    if len(to_index) >= POCKET_IMPORT_INDEX_BATCH_SIZE:
+                        batch, to_index = to_index, []
+                        await index_saved(batch)
+                else:
                     failed_or_skipped_articles += 1
-                    logger.error(f"Pocket import: Error processing article '{article_from_importer.title if article_from_importer else 'unknown'}': {e_article}", exc_info=True)
+
+        workers = [asyncio.ensure_future(import_worker()) for _ in range(POCKET_IMPORT_WORKERS)]
+        try:
+            try:
+                # The pocket_importer.import_from_pocket_file is now an async generator
+                async for article_from_importer in self.pocket_importer.import_from_pocket_file(
+                    export_html_filepath, 
+                    # progress_callback=ui_progress_callback # Pass UI callback if implemented
+                ):
+                    await pending.put(article_from_importer)
+            finally:
+                # Let the workers finish what's queued, even if the importer itself failed
+                for _ in workers:
+                    await pending.put(None)
+                await asyncio.gather(*workers)
+                if to_index: # Index whatever is left from the last, partial batch
+                    await index_saved(to_index)
+                await asyncio.to_thread(self.pocket_importer.save_results_cache)
 
             logger.info(f"Pocket import finished. Successfully imported: {successful_imports} articles. Failed/Skipped articles: {failed_or_skipped_articles}.")
             if self.app_state.status_label_widget:
@@ -260,11 +384,39 @@ class PurseApp(toga.App):
             if self.app_state.status_label_widget:
                 self.app_state.status_label_widget.text = "Pocket import failed critically."
 
+    async def _import_pocket_article(self, article_from_importer: 'Article') -> Optional[Path]:
+        """Thumbnails and saves one article yielded by the Pocket importer. Its saved path, or None if it wasn't saved."""
+        try:
+            logger.debug(f"Processing yielded article from Pocket: '{article_from_importer.title}'")
+            # 1. Fetch and store thumbnail (if potential URL exists)
+            await self._fetch_and_store_article_thumbnail(article_from_importer)
+
+            # 2. Save article to file system (in a worker thread, so other articles' downloads keep going)
+            saved_path = await asyncio.to_thread(self.fs_manager.save_article, article_from_importer)
+            
+            if saved_path:
+                logger.info(f"Pocket import: Article '{article_from_importer.title}' saved to {saved_path}")
+                # 3. Indexing (and recording in the import cache) happens in batches, see trigger_pocket_import
+                
+                # 4. Update AppState and UI (placeholders)
+                # self.app_state.current_article_list.insert(0, article_from_importer) # Add to top
+                # add_article_tags(self.app_state, article_from_importer.tags)
+                # self.refresh_ui_article_list() # Placeholder for UI update method
+                logger.debug(f"Pocket import: Successfully processed and saved '{article_from_importer.title}'.")
+                return saved_path
+            logger.warning(f"Pocket import: Failed to save article '{article_from_importer.title}'.")
+            return None
+        except Exception as e_article: # Catch errors during processing of a single article
+            logger.error(f"Pocket import: Error processing article '{article_from_importer.title if article_from_importer else 'unknown'}': {e_article}", exc_info=True)
+            return None
+
     async def process_new_url_submission(self, url_to_add: str) -> None: # Added as per workplan (Phase 1, Section 2.2)
         """
         Processes a new URL submitted by the user, including parsing, thumbnailing, saving, and indexing.
         """
-        if not self.content_parser or not self.fs_manager or not self.search_manager:
+        await self.services_ready.wait() # Deferred startup builds the search index handle and loads the library
+        # Normally already built; if deferred startup failed to, retry in a worker thread rather than on the loop
+        if not self.content_parser or not self.fs_manager or not await self._service_off_loop('search_manager'):
             logger.error("Cannot process new URL, core services (ContentParser, FileSystemManager, or SearchManager) not initialized.")
             if self.app_state.status_label_widget: # Update UI
                 self.app_state.status_label_widget.text = "Error: Services not ready for URL processing."
@@ -287,18 +439,19 @@ class PurseApp(toga.App):
 
                 # 2. Save article to file system (now includes local thumbnail path in YAML)
                 logger.debug(f"Saving article from new URL submission: {parsed_article.title}")
-                saved_path = self.fs_manager.save_article(parsed_article)
+                # File and index work run in worker threads so the event loop keeps serving the UI and other fetches
+                saved_path = await asyncio.to_thread(self.fs_manager.save_article, parsed_article)
                 
                 if saved_path:
                     logger.info(f"New article '{parsed_article.title}' (from URL {url_to_add}) saved to {saved_path}")
                     
                     # 3. Add/Update article in search index
                     logger.debug(f"Indexing new article: {parsed_article.title}")
-                    self.search_manager.add_or_update_article(parsed_article)
+                    await asyncio.to_thread(self.search_manager.add_or_update_article, parsed_article)
                     
                     # 4. Update AppState and UI (placeholders)
                     # self.app_state.current_article_list.insert(0, parsed_article) # Add to top
-                    # self.app_state.all_tags_in_library.update(parsed_article.tags or [])
+                    # add_article_tags(self.app_state, parsed_article.tags)
                     # self.refresh_ui_article_list() # Placeholder for UI update method
                     logger.info(f"Successfully added and indexed: {parsed_article.title}")
                     if self.app_state.status_label_widget: # Update UI
@@ -339,44 +492,46 @@ class PurseApp(toga.App):
         
         # FileSystemManager.get_thumbnail_path uses article.local_path.
         # If article.local_path is not set yet (e.g., new article not yet saved),
-        # fs_manager.get_thumbnail_path and fs_manager.save_thumbnail need to handle this.
+        # fs_manager.get_thumbnail_path and fs_manager.save_thumbnail_stream need to handle this.
         # The current fs_manager.get_thumbnail_path can derive a prospective path.
-        # This is generally okay as fs_manager.save_thumbnail will use this path.
+        # This is generally okay as fs_manager.save_thumbnail_stream will use this path.
+
+        thumbnail_url = article.potential_thumbnail_source_url
+        cached_thumb_path = self._thumb_url_cache.get(thumbnail_url)
+        if cached_thumb_path is not None:
+            if await asyncio.to_thread(self.fs_manager.copy_thumbnail, article, cached_thumb_path): # shutil copy + mkdir
+                self._thumb_url_cache.move_to_end(thumbnail_url)
+                article.potential_thumbnail_source_url = None
+                return
+            self._thumb_url_cache.pop(thumbnail_url, None) # The earlier file is gone; download it again (another worker may have already)
 
         logger.info(f"Attempting to fetch thumbnail for '{article.title}' from: {article.potential_thumbnail_source_url}")
         try:
-            # Fetch image (ensure HttpClient's get_url with is_html_content=False to bypass HTML size limits)
-            image_response = await self.http_client.get_url(
-                article.potential_thumbnail_source_url, 
-                is_html_content=False # This is an image, not an HTML page
-            )
-            image_bytes = image_response.content # Get bytes from response
+            # Stream the image straight to its file: only one chunk is in memory at a time, however big the image.
+            # (The HTML size limit of get_url doesn't apply; this is an image, not an HTML page.)
+            image_chunks = self.http_client.stream_url(thumbnail_url)
 
-            # Optional validation/resizing (not in scope for this iteration per workplan)
-            # if image_bytes:
+            # Optional validation/resizing (not in scope for this iteration per workplan); it would need the
+            # whole image, e.g. by reading the saved file back:
             #     from PIL import Image
-            #     from io import BytesIO
             #     try:
-            #         img = Image.open(BytesIO(image_bytes))
+            #         img = Image.open(thumb_abs_path)
             #         # img.thumbnail((THUMBNAIL_MAX_WIDTH, THUMBNAIL_MAX_HEIGHT))
-            #         # output_buffer = BytesIO()
-            #         # img.save(output_buffer, format="JPEG", quality=85)
-            #         # image_bytes = output_buffer.getvalue()
+            #         # img.save(thumb_abs_path, format="JPEG", quality=85)
             #     except Exception as img_e:
             #         logger.warning(f"Could not process image for thumbnail: {img_e}")
-            #         image_bytes = None # Do not save if processing failed
-
-            if image_bytes:
-                # save_thumbnail now directly updates article.thumbnail_url_local
-                # and returns the relative path, or None if save failed.
-                relative_thumb_path = self.fs_manager.save_thumbnail(article, image_bytes)
-                if relative_thumb_path:
-                    logger.info(f"Thumbnail saved for article '{article.title}' at relative path: {relative_thumb_path}")
-                    # article.thumbnail_url_local is updated by fs_manager.save_thumbnail
-                else:
-                    logger.warning(f"Failed to save thumbnail for article '{article.title}' (FileSystemManager.save_thumbnail returned None).")
+
+            # save_thumbnail_stream directly updates article.thumbnail_url_local
+            # and returns the relative path, or None if the download or save failed.
+            relative_thumb_path = await self.fs_manager.save_thumbnail_stream(article, image_chunks)
+            if relative_thumb_path:
+                logger.info(f"Thumbnail saved for article '{article.title}' at relative path: {relative_thumb_path}")
+                self._thumb_url_cache[thumbnail_url] = relative_thumb_path
+                if len(self._thumb_url_cache) > THUMBNAIL_URL_CACHE_MAX:
+                    self._thumb_url_cache.popitem(last=False) # Evict the least recently used URL
+                # article.thumbnail_url_local is updated by fs_manager.save_thumbnail_stream
             else:
-                logger.warning(f"No image bytes obtained for thumbnail of article '{article.title}'.")
+                logger.warning(f"Failed to save thumbnail for article '{article.title}' (FileSystemManager.save_thumbnail_stream returned None).")
 
         except Exception as e:
             logger.error(f"Error fetching or saving thumbnail for article '{article.title}' from '{article.potential_thumbnail_source_url}': {e}", exc_info=True)
@@ -392,13 +547,7 @@ class PurseApp(toga.App):
             logger.debug("No device-specific settings found or file was empty/invalid.")
             return
 
-        # Load seen notification IDs into NotificationService
-        seen_ids_list = device_settings.get('seen_notification_ids', [])
-        if isinstance(seen_ids_list, list):
-            self.notification_service.seen_notification_ids = set(seen_ids_list)
-            logger.debug(f"Loaded {len(seen_ids_list)} seen notification IDs.")
-        else:
-            logger.warning("Malformed 'seen_notification_ids' in device settings; expected list.")
+        # Seen notification IDs are loaded by NotificationService itself when it is first used.
 
         # Example: Load window size/position (Toga might handle this automatically or require specific API)
         # self.main_window.size = tuple(device_settings.get('main_window_size', (640, 480)))
@@ -444,77 +593,96 @@ class PurseApp(toga.App):
         """Updates AppState and relevant services based on newly loaded synced settings via ConfigManager."""
         logger.debug("Updating AppState from (potentially new) synced settings...")
         
-        # Update reading preferences in AppState
-        self.app_state.reading_prefs.font_family = self.config_manager.get(
-            'ui.reading_view.font_family', constants.DEFAULT_FONT_FAMILY
-        )
-        self.app_state.reading_prefs.font_size = self.config_manager.get(
-            'ui.reading_view.font_size', constants.DEFAULT_FONT_SIZE
-        )
-        self.app_state.reading_prefs.theme = self.config_manager.get(
-            'ui.reading_view.theme', constants.DEFAULT_THEME
+        # Update reading preferences in AppState in one replace (ReadingPreferences is frozen)
+        # (pre-resolved by ConfigManager, defaults from constants applied there)
+        config_manager = self.config_manager
+        self.app_state.reading_prefs = dataclasses.replace(
+            self.app_state.reading_prefs,
+            **{field_name: getattr(config_manager, attr) for field_name, attr in _READING_PREFS_MAP}
         )
         
         # Update developer notification URL in AppState and NotificationService
         # User can override the default from config.yml via settings.yml
+        # (NotificationService may not exist yet; its property applies app_state's URL when it's created.)
+        notification_service = self._notification_service
         dev_notif_url_override = self.config_manager.get('developer_notifications_url_override')
         if dev_notif_url_override:
             self.app_state.developer_notification_url = dev_notif_url_override
-            self.notification_service.developer_notifications_url = dev_notif_url_override
+            if notification_service:
+                notification_service.developer_notifications_url = dev_notif_url_override
             logger.info(f"Developer notification URL updated from settings.yml: {dev_notif_url_override}")
-        elif self.notification_service.developer_notifications_url is None : # If not set by override and was None from config.yml
+        elif notification_service is None or notification_service.developer_notifications_url is None : # If not set by override and was None from config.yml
              # Fallback to default from config.yml if it was missing there initially but NotificationService needs one
              default_dev_url_from_config = self.config_manager.get('developer_notifications_url')
              if default_dev_url_from_config:
                 self.app_state.developer_notification_url = default_dev_url_from_config
-                self.notification_service.developer_notifications_url = default_dev_url_from_config
+                if notification_service:
+                    notification_service.developer_notifications_url = default_dev_url_from_config
                 logger.info(f"Developer notification URL set from config.yml default: {default_dev_url_from_config}")
 
 
         # Update cloud provider name in AppState
-        self.app_state.cloud_provider_name = self.config_manager.get('cloud.provider_name')
+        self.app_state.cloud_provider_name = self.config_manager.cloud_provider_name
         if self.app_state.cloud_provider_name:
             logger.info(f"Cloud provider from settings: {self.app_state.cloud_provider_name}")
 
+        # The provider or its root folder may have changed: rebuild the cloud client on next use
+        self._reset_cloud_services()
+
         # Other synced settings can be applied here to AppState or services.
         logger.info("AppState updated based on synced settings.")
 
 
-    def _initialize_cloud_and_sync(self) -> None:
-        """Initializes the configured cloud service and SyncManager."""
-        logger.debug("Initializing cloud service and SyncManager...")
-        provider_name = self.config_manager.get('cloud.provider_name')
+    @cached_property
+    def cloud_service(self) -> Optional[BaseCloudService]:
+        """
+        Client for the configured cloud provider, built on first access; None if none or unsupported.
+        Only reads config (constructors load their tokens from the keyring), so it may be first accessed
+        off the event loop. _reset_cloud_services() drops it after settings change.
+        """
+        provider_name = self.config_manager.cloud_provider_name
+        if not provider_name:
+            logger.info("No cloud provider configured in settings. Sync functionality will be disabled.")
+            self.app_state.cloud_provider_name = None
+            return None
         
         # Cloud service constructors will now load their own tokens/cache from keyring via BaseCloudService logic.
         # No need to fetch individual token parts here anymore.
 
         user_cloud_root_path = self.config_manager.get('cloud.user_root_folder_path', '/Apps/Purse') # Default if not in settings
 
-        if provider_name:
-            logger.info(f"Configured cloud provider: {provider_name}. Initializing client...")
-            if provider_name == DropboxService.PROVIDER_NAME:
-                self.cloud_service = DropboxService(self.config_manager)
-            elif provider_name == GoogleDriveService.PROVIDER_NAME:
-                self.cloud_service = GoogleDriveService(self.config_manager)
-            elif provider_name == OneDriveService.PROVIDER_NAME:
-                self.cloud_service = OneDriveService(self.config_manager)
-            else:
-                logger.error(f"Unsupported cloud provider configured: '{provider_name}'. Sync will be disabled.")
-                self.app_state.cloud_provider_name = f"Unsupported: {provider_name}"
-                return
-
-            if self.cloud_service:
-                self.cloud_service.set_root_folder_path(user_cloud_root_path)
-                self.sync_manager = SyncManager(
-                    self.config_manager, self.fs_manager, self.cloud_service, self.search_manager
-                )
-                logger.info(f"{provider_name} service and SyncManager initialized. App root: {user_cloud_root_path}")
-                self.app_state.cloud_provider_name = provider_name # Update AppState
-            else: # Should not happen if provider_name matched one of the above
-                 logger.error(f"Failed to instantiate cloud service for {provider_name}.")
-        else:
-            logger.info("No cloud provider configured in settings. Sync functionality will be disabled.")
-            self.app_state.cloud_provider_name = None
+        logger.info(f"Configured cloud provider: {provider_name}. Initializing client...")
+        provider = self._CLOUD_PROVIDERS.get(provider_name)
+        if provider is None:
+            logger.error(f"Unsupported cloud provider configured: '{provider_name}'. Sync will be disabled.")
+            self.app_state.cloud_provider_name = f"Unsupported: {provider_name}"
+            return None
+        module_name, class_name = provider
+        cloud_service_class = getattr(importlib.import_module(module_name), class_name)
+        cloud_service: BaseCloudService = cloud_service_class(self.config_manager)
+        cloud_service.set_root_folder_path(user_cloud_root_path)
+        cloud_service.set_local_state_dir(self.fs_manager.app_data_dir)
+        self.app_state.cloud_provider_name = provider_name # Update AppState
+        return cloud_service
+
+    @cached_property
+    def sync_manager(self) -> Optional[SyncManager]:
+        """SyncManager for cloud_service, built on first access; None when sync is disabled."""
+        cloud_service = self.cloud_service
+        if cloud_service is None:
+            return None
+        sync_manager = SyncManager(self.config_manager, self.fs_manager, cloud_service, self.search_manager)
+        logger.info(f"{self.config_manager.cloud_provider_name} service and SyncManager initialized. App root: {cloud_service.root_folder_path}")
+        return sync_manager
+
+    def _reset_cloud_services(self) -> None:
+        """Forgets the cached cloud_service/sync_manager so the next access builds them for the current settings."""
+        old_cloud_service = self.__dict__.pop('cloud_service', None)
+        self.__dict__.pop('sync_manager', None)
+        if old_cloud_service is not None:
+            async def close_old_cloud_service(app, **kwargs) -> None:
+                await old_cloud_service.close()
+            self.add_background_task(close_old_cloud_service)
 
 
     def load_initial_articles_and_tags(self) -> None:
@@ -528,7 +696,7 @@ class PurseApp(toga.App):
             return
 
         all_articles: List[Article] = []
-        all_tags: Set[str] = set()
+        self.app_state.all_tags_in_library = set()
         
         try:
             article_paths = self.fs_manager.get_all_article_filepaths() # List of Path objects
@@ -538,15 +706,13 @@ class PurseApp(toga.App):
                 article = self.fs_manager.load_article(fpath) # Returns Optional[Article]
                 if article:
                     all_articles.append(article)
-                    if article.tags: # article.tags is List[str]
-                        all_tags.update(article.tags)
+                    add_article_tags(self.app_state, article.tags) # article.tags is List[str]
                 else:
                     logger.warning(f"Could not load article from path: {fpath}")
             
             # Default sort: by saved_date, descending (newest first)
             self.app_state.current_article_list = sorted(all_articles, key=lambda a: a.saved_date, reverse=True)
-            self.app_state.all_tags_in_library = all_tags
-            logger.info(f"Loaded {len(all_articles)} articles and {len(all_tags)} unique tags from local storage.")
+            logger.info(f"Loaded {len(all_articles)} articles and {len(self.app_state.all_tags_in_library)} unique tags from local storage.")
 
             # Search index consistency:
             # The workplan mentions: "Consider if SearchManager.rebuild_index is needed here or managed differently".
@@ -555,7 +721,7 @@ class PurseApp(toga.App):
             # A check for consistency or a user-triggered rebuild option might be better.
             # Example: if self.search_manager and len(all_articles) > 0:
             #    logger.info("Consider verifying/rebuilding search index if needed...")
-            #    # self.add_background_task(self.search_manager.rebuild_index, articles=all_articles)
+            #    # self.add_background_task(self.search_manager.rebuild_index, articles=self.fs_manager.iter_articles())
             
         except Exception as e:
             logger.error(f"Error during initial article load: {e}", exc_info=True)
@@ -570,27 +736,33 @@ class PurseApp(toga.App):
         if self.http_client:
             await self.http_client.close()
             logger.debug("HttpClient closed.")
+
+        cloud_service = self.__dict__.get('cloud_service') # Only if it was ever created (cached_property)
+        if cloud_service:
+            await cloud_service.close()
+            logger.debug("Cloud service connections closed.")
         
         # Save device-specific settings
-        if self.fs_manager and self.notification_service:
+        if self.fs_manager and self._notification_service: # Only if it was ever created (it owns the seen IDs)
             logger.debug("Saving device-specific settings...")
             device_settings_to_save = self.fs_manager.load_device_settings() # Load current to preserve other settings
-            device_settings_to_save['seen_notification_ids'] = list(self.notification_service.seen_notification_ids)
+            device_settings_to_save['seen_notification_ids'] = list(self._notification_service.seen_notification_ids)
             # Add other settings to save, e.g., window size/pos if not Toga-managed
             # device_settings_to_save['main_window_size'] = self.main_window.size
             # device_settings_to_save['main_window_position'] = self.main_window.position
             self.fs_manager.save_device_settings(device_settings_to_save)
             logger.debug("Device-specific settings saved.")
 
-        if self.tts_service: # TTSService has its own shutdown
-            await self.tts_service.shutdown() # Stops speech, waits for task
+        if self._tts_service: # TTSService has its own shutdown
+            await self._tts_service.shutdown() # Stops speech, waits for task
             logger.debug("TTSService shutdown.")
             
-        if self.search_manager: # Whoosh index might need explicit closing
-            self.search_manager.close_index() # Added this in SearchManager (Turn 19)
+        if self._search_manager: # Whoosh index might need explicit closing
+            self._search_manager.close_index() # Added this in SearchManager (Turn 19)
             logger.debug("SearchManager index closed.")
 
         logger.info(f"{constants.APP_NAME} shutdown complete.")
+        stop_logging() # Write out log records still queued for the logging thread
         return True # True to allow exit, False to prevent (if applicable)
 
 
@@ -1,3 +1,4 @@
+import sys
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 from datetime import datetime # Not directly used here, but common.py functions return datetime
@@ -146,6 +147,14 @@ class Article:
         if tags is None: # Handles explicit null in YAML
             tags = []
 
+        # Share the interned constants (see constants.py) rather than one YAML-parsed copy per article
+        status = data.get(constants.KEY_STATUS, constants.STATUS_UNREAD)
+        if isinstance(status, str):
+            status = sys.intern(status)
+        source_application = data.get(constants.KEY_SOURCE_APPLICATION, constants.SOURCE_WEB_PARSER)
+        if isinstance(source_application, str):
+            source_application = sys.intern(source_application)
+
         return cls(
             id=data.get(constants.KEY_ID, generate_uuid()), # Generate new ID if missing
             original_url=original_url,
@@ -156,14 +165,14 @@ class Article:
             publication_date=data.get(constants.KEY_PUBLICATION_DATE),
             saved_date=data.get(constants.KEY_SAVED_DATE, get_current_timestamp_iso()),
             last_modified_date=data.get(constants.KEY_LAST_MODIFIED_DATE, get_current_timestamp_iso()),
-            status=data.get(constants.KEY_STATUS, constants.STATUS_UNREAD),
+            status=status,
             favorite=data.get(constants.KEY_FAVORITE, False),
             tags=tags,
             estimated_read_time_minutes=data.get(constants.KEY_ESTIMATED_READ_TIME),
             word_count=data.get(constants.KEY_WORD_COUNT),
             language=data.get(constants.KEY_LANGUAGE),
             excerpt=data.get(constants.KEY_EXCERPT),
-            source_application=data.get(constants.KEY_SOURCE_APPLICATION, constants.SOURCE_WEB_PARSER),
+            source_application=source_application,
             archived_from_fallback=data.get(constants.KEY_ARCHIVED_FROM_FALLBACK, False),
             thumbnail_url_local=data.get(constants.KEY_THUMBNAIL_URL_LOCAL),
             markdown_content=markdown_content.strip(), # Ensure content is stripped
@@ -171,6 +180,16 @@ class Article:
             potential_thumbnail_source_url=data.get('potential_thumbnail_source_url') # Initialize, though not expected in YAML data
         )
 
+    @property
+    def tags_csv(self) -> str:
+        """Tags as one lowercase comma-separated string (the search index's KEYWORD form)."""
+        return ",".join(self.tags).lower() if self.tags else ""
+
+    @property
+    def author_csv(self) -> str:
+        """Authors as one lowercase comma-separated string (the search index's KEYWORD form)."""
+        return ",".join(self.author).lower() if self.author else ""
+
     def get_notes(self) -> str:
         """Extracts notes from the markdown_content."""
         # Notes section starts with MARKDOWN_NOTES_HEADING on its own line,
@@ -0,0 +1,109 @@
+"""
+Typed view of config.yml + settings.yml, decoded with msgspec.
+
+Built by ConfigManager on first access after settings change (see ConfigManager.typed), so readers
+can use plain attribute access (cfg.typed.ui.reading_view.font_size) instead of get() string lookups.
+Defaults mirror the fallbacks callers pass to ConfigManager.get(). Unknown keys are ignored, so
+new YAML keys don't break decoding. Requires the optional 'msgspec' dependency; this module is
+only imported by ConfigManager when it is installed.
+"""
+from typing import List, Optional
+
+import msgspec
+
+from src.utils import constants
+
+
+class LoggingConfig(msgspec.Struct, frozen=True):
+    log_level: str = "INFO"
+    logs_dir: str = "logs"
+    max_log_files: int = 10
+    log_format_console: str = "%(asctime)s %(emoji_level)s%(name)s - %(message)s"
+    log_format_file: str = "%(asctime)s [%(levelname)s] %(name)s:%(lineno)d - %(message)s"
+    date_format: str = "%Y-%m-%d %H:%M:%S"
+
+
+class PathsConfig(msgspec.Struct, frozen=True):
+    local_data_dir_fragment: str = "user_data/purse_library"
+    local_search_index_dir_fragment: str = "search_index"
+    synced_config_dir_name: str = ".purse_config"
+    synced_settings_filename: str = "settings.yml"
+
+
+class RetryConfig(msgspec.Struct, frozen=True):
+    max_attempts: int = 5
+    initial_delay_seconds: float = 1.0
+    max_delay_seconds: float = 60.0
+    jitter: bool = True
+
+
+class PocketImporterConfig(msgspec.Struct, frozen=True):
+    reparse_pocket_html: bool = True
+
+
+class ContentLimitsConfig(msgspec.Struct, frozen=True):
+    max_html_size_bytes: int = 10 * 1024 * 1024
+    max_pdf_size_bytes: int = 50 * 1024 * 1024
+    max_docx_size_bytes: int = 20 * 1024 * 1024
+
+
+class DropboxConfig(msgspec.Struct, frozen=True):
+    app_key: Optional[str] = None
+    app_secret: Optional[str] = None
+    redirect_uri: Optional[str] = None
+
+
+class GoogleDriveConfig(msgspec.Struct, frozen=True):
+    client_id: Optional[str] = None
+    client_secret: Optional[str] = None
+    project_id: Optional[str] = None
+    scopes: Optional[List[str]] = None
+    redirect_uri: Optional[str] = None
+    token_uri: str = "https://oauth2.googleapis.com/token"
+    auth_uri: str = "https://accounts.google.com/o/oauth2/auth"
+
+
+class OneDriveConfig(msgspec.Struct, frozen=True):
+    client_id: Optional[str] = None
+    authority: Optional[str] = None
+    scopes: Optional[List[str]] = None
+    redirect_uri: Optional[str] = None
+    graph_api_endpoint_v1: str = "https://graph.microsoft.com/v1.0"
+
+
+class CloudProvidersConfig(msgspec.Struct, frozen=True):
+    dropbox: DropboxConfig = msgspec.field(default_factory=DropboxConfig)
+    google_drive: GoogleDriveConfig = msgspec.field(default_factory=GoogleDriveConfig)
+    onedrive: OneDriveConfig = msgspec.field(default_factory=OneDriveConfig)
+
+
+class CloudSettings(msgspec.Struct, frozen=True):
+    """Synced 'cloud' section of settings.yml."""
+    provider_name: Optional[str] = None
+    local_sync_root_path: Optional[str] = None
+    user_root_folder_path: str = "/Apps/Purse"
+
+
+class ReadingViewSettings(msgspec.Struct, frozen=True):
+    font_family: str = constants.DEFAULT_FONT_FAMILY
+    font_size: int = constants.DEFAULT_FONT_SIZE
+    theme: str = constants.DEFAULT_THEME
+
+
+class UISettings(msgspec.Struct, frozen=True):
+    reading_view: ReadingViewSettings = msgspec.field(default_factory=ReadingViewSettings)
+
+
+class ConfigSchema(msgspec.Struct, frozen=True):
+    """Effective configuration: config.yml with settings.yml overrides applied."""
+    logging: LoggingConfig = msgspec.field(default_factory=LoggingConfig)
+    paths: PathsConfig = msgspec.field(default_factory=PathsConfig)
+    retry: RetryConfig = msgspec.field(default_factory=RetryConfig)
+    pocket_importer: PocketImporterConfig = msgspec.field(default_factory=PocketImporterConfig)
+    content_limits: ContentLimitsConfig = msgspec.field(default_factory=ContentLimitsConfig)
+    cloud_providers: CloudProvidersConfig = msgspec.field(default_factory=CloudProvidersConfig)
+    cloud: CloudSettings = msgspec.field(default_factory=CloudSettings)
+    ui: UISettings = msgspec.field(default_factory=UISettings)
+    developer_notifications_url: Optional[str] = None
+    developer_notifications_url_override: Optional[str] = None
+    fallback_archive_service_url_template: Optional[str] = None
@@ -12,7 +12,7 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class CloudFileMetadata:
     """
     Standardized representation of file/folder metadata from a cloud provider.
@@ -46,6 +46,8 @@ class BaseCloudService(ABC):
         # It's the base path under which this application will store its data.
         self.root_folder_path: str = "/Apps/Purse" 
         self.user_id: Optional[str] = None # Cloud provider's user ID, often obtained during auth
+        # Device-local (never synced) directory for provider sync state such as change cursors. See set_local_state_dir.
+        self.local_state_dir: Optional[Path] = None
         self._load_tokens_from_keyring()
 
     @abstractmethod
@@ -240,6 +242,22 @@ class BaseCloudService(ABC):
         """
         pass
 
+    async def close(self) -> None:
+        """
+        Releases long-lived resources (e.g. pooled HTTP connections). Called on app shutdown.
+        Default is a no-op; providers holding such resources override it.
+        """
+        pass
+
+    async def list_tree(self) -> AsyncGenerator[CloudFileMetadata, None]:
+        """
+        Yields every item under the app's root folder, with paths relative to it (what a sync diffs against).
+        Default is a recursive list_folder(""); providers with a change feed override it to list from
+        a locally kept snapshot that only needs the changes since the last call.
+        """
+        async for item in self.list_folder("", recursive=True):
+            yield item
+
     @abstractmethod
     def _reinitialize_client_with_loaded_tokens(self) -> None:
         """
@@ -383,6 +401,13 @@ class BaseCloudService(ABC):
         return f"{clean_root}/{clean_relative}"
 
 
+    def set_local_state_dir(self, state_dir: Path) -> None:
+        """
+        Sets a device-local directory (e.g. the app data dir) where the provider may persist sync state.
+        Kept out of the synced settings: such state describes this device's view of the cloud, not the user's.
+        """
+        self.local_state_dir = Path(state_dir)
+
     def set_root_folder_path(self, root_path: str) -> None:
         """
         Sets the user-defined root folder for the application in their cloud storage.
@@ -1,14 +1,41 @@
 import asyncio
+import functools
+from collections import OrderedDict
+import io
+import os
+import posixpath
+import sys
 from datetime import datetime, timezone
 import msal
 import httpx
-import json # For request bodies
+import json # For request bodies (fallback when orjson is not installed)
 import logging
-from typing import List, Optional, Tuple, Dict, Any, AsyncGenerator, TYPE_CHECKING
+from typing import List, Optional, Tuple, Dict, Any, AsyncGenerator, BinaryIO, TYPE_CHECKING
 from pathlib import Path
 from urllib.parse import quote # For encoding path segments in URLs
 import time # Needed for expires_at calculation in exchange_code_for_token
 
+try: # Optional: faster JSON for Graph request/response bodies
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    orjson = None
+    _loads = json.loads
+    _dumps = lambda obj: json.dumps(obj).encode('utf-8')
+
+# Compressed Graph responses (JSON listings compress well). Only advertise br when httpx can decode it,
+# i.e. brotli/brotlicffi is installed (httpx[brotli]); otherwise a br response would fail to decode.
+try:
+    import brotli # noqa: F401
+    GRAPH_ACCEPT_ENCODING = "gzip, br"
+except ImportError:
+    try:
+        import brotlicffi # noqa: F401
+        GRAPH_ACCEPT_ENCODING = "gzip, br"
+    except ImportError:
+        GRAPH_ACCEPT_ENCODING = "gzip"
+
 from src.services.cloud_storage.base_cloud_service import BaseCloudService, CloudFileMetadata
 from src.services.cloud_storage.exceptions import AuthError, ConfigurationError, ServiceError
 
@@ -21,6 +48,70 @@ logger = logging.getLogger(__name__)
 # Max size for simple PUT upload (Graph API recommends resumable for >4MB)
 SIMPLE_UPLOAD_MAX_SIZE_BYTES = 4 * 1024 * 1024 
 
+# Python 3.11+ fromisoformat accepts Graph's trailing 'Z' directly; older versions need it rewritten.
+_PY311 = sys.version_info >= (3, 11)
+_parse_iso = datetime.fromisoformat if _PY311 else (lambda s: datetime.fromisoformat(s.replace('Z', '+00:00')))
+
+@functools.lru_cache(maxsize=4096)
+def _iso_to_timestamp(iso_str: str) -> float:
+    """lastModifiedDateTime -> Unix timestamp. Cached: unchanged items repeat the same strings across listings."""
+    return _parse_iso(iso_str).timestamp()
+
+@functools.lru_cache(maxsize=4096)
+def _encode_suffix(full_path_in_drive: str) -> str:
+    """Graph path-addressing suffix for an absolute drive path. Memoized: sync loops hit the same paths repeatedly."""
+    if not full_path_in_drive or full_path_in_drive == "/":
+        return ""
+    return f":/{quote(full_path_in_drive.lstrip('/'))}:"
+
+def _join_rel(folder: str, name: str) -> str:
+    """Joins an app-root-relative folder and a name like str(Path(folder) / name), without the pathlib objects."""
+    return posixpath.join(folder, name) if folder and folder != "." else name
+
+def _cache_key(path: str) -> str:
+    """Normalizes an app-root-relative path for the conditional-GET caches ("", "." and "/" are the app root)."""
+    path = path.strip('/')
+    return "" if path == "." else path
+
+def _json(response: httpx.Response) -> Any:
+    """Decodes a Graph JSON body straight from the raw bytes."""
+    return _loads(response.content)
+
+# Chunk size for streamed downloads (bounded memory regardless of file size)
+DOWNLOAD_CHUNK_SIZE_BYTES = 1 << 20
+
+# Resumable upload chunk size; Graph requires multiples of 320 KiB
+UPLOAD_CHUNK_SIZE_BYTES = 10 * 320 * 1024
+UPLOAD_CHUNK_MAX_RETRIES = 3 # Per chunk, for 5xx/connection failures
+
+# Recursive list_folder: concurrent folder listings, and items buffered ahead of the consumer
+LIST_FOLDER_MAX_CONCURRENCY = 8
+LIST_FOLDER_RESULT_QUEUE_SIZE = 256
+
+# Conditional-GET caches (see _metadata_cache/_page_cache): entries kept, least recently used evicted first
+METADATA_CACHE_MAX_ENTRIES = 1024
+PAGE_CACHE_MAX_ENTRIES = 128
+
+# Graph $select clauses, prebuilt so URL suffixes are a single concatenation
+_SELECT = "$select=id,name,folder,file,size,lastModifiedDateTime,eTag,deleted"
+_LIST_TAIL = "/children?" + _SELECT
+_META_TAIL = "?" + _SELECT
+_DELTA_TAIL = "/delta?" + _SELECT + ",parentReference"
+_FOLDER_STATE_TAIL = ":?$select=id,folder"
+
+# Statuses callers handle themselves (missing item, name conflict, not modified): no body decode or error log
+_EXPECTED_ERRORS = frozenset({404, 409, 304})
+
+# Delta-query state (deltaLink + id snapshot of the app root), kept per device in the local state dir
+DELTA_STATE_FILENAME = "onedrive-delta.json"
+_DELTA_STATE_VERSION = 1 # Bump when the file layout changes so old state files are ignored
+
+# Graph caps a JSON $batch at 20 sub-requests
+GRAPH_BATCH_MAX_REQUESTS = 20
+
+# Connection pool for the shared Graph client (see _get_client)
+GRAPH_CLIENT_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=40)
+
 class OneDriveService(BaseCloudService):
     PROVIDER_NAME = "OneDrive"
 
@@ -39,6 +130,14 @@ class OneDriveService(BaseCloudService):
         if not all([self.onedrive_client_id, self.onedrive_authority, self.onedrive_scopes, self.onedrive_redirect_uri]):
             logger.error(f"{self.PROVIDER_NAME}: Critical OAuth configuration missing. OneDrive service will be unavailable.")
             self._is_configured = False
+            # Decided once here: the Graph entry points become no-ops on this instance, so the configured
+            # code paths don't need to re-check _is_configured on every call.
+            self._make_graph_api_call = self._unconfigured_call
+            self._stream_download = self._unconfigured_false
+            self.ensure_app_root_folder_exists = self._unconfigured_false
+            self.list_folder = self._unconfigured_listgen
+            self.list_changes = self._unconfigured_listgen
+            self.list_tree = self._unconfigured_listgen
         else:
             self._is_configured = True
         
@@ -46,16 +145,47 @@ class OneDriveService(BaseCloudService):
         self.msal_app: Optional[msal.PublicClientApplication] = None # Will be set by _reinitialize_client_with_loaded_tokens
         
         self._pkce_verifier: Optional[str] = None 
+        # (cache object, its last serialized string): lets _serialize_msal_cache skip re-serializing an unchanged cache
+        self._last_serialized_cache: Optional[Tuple[msal.SerializableTokenCache, str]] = None
+
+        # One pooled HTTP/2 client for all Graph calls, created on first use, so requests reuse
+        # connections instead of paying a TCP+TLS handshake each. Closed via close().
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_lock = asyncio.Lock()
+
+        # Auth headers from the last acquire_token_silent, reused until shortly before the token expires
+        # so each Graph call doesn't go through MSAL's cache lookup on a worker thread.
+        self._cached_headers: Optional[Dict[str, str]] = None
+        self._token_expiry_monotonic: float = 0.0
+        self._token_lock = asyncio.Lock()
+
+        # Conditional-GET caches: the last eTag seen per item path, and per listing page (folder, page url).
+        # Requests send If-None-Match and a 304 reuses the cached result without downloading/parsing JSON.
+        # Both hold built CloudFileMetadata (not Graph JSON) and are LRU-bounded (see _cache_put).
+        # Entries are dropped when this client uploads or deletes under the path (see _invalidate_cached_path).
+        self._metadata_cache: "OrderedDict[str, Tuple[str, CloudFileMetadata]]" = OrderedDict()
+        self._page_cache: "OrderedDict[Tuple[str, str], Tuple[str, List[CloudFileMetadata], Optional[str]]]" = OrderedDict()
+
+        # Delta-query state (see _apply_delta): the last @odata.deltaLink and an id -> item snapshot of the app
+        # root. Delta responses identify parents by id only (no parentReference.path), so paths are resolved
+        # through the snapshot. Loaded from / saved to the device-local state dir, never the synced settings.
+        self._delta_link: Optional[str] = None
+        self._delta_root_path: Optional[str] = None # App root the snapshot belongs to
+        self._delta_root_id: Optional[str] = None
+        self._delta_items: Dict[str, List[Any]] = {} # id -> [name, parent id, eTag, size, modified ts, is_folder]
+        self._delta_state_loaded = False
         
         self._reinitialize_client_with_loaded_tokens() # This will use self.access_token (cache string) and self.user_id
 
     def _reinitialize_client_with_loaded_tokens(self) -> None:
         """Initializes or re-initializes the MSAL app and its cache using loaded tokens."""
+        self._invalidate_cached_headers() # Tokens may have changed; don't keep serving old headers
         # self.msal_cache is already a fresh instance from __init__ or previous calls.
         # Deserialize into this instance's msal_cache object.
         if self.access_token: # self.access_token from base class IS the serialized MSAL cache string.
             try:
                 self.msal_cache.deserialize(self.access_token)
+                self._last_serialized_cache = (self.msal_cache, self.access_token) # deserialize() clears has_state_changed
                 logger.info(f"{self.PROVIDER_NAME}: MSAL cache deserialized successfully for user {self.user_id}.")
             except Exception as e:
                 logger.warning(f"{self.PROVIDER_NAME}: Failed to deserialize MSAL cache from keyring for user {self.user_id}: {e}. Starting with an empty cache.", exc_info=True)
@@ -79,6 +209,21 @@ class OneDriveService(BaseCloudService):
             logger.error(f"{self.PROVIDER_NAME}: MSAL app cannot be initialized because service is not configured.")
 
     async def _get_headers(self) -> Optional[Dict[str, str]]:
+        headers = self._cached_headers
+        if headers is not None and time.monotonic() < self._token_expiry_monotonic:
+            return headers
+        async with self._token_lock: # One MSAL call at a time; waiters reuse its result
+            headers = self._cached_headers
+            if headers is not None and time.monotonic() < self._token_expiry_monotonic:
+                return headers
+            return await self._acquire_headers()
+
+    def _invalidate_cached_headers(self) -> None:
+        self._cached_headers = None
+        self._token_expiry_monotonic = 0.0
+
+    async def _acquire_headers(self) -> Optional[Dict[str, str]]:
+        """Gets a bearer token via MSAL (silent) and caches the resulting headers."""
         if not self.msal_app or not self.onedrive_scopes or not self._is_configured:
             logger.error(f"{self.PROVIDER_NAME}: MSAL app or OAuth parameters not configured. Cannot acquire token.")
             return None
@@ -110,7 +255,13 @@ class OneDriveService(BaseCloudService):
             # The MSAL cache (self.msal_cache which is self.msal_app.token_cache) is automatically updated by acquire_token_silent.
             # The base class self.access_token attribute is for storing the serialized cache string in keyring,
             # it should NOT be set to the bearer_token here.
-            return {"Authorization": f"Bearer {bearer_token}", "Content-Type": "application/json"}
+            headers = {"Authorization": f"Bearer {bearer_token}", "Content-Type": "application/json",
+                       "Accept-Encoding": GRAPH_ACCEPT_ENCODING} # httpx decodes transparently for .content/.json()
+            # Refresh a minute early so a request never goes out with a token about to expire.
+            expires_in = token_result.get("expires_in") or 3600
+            self._token_expiry_monotonic = time.monotonic() + float(expires_in) - 60
+            self._cached_headers = headers
+            return headers
         else:
             logger.warning(f"{self.PROVIDER_NAME}: Failed to acquire token silently for user {self.user_id}. Details: {token_result.get('error_description', 'No specific error description.') if token_result else 'No token result.'}")
             return None
@@ -130,6 +281,19 @@ class OneDriveService(BaseCloudService):
         )
         return auth_url, self._pkce_verifier
 
+    async def _serialize_msal_cache(self) -> str:
+        """
+        Serialized MSAL cache for the keyring. serialize() JSON-encodes the whole cache, so it runs on a worker
+        thread, and only when MSAL reports a change (or the cache object was replaced); otherwise the last string is reused.
+        """
+        cache = self.msal_cache
+        last = self._last_serialized_cache
+        if last is None or last[0] is not cache or cache.has_state_changed:
+            serialized = await asyncio.to_thread(cache.serialize)
+            cache.has_state_changed = False # Per MSAL's contract, the app resets the flag after persisting
+            last = self._last_serialized_cache = (cache, serialized)
+        return last[1]
+
     async def exchange_code_for_token(self, auth_code: str, code_verifier: Optional[str] = None) -> Dict[str, Any]:
         if not self.msal_app or not self.onedrive_scopes or not self.onedrive_redirect_uri:
             self._reinitialize_client_with_loaded_tokens()
@@ -157,7 +321,7 @@ class OneDriveService(BaseCloudService):
             raise AuthError(f"Token acquisition error: {err_msg}", user_message=f"Could not get OneDrive token: {err_msg}")
 
         acquired_bearer_token = token_result.get("access_token") 
-        msal_cache_string_to_save = self.msal_cache.serialize() 
+        msal_cache_string_to_save = await self._serialize_msal_cache()
         
         account = token_result.get("account")
         user_id_val = None
@@ -229,7 +393,7 @@ class OneDriveService(BaseCloudService):
 
         if token_result and "access_token" in token_result:
             bearer_access_token = token_result["access_token"]
-            updated_msal_cache_string = self.msal_cache.serialize()
+            updated_msal_cache_string = await self._serialize_msal_cache()
             
             refreshed_account_home_id = account_to_use.get("home_account_id") if account_to_use else self.user_id
 
@@ -269,10 +433,30 @@ class OneDriveService(BaseCloudService):
             self.msal_app.token_cache = self.msal_cache
         
         self._delete_tokens_from_keyring() 
+        self._invalidate_cached_headers()
+        self._metadata_cache.clear()
+        self._page_cache.clear()
         
         logger.info(f"{self.PROVIDER_NAME}: Disconnected. MSAL cache and keyring tokens cleared.")
         self.msal_app = None # Ensure msal_app is None after disconnect
 
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Returns the shared Graph client, creating it on first use."""
+        if self._client is None:
+            async with self._client_lock:
+                if self._client is None: # Another task may have created it while we waited
+                    self._client = httpx.AsyncClient(
+                        base_url=self.graph_api_endpoint, http2=True, timeout=30.0, limits=GRAPH_CLIENT_LIMITS
+                    )
+        return self._client
+
+    async def close(self) -> None:
+        """Closes the shared Graph client and its pooled connections."""
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+            logger.debug(f"{self.PROVIDER_NAME}: Graph HTTP client closed.")
+
     # --- Graph API specific methods (largely unchanged but rely on updated auth) ---
 
     def _graph_item_to_cloudfile(self, graph_item: Dict[str, Any], path_display_relative_to_app_root: str) -> CloudFileMetadata:
@@ -285,12 +469,11 @@ class OneDriveService(BaseCloudService):
         size = graph_item.get('size', 0) if not is_folder else 0
         
         modified_time_str = graph_item.get('lastModifiedDateTime')
-        modified_timestamp = datetime.now(timezone.utc).timestamp()
-        if modified_time_str:
-            try:
-                dt_obj = datetime.fromisoformat(modified_time_str.replace('Z', '+00:00'))
-                modified_timestamp = dt_obj.timestamp()
-            except ValueError:
+        try:
+            modified_timestamp = _iso_to_timestamp(modified_time_str)
+        except (ValueError, TypeError): # TypeError: field missing (None)
+            modified_timestamp = datetime.now(timezone.utc).timestamp()
+            if modified_time_str:
                 logger.warning(f"Could not parse lastModifiedDateTime '{modified_time_str}' for item '{name}'. Using current time.")
         
         return CloudFileMetadata(
@@ -299,32 +482,54 @@ class OneDriveService(BaseCloudService):
             is_folder=is_folder, is_deleted=is_deleted
         )
     
+    async def _unconfigured_call(self, *args: Any, **kwargs: Any) -> None:
+        """Stands in for _make_graph_api_call when OAuth configuration is missing (see __init__)."""
+        logger.error(f"{self.PROVIDER_NAME}: Service not configured. Cannot make Graph API call.")
+        return None
+
+    async def _unconfigured_false(self, *args: Any, **kwargs: Any) -> bool:
+        logger.error(f"{self.PROVIDER_NAME}: Service not configured.")
+        return False
+
+    async def _unconfigured_listgen(self, *args: Any, **kwargs: Any) -> AsyncGenerator[CloudFileMetadata, None]:
+        logger.error(f"{self.PROVIDER_NAME}: Service not configured. Nothing to list.")
+        if False: # Makes this an (empty) async generator
+            yield
+
     async def _make_graph_api_call(self, method: str, url_suffix: str, headers_extra: Optional[Dict[str,str]] = None, **kwargs) -> Optional[httpx.Response]:
-        if not self._is_configured: 
-            logger.error(f"{self.PROVIDER_NAME}: Service not configured. Cannot make Graph API call.")
-            return None
-        
         base_headers = await self._get_headers()
         if not base_headers:
             logger.error(f"{self.PROVIDER_NAME}: Cannot make Graph API call, authentication failed or token unavailable.")
             return None # AuthError should be raised by caller if this is critical path
         
-        effective_headers = {**base_headers, **(headers_extra or {})}
+        # The cached headers dict is shared and never mutated, so the common no-extras case allocates nothing.
+        effective_headers = base_headers if not headers_extra else {**base_headers, **headers_extra}
+        if 'json' in kwargs: # Encode bodies ourselves (orjson when available); base headers already say application/json
+            kwargs['content'] = _dumps(kwargs.pop('json'))
         
-        full_url = f"{self.graph_api_endpoint}{url_suffix}"
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client: # Default timeout for operations
-                response = await client.request(method, full_url, headers=effective_headers, **kwargs)
+            client = await self._get_client() # base_url is the Graph endpoint, so the suffix is enough
+            response = await client.request(method, url_suffix, headers=effective_headers, **kwargs)
+            if response.status_code == 401:
+                # The cached token may have been revoked early: drop it and retry once with a fresh one.
+                self._invalidate_cached_headers()
+                base_headers = await self._get_headers()
+                if base_headers:
+                    effective_headers = base_headers if not headers_extra else {**base_headers, **headers_extra}
+                    response = await client.request(method, url_suffix, headers=effective_headers, **kwargs)
             
             if 400 <= response.status_code < 600:
-                 try: error_details = response.json()
-                 except: error_details = response.text 
-                 logger.error(f"{self.PROVIDER_NAME}: Graph API error {response.status_code} for {method} {url_suffix}: {error_details}")
-                 # Consider raising specific exceptions for common errors like 401, 403, 404
-                 if response.status_code == 401:
-                     raise AuthError(f"Graph API Unauthorized (401): {error_details}", user_message="Your OneDrive session is invalid or expired. Please log in again.")
-                 elif response.status_code == 403:
-                     raise AuthError(f"Graph API Forbidden (403): {error_details}", user_message="You don't have permission for this OneDrive operation.")
+                 if response.status_code in _EXPECTED_ERRORS:
+                     logger.debug(f"{self.PROVIDER_NAME}: Graph API {response.status_code} for {method} {url_suffix} (request-id {response.headers.get('request-id')})")
+                 else:
+                     try: error_details = _json(response)
+                     except (ValueError, UnicodeDecodeError): error_details = response.text
+                     logger.error(f"{self.PROVIDER_NAME}: Graph API error {response.status_code} for {method} {url_suffix}: {error_details}")
+                     # Consider raising specific exceptions for common errors like 401, 403, 404
+                     if response.status_code == 401:
+                         raise AuthError(f"Graph API Unauthorized (401): {error_details}", user_message="Your OneDrive session is invalid or expired. Please log in again.")
+                     elif response.status_code == 403:
+                         raise AuthError(f"Graph API Forbidden (403): {error_details}", user_message="You don't have permission for this OneDrive operation.")
                  response.raise_for_status() # Raises HTTPStatusError for 4xx/5xx
             return response
         except httpx.HTTPStatusError as e: 
@@ -342,7 +547,7 @@ class OneDriveService(BaseCloudService):
         try:
             response = await self._make_graph_api_call("GET", "/me?$select=id,displayName,mail,userPrincipalName")
             if response and response.status_code == 200:
-                user_data = response.json()
+                user_data = _json(response)
                 return {"id": user_data.get('id'), "name": user_data.get('displayName'),
                         "email": user_data.get('mail') or user_data.get('userPrincipalName'), "raw": user_data}
         except ServiceError as e: # Catch errors raised by _make_graph_api_call
@@ -351,56 +556,316 @@ class OneDriveService(BaseCloudService):
         return None
 
     def _get_graph_path_suffix(self, path_relative_to_app_root: str) -> str:
-        full_path_in_drive = self.get_full_cloud_path(path_relative_to_app_root)
-        if not full_path_in_drive or full_path_in_drive == "/": 
-            # If full_path_in_drive is effectively root, suffix should be empty for /me/drive/root
-            # or ":/" for /me/drive/root:/ (which means root content)
-            # For /children, an empty suffix for root is fine.
-            # For specific item at root, it's /me/drive/root (no suffix)
-            # Let's make it so that empty path_relative_to_app_root -> "" for /me/drive/root
-            # and "foo" -> ":/foo:"
-            return "" if not path_relative_to_app_root.strip('/') else f":/{quote(full_path_in_drive.lstrip('/'))}:"
-        return f":/{quote(full_path_in_drive.lstrip('/'))}:" 
-
-    async def list_folder(self, folder_path: str, recursive: bool = False) -> AsyncGenerator[CloudFileMetadata, None]:
+        # "" for the drive root (-> /me/drive/root), otherwise ":/<encoded path>:" (-> /me/drive/root:/foo:)
+        return _encode_suffix(self.get_full_cloud_path(path_relative_to_app_root))
+
+    @staticmethod
+    def _cache_put(cache: "OrderedDict[Any, Any]", key: Any, value: Any, max_entries: int) -> None:
+        """Stores value as the most recently used entry, evicting the least recently used beyond max_entries."""
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > max_entries:
+            cache.popitem(last=False)
+
+    def _page_to_metadata(self, items: List[Dict[str, Any]], folder_path: str) -> List[CloudFileMetadata]:
+        """Converts one page of Graph children of folder_path to CloudFileMetadata."""
+        # _graph_item_to_cloudfile inlined for the per-item hot loop (no extra frame per item), with the
+        # helpers bound to locals once per page. Items with an unparseable timestamp take the regular path.
+        to_timestamp, make_meta, join_rel = _iso_to_timestamp, CloudFileMetadata, _join_rel
+        metas: List[CloudFileMetadata] = []
+        for item in items:
+            name = item['name']
+            try:
+                modified_timestamp = to_timestamp(item.get('lastModifiedDateTime'))
+            except (ValueError, TypeError):
+                metas.append(self._graph_item_to_cloudfile(item, join_rel(folder_path, name)))
+                continue
+            is_folder = 'folder' in item
+            metas.append(make_meta(item['id'], name, join_rel(folder_path, name), str(item.get('eTag', 'unknown')),
+                                   0 if is_folder else item.get('size', 0), modified_timestamp, is_folder, 'deleted' in item))
+        return metas
+
+    async def _list_one_page(self, url_suffix: str, folder_path: str, folder_key: str) -> Tuple[List[CloudFileMetadata], Optional[str]]:
+        """Fetches one page of children; returns (their metadata, next page's url suffix or None)."""
+        cache_key = (folder_key, url_suffix)
+        cached = self._page_cache.get(cache_key)
+        headers_extra = {"If-None-Match": cached[0]} if cached else None
+        response = await self._make_graph_api_call("GET", url_suffix, headers_extra=headers_extra)
+        if cached and response is not None and response.status_code == 304: # Page unchanged since last listing
+            self._page_cache.move_to_end(cache_key)
+            return cached[1], cached[2]
+        if not response or response.status_code != 200:
+            return [], None
+        data = _json(response)
+        next_link = data.get('@odata.nextLink')
+        metas = self._page_to_metadata(data.get('value', []), folder_path)
+        next_suffix = next_link.replace(self.graph_api_endpoint, "") if next_link else None
+        etag = response.headers.get('ETag')
+        if etag:
+            self._cache_put(self._page_cache, cache_key, (etag, metas, next_suffix), PAGE_CACHE_MAX_ENTRIES)
+        else:
+            self._page_cache.pop(cache_key, None)
+        return metas, next_suffix
+
+    async def _iter_folder(self, folder_path: str) -> AsyncGenerator[CloudFileMetadata, None]:
+        """Yields the direct children of one folder, following pagination. Errors are logged and end the listing."""
         graph_path_suffix = self._get_graph_path_suffix(folder_path)
         # If graph_path_suffix is empty, it means list root. If it ends with ':', it's a folder path.
-        url_suffix = f"/me/drive/root{graph_path_suffix}/children?$select=id,name,folder,file,size,lastModifiedDateTime,eTag,deleted"
-        next_link = None
-        while True:
-            current_url = next_link if next_link else f"{self.graph_api_endpoint}{url_suffix}"
-            api_call_url_suffix = current_url.replace(self.graph_api_endpoint, "")
+        url_suffix: Optional[str] = "/me/drive/root" + graph_path_suffix + _LIST_TAIL
+        folder_key = _cache_key(folder_path)
+        while url_suffix:
             try:
-                response = await self._make_graph_api_call("GET", api_call_url_suffix)
-                if not response or response.status_code != 200: break
-                data = response.json()
-                for item in data.get('value', []):
-                    item_rel_path = str(Path(folder_path) / item['name'])
-                    yield self._graph_item_to_cloudfile(item, item_rel_path)
-                    if recursive and 'folder' in item:
-                        async for sub_item in self.list_folder(item_rel_path, recursive=True): yield sub_item
-                next_link = data.get('@odata.nextLink')
-                if not next_link: break
+                metas, url_suffix = await self._list_one_page(url_suffix, folder_path, folder_key)
             except ServiceError as e:
                 logger.error(f"{self.PROVIDER_NAME}: ServiceError listing folder '{folder_path}': {e.message}")
-                break
+                return
             except Exception as e: # Catch any other unexpected error from _make_graph_api_call
                 logger.error(f"{self.PROVIDER_NAME}: Unexpected error listing folder '{folder_path}': {e}", exc_info=True)
-                break
+                return
+            for meta in metas:
+                yield meta
+
+    async def list_folder(self, folder_path: str, recursive: bool = False,
+                          max_concurrency: int = LIST_FOLDER_MAX_CONCURRENCY) -> AsyncGenerator[CloudFileMetadata, None]:
+        """
+        Yields items in folder_path. With recursive=True, subfolders are listed concurrently by up to
+        max_concurrency workers, so items arrive in completion order rather than depth-first.
+        """
+        if not recursive:
+            async for item in self._iter_folder(folder_path):
+                yield item
+            return
+
+        folders: asyncio.Queue = asyncio.Queue()
+        results: asyncio.Queue = asyncio.Queue(maxsize=LIST_FOLDER_RESULT_QUEUE_SIZE) # Backpressure on workers
+        done = object() # Sentinel: every queued folder has been fully listed
+
+        async def worker() -> None:
+            while True:
+                path = await folders.get()
+                try:
+                    async for item in self._iter_folder(path):
+                        if item.is_folder:
+                            folders.put_nowait(item.path_display) # Queued before task_done(), so join() can't finish early
+                        await results.put(item)
+                except Exception as e: # Keep the worker alive for the remaining folders
+                    logger.error(f"{self.PROVIDER_NAME}: Unexpected error listing folder '{path}': {e}", exc_info=True)
+                finally:
+                    folders.task_done()
+
+        async def signal_when_drained() -> None:
+            await folders.join()
+            await results.put(done)
+
+        folders.put_nowait(folder_path)
+        tasks = [asyncio.create_task(worker()) for _ in range(max(1, max_concurrency))]
+        tasks.append(asyncio.create_task(signal_when_drained()))
+        try:
+            while True:
+                item = await results.get()
+                if item is done:
+                    break
+                yield item
+        finally: # Also runs if the consumer stops iterating early
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _delta_state_path(self) -> Optional[Path]:
+        return self.local_state_dir / DELTA_STATE_FILENAME if self.local_state_dir else None
+
+    def _read_delta_state(self, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            state = _loads(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e: # Unreadable or corrupt: start over with a full enumeration
+            logger.warning(f"{self.PROVIDER_NAME}: Ignoring unreadable delta state '{path}': {e}")
+            return None
+        return state if type(state) is dict and state.get('version') == _DELTA_STATE_VERSION else None
+
+    @staticmethod
+    def _write_delta_state(path: Path, payload: bytes) -> None:
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, path)
+
+    async def _load_delta_state(self) -> None:
+        """Loads the persisted delta state once per instance, if it belongs to this account and app root."""
+        if self._delta_state_loaded:
+            return
+        self._delta_state_loaded = True
+        path = self._delta_state_path()
+        state = await asyncio.to_thread(self._read_delta_state, path) if path else None
+        if state and state.get('user') == self.user_id and state.get('root') == self.get_full_cloud_path(""):
+            self._delta_link = state.get('link')
+            self._delta_root_path = state['root']
+            self._delta_root_id = state.get('root_id')
+            self._delta_items = state.get('items') or {}
+
+    async def _save_delta_state(self) -> None:
+        path = self._delta_state_path()
+        if not path:
+            return
+        payload = _dumps({'version': _DELTA_STATE_VERSION, 'user': self.user_id, 'root': self._delta_root_path,
+                          'root_id': self._delta_root_id, 'link': self._delta_link, 'items': self._delta_items})
+        try:
+            await asyncio.to_thread(self._write_delta_state, path, payload)
+        except OSError as e: # Next session just enumerates everything again
+            logger.warning(f"{self.PROVIDER_NAME}: Could not save delta state to '{path}': {e}")
+
+    def _reset_delta_state(self, root_path: str) -> None:
+        self._delta_link = None
+        self._delta_root_path = root_path
+        self._delta_root_id = None
+        self._delta_items = {}
 
+    def _delta_rel_path(self, item_id: str, resolved: Dict[str, Optional[str]]) -> Optional[str]:
+        """
+        App-root-relative path of a snapshot item, walking parent ids up to the app root.
+        None if the item (or an ancestor) isn't in the snapshot. resolved memoizes paths for one snapshot state.
+        """
+        if item_id == self._delta_root_id:
+            return ""
+        if item_id in resolved:
+            return resolved[item_id]
+        resolved[item_id] = None # Guards against parent cycles while resolving
+        entry = self._delta_items.get(item_id)
+        path = None
+        if entry is not None and entry[1]:
+            parent_path = self._delta_rel_path(entry[1], resolved)
+            if parent_path is not None:
+                path = _join_rel(parent_path, entry[0])
+        resolved[item_id] = path
+        return path
+
+    @staticmethod
+    def _delta_entry_meta(item_id: str, entry: List[Any], rel_path: str, is_deleted: bool = False) -> CloudFileMetadata:
+        return CloudFileMetadata(item_id, entry[0], rel_path, entry[2], entry[3], entry[4], entry[5], is_deleted)
+
+    async def _apply_delta(self) -> Optional[List[CloudFileMetadata]]:
+        """
+        Brings the id snapshot up to date with Graph's delta query and returns the items that changed
+        (the first run, or one after the delta token expired, returns every item). Deleted items carry no
+        name or parent, so they are reported at their last known path with is_deleted=True.
+        Returns None on failure. The new deltaLink and snapshot are saved only after the last page, so an
+        interrupted run is repeated from the previous link (re-applying changes by id is idempotent).
+        """
+        await self._load_delta_state()
+        root_path = self.get_full_cloud_path("")
+        if self._delta_root_path != root_path: # App root changed: the snapshot describes another folder
+            self._reset_delta_state(root_path)
+        if self._delta_root_id is None:
+            root_meta = await self.get_file_metadata("")
+            if root_meta is None:
+                logger.error(f"{self.PROVIDER_NAME}: Could not resolve app root '{root_path}' for change listing.")
+                return None
+            self._delta_root_id = root_meta.id
+
+        items = self._delta_items
+        changed_ids: Dict[str, None] = {} # Ordered set; paths are resolved once all pages are applied
+        deleted: Dict[str, CloudFileMetadata] = {}
+        initial_url = "/me/drive/root" + self._get_graph_path_suffix('') + _DELTA_TAIL
+        url_suffix: Optional[str] = self._delta_link.replace(self.graph_api_endpoint, "") if self._delta_link else initial_url
+        while url_suffix:
+            try:
+                response = await self._make_graph_api_call("GET", url_suffix)
+            except ServiceError as e:
+                if self._http_status(e) == 410 and url_suffix != initial_url: # Token expired: Graph wants a full resync
+                    logger.warning(f"{self.PROVIDER_NAME}: Delta token expired, restarting change enumeration from scratch.")
+                    items.clear() # Deletions since the token expired won't be reported; rebuild from the listing
+                    self._delta_link = None
+                    url_suffix = initial_url
+                    continue
+                logger.error(f"{self.PROVIDER_NAME}: ServiceError listing changes: {e.message}")
+                return None
+            except Exception as e:
+                logger.error(f"{self.PROVIDER_NAME}: Unexpected error listing changes: {e}", exc_info=True)
+                return None
+            if not response or response.status_code != 200:
+                return None
+            data = _json(response)
+            for item in data.get('value', []):
+                item_id = item.get('id')
+                if not item_id or item_id == self._delta_root_id:
+                    continue
+                if 'deleted' in item:
+                    rel_path = self._delta_rel_path(item_id, {}) # Before the entry goes away
+                    entry = items.pop(item_id, None)
+                    changed_ids.pop(item_id, None)
+                    if entry is not None and rel_path is not None:
+                        deleted[item_id] = self._delta_entry_meta(item_id, entry, rel_path, is_deleted=True)
+                    continue
+                meta = self._graph_item_to_cloudfile(item, "")
+                items[item_id] = [meta.name, (item.get('parentReference') or {}).get('id'), meta.rev,
+                                  meta.size, meta.modified_timestamp, meta.is_folder]
+                changed_ids[item_id] = None
+                deleted.pop(item_id, None) # Restored within the same run
+            next_link = data.get('@odata.nextLink')
+            if next_link:
+                url_suffix = next_link.replace(self.graph_api_endpoint, "")
+                continue
+            self._delta_link = data.get('@odata.deltaLink') or self._delta_link
+            url_suffix = None
+
+        await self._save_delta_state()
+        resolved: Dict[str, Optional[str]] = {}
+        changes = list(deleted.values())
+        for item_id in changed_ids:
+            rel_path = self._delta_rel_path(item_id, resolved)
+            if rel_path is not None:
+                changes.append(self._delta_entry_meta(item_id, items[item_id], rel_path))
+        return changes
+
+    async def list_changes(self) -> AsyncGenerator[CloudFileMetadata, None]:
+        """
+        Yields items under the app root that changed since the previous call (on this device), using Graph's
+        delta query, so a steady-state sync costs O(changes) instead of listing the whole tree. The first call
+        yields every item. Deleted items come back with is_deleted=True. Nothing is yielded on failure.
+        """
+        for meta in await self._apply_delta() or ():
+            yield meta
+
+    async def list_tree(self) -> AsyncGenerator[CloudFileMetadata, None]:
+        """
+        Yields every item under the app root from the delta snapshot, after applying the changes since the
+        last call. Falls back to a recursive list_folder if the delta query fails, so a sync never diffs
+        against a stale or empty snapshot.
+        """
+        if await self._apply_delta() is None:
+            logger.warning(f"{self.PROVIDER_NAME}: Change listing failed, falling back to a full folder listing.")
+            async for meta in self.list_folder("", recursive=True):
+                yield meta
+            return
+        resolved: Dict[str, Optional[str]] = {}
+        for item_id, entry in list(self._delta_items.items()):
+            rel_path = self._delta_rel_path(item_id, resolved)
+            if rel_path is not None: # Orphans (e.g. children of a folder reported deleted) are skipped
+                yield self._delta_entry_meta(item_id, entry, rel_path)
 
     async def get_file_metadata(self, cloud_file_path: str) -> Optional[CloudFileMetadata]:
         graph_path_suffix = self._get_graph_path_suffix(cloud_file_path)
         # If graph_path_suffix is empty, it means get metadata for root.
-        url_suffix = f"/me/drive/root{graph_path_suffix}?$select=id,name,folder,file,size,lastModifiedDateTime,eTag,deleted"
+        url_suffix = "/me/drive/root" + graph_path_suffix + _META_TAIL
+        cache_key = _cache_key(cloud_file_path)
+        cached = self._metadata_cache.get(cache_key)
         
         try:
-            response = await self._make_graph_api_call("GET", url_suffix)
+            response = await self._make_graph_api_call("GET", url_suffix,
+                                                       headers_extra={"If-None-Match": cached[0]} if cached else None)
+            if cached and response is not None and response.status_code == 304: # Unchanged: skip the body entirely
+                self._metadata_cache.move_to_end(cache_key)
+                return cached[1]
             if response and response.status_code == 200:
                 # If cloud_file_path was empty or "/", it's the root. Display name might be from response.
                 # For consistency, use the provided cloud_file_path for path_display if it was given.
-                path_display = cloud_file_path if cloud_file_path else response.json().get('name', '') # Fallback to item name if path is empty (root)
-                return self._graph_item_to_cloudfile(response.json(), path_display)
+                item = _json(response)
+                path_display = cloud_file_path if cloud_file_path else item.get('name', '') # Fallback to item name if path is empty (root)
+                meta = self._graph_item_to_cloudfile(item, path_display)
+                etag = item.get('eTag')
+                if etag:
+                    self._cache_put(self._metadata_cache, cache_key, (etag, meta), METADATA_CACHE_MAX_ENTRIES)
+                return meta
         except httpx.HTTPStatusError as e: # Raised by _make_graph_api_call for 4xx/5xx
             if e.response.status_code == 404: 
                 logger.debug(f"{self.PROVIDER_NAME}: Metadata not found (404) for '{cloud_file_path}'. Graph path: {graph_path_suffix}")
@@ -410,12 +875,23 @@ class OneDriveService(BaseCloudService):
         except Exception: pass # Already logged by _make_graph_api_call for unexpected
         return None
 
+    def _invalidate_cached_path(self, cloud_path: str) -> None:
+        """Forgets cached metadata for cloud_path and anything below it, and cached listings of it and its parent."""
+        key = _cache_key(cloud_path)
+        parent = key.rpartition('/')[0]
+        prefix = key + '/'
+        for meta_key in [k for k in self._metadata_cache if k == key or k.startswith(prefix)]:
+            del self._metadata_cache[meta_key]
+        for page_key in [k for k in self._page_cache if k[0] in (key, parent) or k[0].startswith(prefix)]:
+            del self._page_cache[page_key]
+
     async def create_folder(self, cloud_folder_path: str) -> bool:
         if not cloud_folder_path or cloud_folder_path == ".": 
             return await self.ensure_app_root_folder_exists()
 
-        parent_path = str(Path(cloud_folder_path).parent)
-        folder_name = Path(cloud_folder_path).name
+        # Plain string split instead of pathlib; "a/b" -> ("a", "b"), "b" -> (".", "b") like Path.parent/.name.
+        parent_path, _, folder_name = cloud_folder_path.rstrip('/').rpartition('/')
+        parent_path = parent_path or "."
         
         # Determine parent graph suffix. If parent_path is "." or "", it's the app root.
         # _get_graph_path_suffix handles empty path correctly for app root.
@@ -426,21 +902,101 @@ class OneDriveService(BaseCloudService):
         try:
             response = await self._make_graph_api_call("POST", url_suffix, json=request_body)
             return response is not None and response.status_code == 201
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 409: 
+        except (ServiceError, httpx.HTTPStatusError) as e: # _make_graph_api_call wraps HTTPStatusError in ServiceError
+            if self._http_status(e) == 409: 
                 logger.info(f"{self.PROVIDER_NAME}: Folder '{cloud_folder_path}' likely already exists (conflict 409). Verifying.")
-                meta = await self.get_file_metadata(cloud_folder_path) 
-                return meta is not None and meta.is_folder
-            # Other errors already logged by _make_graph_api_call
-        except ServiceError as e:
-            logger.error(f"{self.PROVIDER_NAME}: ServiceError creating folder '{cloud_folder_path}': {e.message}")
+                return await self._exists_as_folder(cloud_folder_path) is True
+            logger.error(f"{self.PROVIDER_NAME}: ServiceError creating folder '{cloud_folder_path}': {e}")
         except Exception: pass # Already logged
         return False
 
+    async def _exists_as_folder(self, cloud_path: str) -> Optional[bool]:
+        """
+        True if cloud_path (relative to the app root) is a folder, False if it is a file or missing, None on error.
+        Asks only for the 'folder' facet rather than building full metadata. Graph's HEAD responses carry no
+        folder/file distinction, so this is a minimal GET.
+        """
+        state = await self._folder_state(self.get_full_cloud_path(cloud_path).lstrip('/'))
+        return None if state is None else state == 'folder'
+
+    @staticmethod
+    def _http_status(exc: Exception) -> Optional[int]:
+        """HTTP status behind an error from _make_graph_api_call (which wraps HTTPStatusError in ServiceError)."""
+        cause = exc if isinstance(exc, httpx.HTTPStatusError) else exc.__cause__
+        return cause.response.status_code if isinstance(cause, httpx.HTTPStatusError) else None
+
+    async def _folder_state(self, path_from_drive_root: str) -> Optional[str]:
+        """'folder', 'file' or 'missing' for a path under the drive root; None on other errors (logged)."""
+        url_suffix = "/me/drive/root:/" + quote(path_from_drive_root) + _FOLDER_STATE_TAIL
+        try:
+            response = await self._make_graph_api_call("GET", url_suffix)
+        except (ServiceError, httpx.HTTPStatusError) as e:
+            if self._http_status(e) == 404:
+                return 'missing'
+            logger.error(f"Error checking '{path_from_drive_root}': {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error checking '{path_from_drive_root}': {e}")
+            return None
+        if not (response and response.status_code == 200):
+            return None
+        return 'folder' if 'folder' in _json(response) else 'file'
+
+    async def _graph_batch(self, requests: List[Dict[str, Any]]) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Sends up to GRAPH_BATCH_MAX_REQUESTS sub-requests in one /$batch round-trip.
+        Returns the sub-responses keyed by request id, or None if batching failed/unsupported.
+        """
+        try:
+            response = await self._make_graph_api_call("POST", "/$batch", json={"requests": requests})
+        except Exception as e:
+            logger.debug(f"{self.PROVIDER_NAME}: $batch request failed ({e}); falling back to individual requests.")
+            return None
+        if not (response and response.status_code == 200):
+            return None
+        return {r.get('id'): r for r in _json(response).get('responses', [])}
+
+    async def _count_existing_prefixes(self, prefixes: List[str]) -> Optional[int]:
+        """
+        How many leading entries of prefixes (each a parent of the next) exist as folders.
+        One $batch round-trip when possible, sequential GETs otherwise. None on error or if one is a file.
+        """
+        states: List[Optional[str]] = []
+        batch = None
+        if 0 < len(prefixes) <= GRAPH_BATCH_MAX_REQUESTS:
+            batch = await self._graph_batch([
+                {"id": str(i), "method": "GET", "url": "/me/drive/root:/" + quote(prefix) + _FOLDER_STATE_TAIL}
+                for i, prefix in enumerate(prefixes)
+            ])
+        if batch is not None:
+            for i in range(len(prefixes)):
+                sub = batch.get(str(i), {})
+                status = sub.get('status')
+                if status == 200:
+                    states.append('folder' if 'folder' in (sub.get('body') or {}) else 'file')
+                elif status == 404:
+                    states.append('missing')
+                else:
+                    states.append(None)
+        else:
+            for prefix in prefixes:
+                states.append(await self._folder_state(prefix))
+                if states[-1] != 'folder':
+                    break
+
+        existing = 0
+        for prefix, state in zip(prefixes, states):
+            if state == 'folder':
+                existing += 1
+                continue
+            if state == 'missing':
+                return existing
+            if state == 'file':
+                logger.error(f"Path '{prefix}' exists but is a file, cannot create app root.")
+            return None
+        return existing
+
     async def ensure_app_root_folder_exists(self) -> bool:
-        if not self._is_configured : 
-            logger.error(f"{self.PROVIDER_NAME}: Cannot ensure app root folder, service not configured.")
-            return False
         if not self.root_folder_path or self.root_folder_path == "/": # Root is "/"
             logger.info(f"{self.PROVIDER_NAME}: App root is drive root ('/'), assumed to exist.")
             return True
@@ -448,127 +1004,191 @@ class OneDriveService(BaseCloudService):
         logger.info(f"{self.PROVIDER_NAME}: Ensuring app root folder '{self.root_folder_path}' exists.")
         
         path_segments = [s for s in self.root_folder_path.strip("/").split("/") if s]
-        current_path_from_root = "" 
-        parent_graph_api_path_suffix = "" 
+        prefixes = ['/'.join(path_segments[:i + 1]) for i in range(len(path_segments))]
 
-        for segment_name in path_segments:
-            current_path_from_root = f"{current_path_from_root}/{segment_name}" if current_path_from_root else segment_name
-            segment_graph_suffix = f":/{quote(current_path_from_root)}:"
-            
-            url_get_meta = f"/me/drive/root{segment_graph_suffix}?$select=id,name,folder"
-            
-            item_exists_as_folder = False
+        # Common case: the app root already exists, one round-trip.
+        state = await self._folder_state(prefixes[-1])
+        if state == 'folder':
+            logger.info(f"App root folder '{self.root_folder_path}' ensured.")
+            return True
+        if state != 'missing':
+            if state == 'file':
+                logger.error(f"Path '{prefixes[-1]}' exists but is a file, cannot create app root.")
+            return False
+
+        # Find which ancestors exist (one $batch call), then create only the missing tail in order.
+        existing = await self._count_existing_prefixes(prefixes[:-1])
+        if existing is None:
+            return False
+        parent_graph_api_path_suffix = f":/{quote(prefixes[existing - 1])}:" if existing else ""
+        for segment_name, current_path_from_root in zip(path_segments[existing:], prefixes[existing:]):
+            logger.info(f"Segment '{segment_name}' at path '{current_path_from_root}' not found. Creating.")
+            create_in_url_suffix = f"/me/drive/root{parent_graph_api_path_suffix}/children"
+            request_body = {"name": segment_name, "folder": {}, "@microsoft.graph.conflictBehavior": "fail"}
             try:
-                response = await self._make_graph_api_call("GET", url_get_meta)
-                if response and response.status_code == 200:
-                    item_data = response.json()
-                    if 'folder' in item_data:
-                        item_exists_as_folder = True
-                        logger.debug(f"Segment '{segment_name}' at '{current_path_from_root}' exists.")
-                    else:
-                        logger.error(f"Path '{current_path_from_root}' exists but is a file, cannot create app root.")
-                        return False
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code != 404: # Not a "not found" error
-                    logger.error(f"Error checking segment '{current_path_from_root}': {e}") # Already logged by _make_graph_api_call
-                    return False 
+                response_create = await self._make_graph_api_call("POST", create_in_url_suffix, json=request_body)
+                if not (response_create and response_create.status_code == 201):
+                    # Error already logged by _make_graph_api_call
+                    return False
+                logger.info(f"Created segment '{segment_name}' at path '{current_path_from_root}'.")
             except ServiceError as e: # Catch ServiceErrors from _make_graph_api_call
-                logger.error(f"ServiceError checking segment '{current_path_from_root}': {e.message}")
+                logger.error(f"ServiceError creating segment '{segment_name}': {e.message}")
                 return False
-            except Exception as e: 
-                logger.error(f"Unexpected error checking segment '{current_path_from_root}': {e}") # Already logged by _make_graph_api_call
+            except Exception as e:
+                logger.error(f"Exception creating segment '{segment_name}': {e}") # Already logged
                 return False
-
-            if not item_exists_as_folder:
-                logger.info(f"Segment '{segment_name}' at path '{current_path_from_root}' not found. Creating.")
-                create_in_url_suffix = f"/me/drive/root{parent_graph_api_path_suffix}/children"
-                request_body = {"name": segment_name, "folder": {}, "@microsoft.graph.conflictBehavior": "fail"}
-                try:
-                    response_create = await self._make_graph_api_call("POST", create_in_url_suffix, json=request_body)
-                    if not (response_create and response_create.status_code == 201):
-                        # Error already logged by _make_graph_api_call
-                        return False
-                    logger.info(f"Created segment '{segment_name}' at path '{current_path_from_root}'.")
-                except ServiceError as e: # Catch ServiceErrors from _make_graph_api_call
-                    logger.error(f"ServiceError creating segment '{segment_name}': {e.message}")
-                    return False
-                except Exception as e:
-                    logger.error(f"Exception creating segment '{segment_name}': {e}") # Already logged
-                    return False
-            
-            parent_graph_api_path_suffix = segment_graph_suffix
+            parent_graph_api_path_suffix = f":/{quote(current_path_from_root)}:"
 
         logger.info(f"App root folder '{self.root_folder_path}' ensured.")
         return True
 
+    async def _stream_download(self, url_suffix: str, sink: Any) -> bool:
+        """
+        GETs url_suffix and feeds the body to sink(chunk) in 1 MiB pieces, so memory stays bounded
+        regardless of file size. sink may be a coroutine function (e.g. a disk write run via to_thread).
+        Returns False (after logging) if the request fails.
+        """
+        sink_is_async = asyncio.iscoroutinefunction(sink)
+        headers = await self._get_headers()
+        if not headers:
+            logger.error(f"{self.PROVIDER_NAME}: Cannot download, authentication failed or token unavailable.")
+            return False
+        client = await self._get_client()
+        async with client.stream("GET", url_suffix, headers=headers) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE_BYTES):
+                if sink_is_async:
+                    await sink(chunk)
+                else:
+                    sink(chunk)
+        return True
+
     async def download_file_content(self, cloud_file_path: str) -> Optional[bytes]:
         graph_path_suffix = self._get_graph_path_suffix(cloud_file_path)
         url_suffix = f"/me/drive/root{graph_path_suffix}/content"
+        buf = bytearray() # Grows amortized as chunks arrive, no extra full-size copy from response.content
         try:
-            response = await self._make_graph_api_call("GET", url_suffix)
-            if response and response.status_code == 200: return response.content
+            if await self._stream_download(url_suffix, buf.extend):
+                return bytes(buf)
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404: logger.debug(f"{self.PROVIDER_NAME}: File content not found (404) for '{cloud_file_path}'.")
-        except ServiceError as e:
-             logger.error(f"{self.PROVIDER_NAME}: ServiceError downloading file content for '{cloud_file_path}': {e.message}")
+            else: logger.error(f"{self.PROVIDER_NAME}: HTTP {e.response.status_code} downloading '{cloud_file_path}'.")
+        except httpx.RequestError as e:
+            logger.error(f"{self.PROVIDER_NAME}: Connection error downloading file content for '{cloud_file_path}': {e}")
         return None
 
     async def download_file(self, cloud_file_path: str, local_target_path: Path) -> bool:
-        content = await self.download_file_content(cloud_file_path)
-        if content is None: return False
+        graph_path_suffix = self._get_graph_path_suffix(cloud_file_path)
+        url_suffix = f"/me/drive/root{graph_path_suffix}/content"
+        # Stream into a sibling .part file and swap it in, so a failed download never clobbers an existing copy.
+        part_path = local_target_path.with_name(local_target_path.name + '.part')
         try:
-            local_target_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(local_target_path, 'wb') as f: f.write(content)
+            await asyncio.to_thread(local_target_path.parent.mkdir, parents=True, exist_ok=True)
+            with open(part_path, 'wb') as f:
+                async def write_chunk(chunk: bytes) -> None: # Disk writes off the event loop
+                    await asyncio.to_thread(f.write, chunk)
+                ok = await self._stream_download(url_suffix, write_chunk)
+            if not ok:
+                part_path.unlink(missing_ok=True)
+                return False
+            await asyncio.to_thread(os.replace, part_path, local_target_path)
             logger.info(f"Downloaded '{cloud_file_path}' to '{local_target_path}'")
             return True
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404: logger.debug(f"{self.PROVIDER_NAME}: File content not found (404) for '{cloud_file_path}'.")
+            else: logger.error(f"{self.PROVIDER_NAME}: HTTP {e.response.status_code} downloading '{cloud_file_path}'.")
+        except httpx.RequestError as e:
+            logger.error(f"{self.PROVIDER_NAME}: Connection error downloading '{cloud_file_path}': {e}")
         except IOError as e:
             logger.error(f"Failed to write to {local_target_path}: {e}")
-            return False
+        part_path.unlink(missing_ok=True)
+        return False
+
+    async def _upload_via_session(self, reader: BinaryIO, total: int, graph_path_suffix: str,
+                                  cloud_file_name: str, target_file_rel_path: str) -> Optional[CloudFileMetadata]:
+        """
+        Graph resumable upload: creates an upload session, then PUTs UPLOAD_CHUNK_SIZE_BYTES ranges read lazily
+        from reader, so memory stays at one chunk. A chunk failing with 5xx/connection error is retried after asking
+        the session which ranges it still expects.
+        """
+        self._invalidate_cached_path(target_file_rel_path)
+        session_url_suffix = f"/me/drive/root{graph_path_suffix}/createUploadSession"
+        session_body = {"item": {"@microsoft.graph.conflictBehavior": "replace", "name": cloud_file_name}} 
+        try:
+            session_response = await self._make_graph_api_call("POST", session_url_suffix, json=session_body)
+            if not (session_response and session_response.status_code == 200):
+                logger.error(f"Failed to create upload session for '{target_file_rel_path}'.")
+                return None
+            upload_url = _json(session_response).get("uploadUrl")
+            if not upload_url:
+                logger.error(f"No uploadUrl in session response for '{target_file_rel_path}'.")
+                return None
+
+            # uploadUrl is absolute (overrides base_url) and pre-authenticated; no read/write timeout for large chunks.
+            client = await self._get_client()
+            chunk_timeout = httpx.Timeout(None, connect=30.0)
+            start = 0
+            retries_left = UPLOAD_CHUNK_MAX_RETRIES
+            while start < total:
+                reader.seek(start)
+                chunk = await asyncio.to_thread(reader.read, min(UPLOAD_CHUNK_SIZE_BYTES, total - start))
+                end = start + len(chunk) - 1
+                headers_upload = {"Content-Length": str(len(chunk)), "Content-Range": f"bytes {start}-{end}/{total}"}
+                try:
+                    response_upload = await client.put(upload_url, content=chunk, headers=headers_upload, timeout=chunk_timeout)
+                except httpx.RequestError as e:
+                    response_upload = None
+                    logger.warning(f"Upload chunk {start}-{end} of '{target_file_rel_path}' failed: {e}")
+
+                if response_upload is not None and response_upload.status_code in (200, 201):
+                    logger.info(f"Resumable upload successful for '{target_file_rel_path}'.")
+                    return self._graph_item_to_cloudfile(_json(response_upload), target_file_rel_path)
+                if response_upload is not None and response_upload.status_code == 202: # Chunk accepted, more expected
+                    start = self._next_expected_offset(_json(response_upload), end + 1)
+                    retries_left = UPLOAD_CHUNK_MAX_RETRIES
+                    continue
+                if (response_upload is not None and response_upload.status_code < 500) or retries_left <= 0:
+                    logger.error(f"Resumable upload failed for '{target_file_rel_path}'. Status: {response_upload.status_code if response_upload is not None else 'No response'}")
+                    return None
+                # Transient failure: resume from whatever the session says it still needs.
+                retries_left -= 1
+                status_response = await client.get(upload_url)
+                if status_response.status_code == 200:
+                    start = self._next_expected_offset(_json(status_response), start)
+            logger.error(f"Resumable upload for '{target_file_rel_path}' ended without a completed item.")
+        except ServiceError as e:
+            logger.error(f"ServiceError during resumable upload for '{target_file_rel_path}': {e.message}", exc_info=True)
+        except Exception as e:
+            logger.error(f"Exception during resumable upload for '{target_file_rel_path}': {e}", exc_info=True)
+        return None
+
+    @staticmethod
+    def _next_expected_offset(session_status: Dict[str, Any], fallback: int) -> int:
+        """First byte offset from an upload session's nextExpectedRanges (e.g. ["26-", "40-50"])."""
+        ranges = session_status.get("nextExpectedRanges") or []
+        try:
+            return int(ranges[0].split('-', 1)[0])
+        except (IndexError, ValueError):
+            return fallback
 
     async def upload_file_content(self, content_bytes: bytes, cloud_target_folder: str, cloud_file_name: str) -> Optional[CloudFileMetadata]:
-        target_file_rel_path = str(Path(cloud_target_folder) / cloud_file_name)
+        target_file_rel_path = _join_rel(cloud_target_folder, cloud_file_name)
         graph_path_suffix = self._get_graph_path_suffix(target_file_rel_path)
         
-        headers_override = {"Content-Type": "application/octet-stream"}
         if len(content_bytes) > SIMPLE_UPLOAD_MAX_SIZE_BYTES: 
-            session_url_suffix = f"/me/drive/root{graph_path_suffix}/createUploadSession"
-            conflict_behavior = "replace" 
-            session_body = {"item": {"@microsoft.graph.conflictBehavior": conflict_behavior, "name": cloud_file_name}} 
-            try:
-                session_response = await self._make_graph_api_call("POST", session_url_suffix, json=session_body)
-                if not (session_response and session_response.status_code == 200):
-                    logger.error(f"Failed to create upload session for '{target_file_rel_path}'.")
-                    return None
-                upload_session_data = session_response.json()
-                upload_url = upload_session_data.get("uploadUrl")
-                if not upload_url:
-                    logger.error(f"No uploadUrl in session response for '{target_file_rel_path}'.")
-                    return None
-                
-                headers_upload = {"Content-Length": str(len(content_bytes)), "Content-Range": f"bytes 0-{len(content_bytes)-1}/{len(content_bytes)}"}
-                async with httpx.AsyncClient(timeout=None) as client: 
-                    response_upload = await client.put(upload_url, content=content_bytes, headers=headers_upload)
-                
-                if response_upload and (response_upload.status_code == 201 or response_upload.status_code == 200):
-                    logger.info(f"Resumable upload successful for '{target_file_rel_path}'.")
-                    return self._graph_item_to_cloudfile(response_upload.json(), target_file_rel_path)
-                else:
-                    logger.error(f"Resumable upload failed for '{target_file_rel_path}'. Status: {response_upload.status_code if response_upload else 'No response'}")
-                    return None
-            except ServiceError as e:
-                logger.error(f"ServiceError during resumable upload for '{target_file_rel_path}': {e.message}", exc_info=True)
-            except Exception as e:
-                logger.error(f"Exception during resumable upload for '{target_file_rel_path}': {e}", exc_info=True)
-            return None
-        else: # Simple PUT
-            url_suffix = f"/me/drive/root{graph_path_suffix}/content?@microsoft.graph.conflictBehavior=replace"
-            try:
-                response = await self._make_graph_api_call("PUT", url_suffix, content=content_bytes, headers_extra=headers_override)
-                if response and (response.status_code == 201 or response.status_code == 200):
-                    return self._graph_item_to_cloudfile(response.json(), target_file_rel_path)
-            except ServiceError as e:
-                logger.error(f"{self.PROVIDER_NAME}: ServiceError uploading content as '{cloud_file_name}': {e.message}")
-            except Exception: pass 
+            return await self._upload_via_session(io.BytesIO(content_bytes), len(content_bytes), graph_path_suffix,
+                                                  cloud_file_name, target_file_rel_path)
+        # Simple PUT
+        self._invalidate_cached_path(target_file_rel_path)
+        headers_override = {"Content-Type": "application/octet-stream"}
+        url_suffix = f"/me/drive/root{graph_path_suffix}/content?@microsoft.graph.conflictBehavior=replace"
+        try:
+            response = await self._make_graph_api_call("PUT", url_suffix, content=content_bytes, headers_extra=headers_override)
+            if response and (response.status_code == 201 or response.status_code == 200):
+                return self._graph_item_to_cloudfile(_json(response), target_file_rel_path)
+        except ServiceError as e:
+            logger.error(f"{self.PROVIDER_NAME}: ServiceError uploading content as '{cloud_file_name}': {e.message}")
+        except Exception: pass 
         return None
         
     async def upload_file(self, local_file_path: Path, cloud_target_folder: str, cloud_file_name: Optional[str] = None) -> Optional[CloudFileMetadata]:
@@ -577,7 +1197,13 @@ class OneDriveService(BaseCloudService):
             return None
         file_name_to_use = cloud_file_name or local_file_path.name
         try:
-            with open(local_file_path, 'rb') as f: content_bytes = f.read()
+            total = local_file_path.stat().st_size
+            if total > SIMPLE_UPLOAD_MAX_SIZE_BYTES: # Large file: stream chunks from disk instead of reading it whole
+                target_file_rel_path = _join_rel(cloud_target_folder, file_name_to_use)
+                with open(local_file_path, 'rb') as f:
+                    return await self._upload_via_session(f, total, self._get_graph_path_suffix(target_file_rel_path),
+                                                          file_name_to_use, target_file_rel_path)
+            content_bytes = await asyncio.to_thread(local_file_path.read_bytes) # Disk read off the event loop
             return await self.upload_file_content(content_bytes, cloud_target_folder, file_name_to_use)
         except IOError as e:
             logger.error(f"Error reading local file {local_file_path}: {e}")
@@ -592,6 +1218,7 @@ class OneDriveService(BaseCloudService):
                  return False
             
         url_suffix = f"/me/drive/root{graph_path_suffix}"
+        self._invalidate_cached_path(cloud_file_path)
         try:
             response = await self._make_graph_api_call("DELETE", url_suffix)
             if response and (response.status_code == 204 or response.status_code == 404):
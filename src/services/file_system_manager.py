@@ -1,9 +1,9 @@
 import os
-import shutil # shutil might be needed for more complex operations like rmtree, but not for this spec
+import shutil # copy_thumbnail
 from pathlib import Path
 import logging
 import yaml # For device settings
-from typing import Optional, List, Union, Dict, Any, TYPE_CHECKING
+from typing import Optional, List, Union, Dict, Any, AsyncIterator, Iterator, Tuple, TYPE_CHECKING
 
 from src.models.article import Article
 from src.services.markdown_handler import MarkdownHandler
@@ -184,6 +184,15 @@ class FileSystemManager:
         # If recursive search is needed later: sync_root.rglob("*.md")
         return list(sync_root.glob("*.md"))
 
+    def iter_articles(self) -> Iterator[Article]:
+        """Yields articles from the local sync root one at a time (unparseable files are skipped and logged)."""
+        for filepath in self.get_all_article_filepaths():
+            article = self.load_article(filepath)
+            if article:
+                yield article
+            else:
+                logger.warning(f"🟡 Could not load article from path: {filepath}")
+
     # --- Thumbnail Management (PRD 5.3) ---
     def get_thumbnail_path(self, article: Article, create_subdirs: bool = True) -> Optional[Path]:
         """
@@ -219,8 +228,8 @@ class FileSystemManager:
                 return None
         return thumb_path
 
-    def save_thumbnail(self, article: Article, image_bytes: bytes) -> Optional[str]:
-        """Saves thumbnail image_bytes and updates article.thumbnail_url_local with relative path."""
+    def _thumbnail_target(self, article: Article) -> Optional[Tuple[Path, Path]]:
+        """(absolute thumbnail path, sync root) for saving article's thumbnail, or None (logged) if unknown."""
         thumb_abs_path = self.get_thumbnail_path(article, create_subdirs=True) # Ensure parent dir exists
         if not thumb_abs_path:
             logger.error(f"🛑 Could not get thumbnail path for article '{article.title}'. Thumbnail not saved.")
@@ -230,18 +239,72 @@ class FileSystemManager:
         if not sync_root:
             logger.error("🛑 Cannot save thumbnail, sync root not set. Thumbnail path would be ambiguous.")
             return None
+        return thumb_abs_path, sync_root
+
+    async def save_thumbnail_stream(self, article: Article, chunks: AsyncIterator[bytes]) -> Optional[str]:
+        """
+        Saves a thumbnail image arriving in chunks (e.g. HttpClient.stream_url) and updates
+        article.thumbnail_url_local with its path relative to the sync root. Each chunk is written as it
+        comes, so the whole image is never held in memory. Written to a .part file and renamed into place when
+        complete, so a failed download leaves no truncated thumbnail. None if nothing was received or saving failed.
+        """
+        target = self._thumbnail_target(article)
+        if not target:
+            return None
+        thumb_abs_path, sync_root = target
 
+        part_path = thumb_abs_path.with_name(thumb_abs_path.name + ".part")
         try:
-            with open(thumb_abs_path, 'wb') as f:
-                f.write(image_bytes)
-            
-            # Store path relative to the sync root for portability in YAML.
+            received = 0
+            with open(part_path, 'wb') as f:
+                async for chunk in chunks:
+                    f.write(chunk)
+                    received += len(chunk)
+            if not received:
+                logger.warning(f"🟡 Empty thumbnail image for '{article.title}'. Thumbnail not saved.")
+                part_path.unlink(missing_ok=True)
+                return None
+            os.replace(part_path, thumb_abs_path)
+
             relative_thumb_path_str = str(thumb_abs_path.relative_to(sync_root))
             article.thumbnail_url_local = relative_thumb_path_str
-            logger.info(f"🟢 Thumbnail saved for '{article.title}' at {thumb_abs_path} (relative: {relative_thumb_path_str})")
+            logger.info(f"🟢 Thumbnail saved for '{article.title}' at {thumb_abs_path} (relative: {relative_thumb_path_str}, {received} bytes)")
             return relative_thumb_path_str
         except Exception as e:
             logger.error(f"🛑 Error saving thumbnail for '{article.title}' to {thumb_abs_path}: {e}")
+            try: part_path.unlink(missing_ok=True)
+            except OSError: pass
+            return None
+        finally:
+            aclose = getattr(chunks, 'aclose', None) # Async generators: release the HTTP response now, not at GC
+            if aclose is not None:
+                await aclose()
+
+    def copy_thumbnail(self, article: Article, source_relative_path: str) -> Optional[str]:
+        """
+        Gives article its own copy of an already saved thumbnail (path relative to sync_root, as returned by
+        save_thumbnail_stream), e.g. when two articles share an image URL. Updates article.thumbnail_url_local like
+        save_thumbnail_stream; returns the relative path, or None if the source is gone or the copy failed.
+        """
+        sync_root = self.get_local_sync_root()
+        if not sync_root:
+            logger.error("🛑 Cannot copy thumbnail, sync root not set. Thumbnail path would be ambiguous.")
+            return None
+        thumb_abs_path = self.get_thumbnail_path(article, create_subdirs=True)
+        if not thumb_abs_path:
+            logger.error(f"🛑 Could not get thumbnail path for article '{article.title}'. Thumbnail not copied.")
+            return None
+
+        source_abs_path = sync_root / source_relative_path
+        try:
+            if source_abs_path != thumb_abs_path:
+                shutil.copyfile(source_abs_path, thumb_abs_path)
+            relative_thumb_path_str = str(thumb_abs_path.relative_to(sync_root))
+            article.thumbnail_url_local = relative_thumb_path_str
+            logger.info(f"🟢 Thumbnail for '{article.title}' copied from {source_abs_path} to {thumb_abs_path}")
+            return relative_thumb_path_str
+        except Exception as e:
+            logger.warning(f"🟡 Could not copy thumbnail {source_abs_path} for '{article.title}': {e}")
             return None
 
     def get_thumbnail_bytes(self, article: Article) -> Optional[bytes]:
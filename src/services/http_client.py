@@ -1,7 +1,7 @@
 import httpx
 import asyncio
 import logging
-from typing import Optional, Dict, Any, TYPE_CHECKING
+from typing import AsyncIterator, Optional, Dict, Any, TYPE_CHECKING
 
 from src.utils import common # For exponential_backoff_retry, get_retry_config
 from src.utils import constants # For DEFAULT_USER_AGENT
@@ -11,6 +11,9 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Read size for stream_url: bounds memory per download regardless of the response size
+STREAM_CHUNK_SIZE = 64 * 1024
+
 class HttpClient:
     def __init__(self, config_manager: 'ConfigManager'):
         self.config_manager = config_manager
@@ -109,6 +112,42 @@ class HttpClient:
         # The exceptions raised by _fetch_with_retry (after retries are exhausted) will propagate from here.
         return await _fetch_with_retry()
 
+    async def stream_url(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """
+        Yields the body of a GET response in chunks instead of loading it all into memory (e.g. images).
+        Opening the response (connect + status check) is retried like get_url; once bytes are flowing,
+        errors propagate to the consumer. The response is closed when iteration ends or is abandoned.
+        """
+        @common.exponential_backoff_retry(
+            max_attempts=self.retry_config['max_attempts'],
+            initial_delay=self.retry_config['initial_delay'],
+            max_delay=self.retry_config['max_delay'],
+            jitter=self.retry_config.get('jitter', True)
+        )
+        async def _open_with_retry() -> httpx.Response:
+            logger.debug(f"Streaming URL: {url}")
+            request = self.client.build_request("GET", url, headers=headers) # Merged with the client's headers
+            response = await self.client.send(request, stream=True)
+            try:
+                response.raise_for_status()
+            except httpx.HTTPStatusError:
+                await response.aclose()
+                logger.error(f"🛑 HTTP error {response.status_code} for {url}")
+                raise
+            return response
+
+        response = await _open_with_retry()
+        try:
+            async for chunk in response.aiter_bytes(chunk_size):
+                yield chunk
+        finally:
+            await response.aclose()
+
     async def close(self) -> None:
         """Closes the underlying httpx.AsyncClient."""
         logger.debug("Closing HttpClient session.")
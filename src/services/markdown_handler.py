@@ -11,6 +11,14 @@ from src.utils import constants
 
 logger = logging.getLogger(__name__)
 
+# One scanner for split_article(): a highlight (group 1 = its text) or the notes heading line.
+# Highlights can't span lines, so a highlight match never swallows the notes marker.
+_NOTES_MARKER = f"\n{constants.MARKDOWN_NOTES_HEADING}\n"
+_ARTICLE_SCAN_RE = re.compile(
+    f"{re.escape(constants.MARKDOWN_HIGHLIGHT_START_TAG)}(.*?){re.escape(constants.MARKDOWN_HIGHLIGHT_END_TAG)}"
+    f"|{re.escape(_NOTES_MARKER)}"
+)
+
 class MarkdownHandler:
     @staticmethod
     def parse_markdown_file(file_path: Path) -> Optional[Article]:
@@ -142,6 +150,23 @@ class MarkdownHandler:
             logger.error(f"🛑 Error extracting highlights: {e}")
             return []
 
+    @staticmethod
+    def split_article(markdown_content: str) -> Tuple[str, str, List[str]]:
+        """
+        Splits markdown into (body without notes, notes, highlights) in a single regex scan.
+        Same results as Article.get_content_without_notes(), Article.get_notes() and extract_highlights().
+        """
+        highlights: List[str] = []
+        notes_start = notes_end = -1
+        for match in _ARTICLE_SCAN_RE.finditer(markdown_content):
+            if match.group(1) is not None: # Highlight (possibly empty); None means the notes alternative matched
+                highlights.append(match.group(1))
+            elif notes_start < 0: # First notes heading splits body from notes
+                notes_start, notes_end = match.span()
+        if notes_start < 0:
+            return markdown_content.strip(), "", highlights
+        return markdown_content[:notes_start].strip(), markdown_content[notes_end:].strip(), highlights
+
 # Example Usage (for testing or illustration, not run when imported)
 if __name__ == '__main__':
     # Setup basic logging for the example
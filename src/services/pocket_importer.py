@@ -1,4 +1,7 @@
+import json
 import logging
+import os
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import List, Optional, Dict, TYPE_CHECKING, Any, Callable, Set, AsyncGenerator # Added AsyncGenerator
@@ -25,7 +28,8 @@ class PocketImporterService:
                  config_manager: 'ConfigManager',
                  content_parser: ContentParserService,
                  # fs_manager: FileSystemManager, # Removed as per workplan section 2.1
-                 search_manager: SearchManager): # SearchManager is kept for deduplication
+                 search_manager: SearchManager, # SearchManager is kept for deduplication
+                 results_cache_path: Optional[Path] = None):
         self.config_manager = config_manager
         self.content_parser = content_parser
         # self.fs_manager = fs_manager # Removed
@@ -40,6 +44,56 @@ class PocketImporterService:
         if not self.reparse_pocket_html_setting:
             logger.info("Pocket importer configured to NOT re-parse HTML (setting has limited effect as content is fetched from URL).")
 
+        # Export URL -> {"saved_path", "thumb", "ts"} for every article imported so far, persisted across runs so a
+        # re-run of the same export (e.g. after a failure) skips those URLs without a fetch or an index query.
+        # Entries are added by record_imported() and written by save_results_cache().
+        self.results_cache_path = results_cache_path
+        self._results_cache: Dict[str, Dict[str, Any]] = self._load_results_cache()
+
+    def _load_results_cache(self) -> Dict[str, Dict[str, Any]]:
+        if self.results_cache_path is None or not self.results_cache_path.exists():
+            return {}
+        try:
+            cache = json.loads(self.results_cache_path.read_text(encoding='utf-8'))
+            if isinstance(cache, dict):
+                return cache
+            logger.warning(f"🟡 Ignoring malformed Pocket import cache at {self.results_cache_path}; expected an object.")
+        except Exception as e:
+            logger.warning(f"🟡 Could not read Pocket import cache at {self.results_cache_path}: {e}")
+        return {}
+
+    def _is_cached_import(self, url: str) -> bool:
+        """True if an earlier run imported url and its file is still in the library; stale entries are dropped."""
+        entry = self._results_cache.get(url)
+        if entry is None:
+            return False
+        if Path(entry.get("saved_path") or "").is_file():
+            return True
+        del self._results_cache[url] # Deleted from the library since (or malformed): import it again
+        return False
+
+    def record_imported(self, article: Article, saved_path: Path) -> None:
+        """Notes that article (yielded by import_from_pocket_file) was saved and indexed, so later imports skip its URL."""
+        self._results_cache[article.original_url] = {
+            "saved_path": str(saved_path),
+            "thumb": article.thumbnail_url_local,
+            "ts": time.time(),
+        }
+
+    def save_results_cache(self) -> None:
+        """Writes the import cache atomically (temp file, fsync, rename), so a crash never leaves it half-written."""
+        if self.results_cache_path is None:
+            return
+        tmp_path = self.results_cache_path.with_name(self.results_cache_path.name + ".tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._results_cache, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.results_cache_path)
+        except Exception as e:
+            logger.error(f"🛑 Could not save Pocket import cache to {self.results_cache_path}: {e}")
+
 
     def _parse_pocket_export_html(self, html_content: str) -> List[Dict[str, Any]]:
         """Parses Pocket's ril_export.html file to extract article metadata."""
@@ -134,6 +188,11 @@ class PocketImporterService:
 
             logger.info(f"Processing Pocket item ({i+1}/{total_items}): {url}")
 
+            if self._is_cached_import(url): # Imported by an earlier run (see record_imported)
+                logger.info(f"Skipping already imported URL (Pocket import cache): {url}")
+                if progress_callback: progress_callback(i + 1, total_items)
+                continue
+
             # Deduplication check (remains here as it's part of import logic)
             # Whoosh ID field type requires exact match. Query needs to be exact.
             # Example: original_url:"http://example.com"
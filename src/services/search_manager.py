@@ -1,13 +1,25 @@
 import whoosh.index as index
 from whoosh.fields import Schema, TEXT, ID, KEYWORD, DATETIME, BOOLEAN, NUMERIC
-from whoosh.qparser import MultifieldParser, QueryParser, FuzzyTermPlugin, WildcardPlugin
-from whoosh.qparser.plugins import GtLtPlugin # Import the plugin
-from whoosh.analysis import StemmingAnalyzer
-from whoosh.writing import AsyncWriter, WhooshError # For concurrent writes
+from whoosh.qparser import MultifieldParser, QueryParser, FuzzyTermPlugin, WildcardPlugin, syntax
+from whoosh.qparser.plugins import GtLtPlugin, Plugin # Import the plugin
+from whoosh.util.times import is_ambiguous
+from whoosh.analysis import StemmingAnalyzer, CommaSeparatedTokenizer, Filter, LowercaseFilter
+from whoosh.searching import Searcher
+from whoosh.writing import IndexWriter
+from whoosh.index import LockError, IndexError as WhooshIndexError
+import contextlib
+import hashlib
+import itertools
 import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Dict, Any, TYPE_CHECKING
-from datetime import datetime # For type hinting, not direct use in this file beyond what Whoosh needs
+from typing import Callable, List, Optional, Dict, Any, Iterable, Iterator, Tuple, TYPE_CHECKING
+import calendar
+from datetime import datetime, timezone
 
 # Assuming common.py is in purse.utils for parse_iso_timestamp
 from src.utils import common, constants
@@ -19,29 +31,274 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# find_similar_articles: key terms taken from the source article to build the more_like query. Whoosh's
+# default of 5 leaves a long article's similarity to a handful of words; 25 (the usual Lucene MLT setting)
+# matches on its topic while the OR query stays bounded by this rather than by the article's length.
+SIMILAR_ARTICLES_NUM_TERMS = 25
+
+# rebuild_index: Whoosh batch-writer knobs. Each sub-writer builds its own segment in parallel; one CPU is left
+# for the main process feeding them, and limitmb is per sub-writer so it shrinks as procs grows.
+REBUILD_WRITER_PROCS = max(2, (os.cpu_count() or 1) - 1)
+REBUILD_WRITER_LIMIT_MB = 256
+# Below this many articles, preparing docs in a process pool costs more (startup + pickling) than it saves
+REBUILD_PARALLEL_PREP_MIN_ARTICLES = 500
+REBUILD_PREP_CHUNKSIZE = 32
+# Articles handed to the worker pool per submission; bounds how much of a streamed rebuild is held in memory
+REBUILD_PREP_WINDOW = REBUILD_PREP_CHUNKSIZE * REBUILD_WRITER_PROCS * 4
+
+# Incremental updates are applied by one writer thread; commits are coalesced until this many ops are
+# pending or this long after the first uncommitted op (new/changed articles become searchable within that lag).
+COMMIT_DELAY_SECONDS = 0.25
+COMMIT_MAX_PENDING_OPS = 100
+# Writer thread: retries while another writer (e.g. a rebuild) holds the index lock, with exponential backoff
+WRITER_LOCK_RETRIES = 6
+WRITER_LOCK_BACKOFF_SECONDS = 0.1
+WRITER_LOCK_BACKOFF_MAX_SECONDS = 2.0
+# How long flush()/close_index() wait for the writer thread
+WRITER_FLUSH_TIMEOUT_SECONDS = 30.0
+
+
+def _get_epoch_from_iso(iso_timestamp_str: Optional[str]) -> Optional[int]:
+    """Safely converts an ISO timestamp string to Unix epoch seconds (naive timestamps are taken as UTC)."""
+    if not iso_timestamp_str:
+        return None
+    try:
+        dt = common.parse_iso_timestamp(iso_timestamp_str)
+    except ValueError:
+        logger.warning(f"🟡 Could not parse ISO timestamp string: '{iso_timestamp_str}' for Whoosh indexing.")
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def _epoch(dt: datetime) -> int:
+    return calendar.timegm(dt.utctimetuple())
+
+
+class QueryLowercaseFilter(Filter):
+    """
+    Lowercases query tokens only. Index-time values (Article.tags_csv / author_csv) are lowercased once in
+    Python already, so indexing passes tokens straight through instead of re-lowercasing each one.
+    """
+    _lowercase = LowercaseFilter()
+
+    def __call__(self, tokens):
+        first = next(tokens, None)
+        if first is None:
+            return iter(())
+        tokens = itertools.chain((first,), tokens)
+        return tokens if first.mode == "index" else self._lowercase(tokens) # Mode is the same for the whole stream
+
+
+# KEYWORD(commas=True, lowercase=True) minus the index-time lowercasing, for already-normalized fields
+NORMALIZED_KEYWORD_ANALYZER = CommaSeparatedTokenizer() | QueryLowercaseFilter()
+
+
+def _normalized_keyword(**kwargs) -> KEYWORD:
+    """Comma-separated KEYWORD field using NORMALIZED_KEYWORD_ANALYZER (assigned after construction, since
+    not every Whoosh 2.7 release accepts an analyzer argument for KEYWORD)."""
+    field = KEYWORD(commas=True, **kwargs)
+    field.analyzer = NORMALIZED_KEYWORD_ANALYZER
+    return field
+
+
+class EpochDatePlugin(Plugin):
+    """
+    Keeps date query syntax (saved_date:2023-05, saved_date:>2023-01-01, saved_date:[2023 to 2024]) working for
+    date fields indexed as NUMERIC epoch seconds: rewrites those fields' terms/range ends into epoch numbers
+    before the NUMERIC field parses them. A partial date becomes the range it covers, like DATETIME does.
+    """
+    # Only used for its YYYY[MM[DD[hh[mm[ss]]]]] parser, which also accepts '-', '.' and ' ' separators
+    _DATE_FIELD = DATETIME()
+
+    def __init__(self, fieldnames: Iterable[str]):
+        self.fieldnames = frozenset(fieldnames)
+
+    def filters(self, parser):
+        return [(self.do_dates, 101)] # After FieldsPlugin (100) has attached fieldnames, incl. GtLt's ranges (99)
+
+    def _parse(self, text: Optional[str]):
+        if not text or text.isdigit() and len(text) > 8: # Already epoch seconds
+            return None
+        try:
+            return self._DATE_FIELD._parse_datestring(text)
+        except Exception:
+            return None # Left as is; the NUMERIC field reports it as an unparseable number
+
+    def do_dates(self, parser, group):
+        for i, node in enumerate(group):
+            if isinstance(node, syntax.GroupNode):
+                self.do_dates(parser, node)
+            elif getattr(node, "fieldname", None) not in self.fieldnames:
+                continue
+            elif isinstance(node, syntax.RangeNode):
+                start, end = self._parse(node.start), self._parse(node.end)
+                if start is not None: # Exclusive start: after the whole period, inclusive: from its beginning
+                    node.start = str(_epoch(start.ceil() if node.startexcl else start.floor()))
+                if end is not None:
+                    node.end = str(_epoch(end.floor() if node.endexcl else end.ceil()))
+            elif isinstance(node, syntax.WordNode):
+                at = self._parse(node.text)
+                if at is None:
+                    continue
+                if is_ambiguous(at):
+                    rnode = syntax.RangeNode(str(_epoch(at.floor())), str(_epoch(at.ceil())), False, False)
+                    rnode.set_fieldname(node.fieldname)
+                    rnode.boost = node.boost
+                    group[i] = rnode.set_range(node.startchar, node.endchar)
+                else:
+                    node.text = str(_epoch(at))
+        return group
+
+def _extract_and_split(md_content: str) -> Tuple[str, str, str]:
+    """
+    (content without notes, notes, highlights joined with spaces) for an article's markdown, from one
+    scan (MarkdownHandler.split_article). Not memoized: the content-digest check (_doc_if_changed) already
+    skips unchanged articles, and a cache keyed by the markdown would keep every body alive.
+    """
+    main_content_text, notes_text, highlights = MarkdownHandler.split_article(md_content)
+    # split_article returns the text *between* the highlight tags, so it needs no further cleaning.
+    return main_content_text, notes_text, " ".join(highlights).strip()
+
+def _article_index_digest(article: Article) -> str:
+    """Hash of every Article value that ends up in the index doc; equal digests mean reindexing is a no-op."""
+    parts = (article.title, article.markdown_content, article.tags_csv, article.author_csv, article.original_url,
+             article.publication_name or "", article.publication_date or "", article.saved_date or "",
+             article.status, "1" if article.favorite else "0")
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+def _prepare_article_doc(article: Article, digest: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Prepares a dictionary of fields for Whoosh from an Article object.
+    Module-level (not a method) so rebuild_index can run it in worker processes.
+    """
+    main_content_text, notes_text, cleaned_highlights_text_for_field = _extract_and_split(article.markdown_content)
+    
+    # Full searchable content for the 'content' field
+    # Combines main body, notes, and the (already cleaned) text of highlights; parts are pre-stripped.
+    full_searchable_content = "\n\n".join(part for part in (main_content_text, notes_text, cleaned_highlights_text_for_field) if part)
+
+    doc: Dict[str, Any] = {
+        "id": article.id,
+        "original_url": article.original_url,
+        "title": article.title,
+        "content": full_searchable_content,
+        "tags": article.tags_csv,
+        "author": article.author_csv, # Assuming author list is stored as strings
+        "status": article.status,
+        "favorite": article.favorite,
+        "notes": notes_text,
+        "highlights": cleaned_highlights_text_for_field,
+        "content_hash": digest or _article_index_digest(article),
+    }
+    # The only optional values: set them only when present, since Whoosh can't index None
+    # (NUMERIC dates in particular).
+    if article.publication_name is not None:
+        doc["publication_name"] = article.publication_name
+    publication_date = _get_epoch_from_iso(article.publication_date)
+    if publication_date is not None:
+        doc["publication_date"] = publication_date
+    saved_date = _get_epoch_from_iso(article.saved_date) # Should always exist
+    if saved_date is not None:
+        doc["saved_date"] = saved_date
+    return doc
+
+def _prepare_article_docs(articles: Iterable[Article]) -> Iterator[Dict[str, Any]]:
+    """
+    Yields Whoosh docs for articles in order, consuming `articles` lazily so a generator (e.g.
+    FileSystemManager.iter_articles) is never fully materialized. Large inputs are prepared in worker
+    processes, at most two windows of REBUILD_PREP_WINDOW articles in flight at a time.
+    """
+    it = iter(articles)
+    head = list(itertools.islice(it, REBUILD_PARALLEL_PREP_MIN_ARTICLES))
+    if len(head) < REBUILD_PARALLEL_PREP_MIN_ARTICLES or REBUILD_WRITER_PROCS < 2:
+        yield from map(_prepare_article_doc, itertools.chain(head, it))
+        return
+    with ProcessPoolExecutor(max_workers=REBUILD_WRITER_PROCS) as pool:
+        pending = pool.map(_prepare_article_doc, head, chunksize=REBUILD_PREP_CHUNKSIZE)
+        del head
+        while True:
+            # Submit the next window before draining this one, so workers stay busy while the writer consumes
+            window = list(itertools.islice(it, REBUILD_PREP_WINDOW))
+            following = pool.map(_prepare_article_doc, window, chunksize=REBUILD_PREP_CHUNKSIZE) if window else None
+            del window
+            yield from pending
+            if following is None:
+                return
+            pending = following
+
+
 class SearchManager:
     SCHEMA = Schema(
         id=ID(stored=True, unique=True),
         original_url=ID(stored=True),
         title=TEXT(stored=True, field_boost=2.0, analyzer=StemmingAnalyzer()),
-        content=TEXT(stored=True, analyzer=StemmingAnalyzer()), # Combined: main_body + notes + highlights_text
-        tags=KEYWORD(stored=True, commas=True, scorable=True, lowercase=True),
-        author=KEYWORD(stored=True, commas=True, lowercase=True), # Storing as comma-separated string
+        # Large text fields are indexed but not stored: the text already lives in the article's markdown file
+        # (reload it via fs_manager for snippets). content keeps a term vector so find_similar_articles works.
+        content=TEXT(stored=False, vector=True, analyzer=StemmingAnalyzer()), # Combined: main_body + notes + highlights_text
+        # Indexed only: tags are searchable, but results carry none (load the Article via fs_manager for them).
+        # tags/author arrive lowercased (Article.tags_csv/author_csv); the analyzer only lowercases queries.
+        tags=_normalized_keyword(stored=False, scorable=True),
+        author=_normalized_keyword(stored=True), # Storing as comma-separated string
         publication_name=TEXT(stored=True, analyzer=StemmingAnalyzer()),
-        publication_date=DATETIME(stored=True, sortable=True),
-        saved_date=DATETIME(stored=True, sortable=True),
+        # Unix epoch seconds: stored/sorted as plain ints (DATETIME stores pickled datetimes); EpochDatePlugin
+        # keeps YYYY-MM-DD query syntax working.
+        publication_date=NUMERIC(numtype=int, bits=64, stored=True, sortable=True),
+        saved_date=NUMERIC(numtype=int, bits=64, stored=True, sortable=True),
         status=ID(stored=True),
         favorite=BOOLEAN(stored=True),
-        notes=TEXT(stored=True, analyzer=StemmingAnalyzer()), # Separate field for notes text
-        highlights=TEXT(stored=True, analyzer=StemmingAnalyzer()) # Separate field for cleaned highlights text
+        notes=TEXT(stored=False, analyzer=StemmingAnalyzer()), # Separate field for notes text
+        highlights=TEXT(stored=False, analyzer=StemmingAnalyzer()), # Separate field for cleaned highlights text
+        content_hash=ID(stored=True), # _article_index_digest at index time; lets unchanged articles skip reindexing
         # word_count=NUMERIC(stored=True, sortable=True), # Example if added later
         # language=ID(stored=True), # Example if added later
     )
 
+    # Stored fields returned per search/similarity hit by default: the list/card metadata, not the large
+    # content/notes/highlights text (pass result_fields to get those). tags aren't stored, so never returned.
+    DEFAULT_RESULT_FIELDS = ("id", "title", "original_url", "saved_date", "publication_date",
+                             "author", "status", "favorite")
+
+    # Extra query syntax for every parser. The plugins hold no per-query state, so one set is shared by all parsers.
+    _PLUGINS = (
+        GtLtPlugin(),                                         # For date/numeric range searches (e.g. saved_date:>YYYY-MM-DD)
+        EpochDatePlugin(("publication_date", "saved_date")),  # Dates in those queries -> epoch seconds
+        FuzzyTermPlugin(),                                    # For fuzzy searches (e.g. term~)
+        WildcardPlugin(),                                     # For wildcard searches (e.g. wild*card)
+    )
+
     def __init__(self, fs_manager: 'FileSystemManager'):
         self.fs_manager = fs_manager
         self.index_dir: Path = self.fs_manager.search_index_dir # Provided by FileSystemManager
+        self._schema_stale = False # Set by _open_or_create_index when the on-disk field types differ from SCHEMA
         self.ix: Optional[index.Index] = self._open_or_create_index()
+        # Separate read-only handle used for every searcher; self.ix is only used for writers, so searches never
+        # touch the writable storage or its lock.
+        self.ix_ro: Optional[index.Index] = self._open_readonly_index() if self.ix is not None else None
+        # Query parsers by searched-field tuple; building one (plugins, schema walk) is costly next to a short query
+        self._parser_cache: Dict[Tuple[str, ...], MultifieldParser] = {}
+        # One long-lived searcher, reopened only after a commit changed the index (see _shared_searcher).
+        self._searcher: Optional[Searcher] = None
+        self._searcher_gen: int = -1
+        self._index_gen: int = 0 # Bumped after every commit/rebuild
+        self._searcher_lock = threading.RLock()
+        # add_or_update_article/delete_article enqueue (op, payload) and return; a single writer thread owns
+        # the index writer, applies ops in batches and commits (see COMMIT_*), so callers never contend for the lock.
+        self._ops: "queue.Queue[tuple]" = queue.Queue()
+        # id -> content digest of the latest queued/committed version, filled lazily from the stored content_hash.
+        # Dropped again for ops whose commit fails, so the next save retries them.
+        self._hash_cache: Dict[str, str] = {}
+        self._writer_thread: Optional[threading.Thread] = None
+        if self.ix is not None:
+            self._writer_thread = threading.Thread(target=self._writer_loop, name="search-index-writer", daemon=True)
+            self._writer_thread.start()
+        if self._schema_stale and self.ix is not None:
+            # Old segments would keep their field types next to newly written docs (e.g. DATETIME vs NUMERIC
+            # dates), breaking date queries and sorting; re-index the library under the current schema.
+            # Built off the event loop (see PurseApp._init_search_async), so the rebuild doesn't block the UI.
+            logger.warning("🟡 Search index schema is out of date; rebuilding it from the library.")
+            self.rebuild_index(self.fs_manager.iter_articles())
         if self.ix is None:
             logger.error("🛑 Whoosh index could not be opened or created. Search functionality will be disabled.")
             # Application might need to handle this more gracefully, e.g. by disabling search UI elements.
@@ -54,125 +311,316 @@ class SearchManager:
             if index.exists_in(self.index_dir):
                 logger.info(f"🟢 Opening existing Whoosh index at {self.index_dir}")
                 # Pass schema to handle potential evolution, though Whoosh typically loads existing schema.
-                # Using a timeout for opening the index to prevent indefinite blocking if index is locked/corrupted.
-                return index.open_dir(self.index_dir, schema=self.SCHEMA, timeout=5.0)
+                # (open_dir takes no lock, so there is nothing to time out here; writers wait on the lock.)
+                try:
+                    on_disk_schema = index.open_dir(self.index_dir).schema
+                except Exception: # The pickled schema may reference analyzer classes that have since moved
+                    on_disk_schema = None
+                self._schema_stale = on_disk_schema is None or self._schema_differs(on_disk_schema)
+                return index.open_dir(self.index_dir, schema=self.SCHEMA)
             else:
                 logger.info(f"🟢 Creating new Whoosh index at {self.index_dir}")
                 return index.create_in(self.index_dir, self.SCHEMA)
-        except WhooshError as e: # Catch Whoosh-specific errors like LockError
+        except (LockError, WhooshIndexError) as e: # Whoosh-specific errors (locked or unreadable index)
             logger.error(f"🛑 Whoosh specific error opening/creating index at {self.index_dir}: {e}")
             return None
         except Exception as e: # Catch other unexpected errors
             logger.error(f"🛑 Unexpected error opening/creating Whoosh index at {self.index_dir}: {e}")
             return None
 
+    @classmethod
+    def _schema_differs(cls, on_disk_schema: Schema) -> bool:
+        """True if a field of SCHEMA is missing from on_disk_schema or has another field type there."""
+        for name, field in cls.SCHEMA.items():
+            if name not in on_disk_schema or type(on_disk_schema[name]) is not type(field):
+                return True
+        return False
 
-    def _get_datetime_obj_from_iso(self, iso_timestamp_str: Optional[str]) -> Optional[datetime]:
-        """Safely converts an ISO timestamp string to a datetime object."""
-        if not iso_timestamp_str:
-            return None
+    def _open_readonly_index(self) -> Optional[index.Index]:
         try:
-            return common.parse_iso_timestamp(iso_timestamp_str)
-        except ValueError:
-            logger.warning(f"🟡 Could not parse ISO timestamp string: '{iso_timestamp_str}' for Whoosh indexing.")
-            return None
+            return index.open_dir(self.index_dir, readonly=True, schema=self.SCHEMA)
+        except Exception as e:
+            logger.warning(f"🟡 Could not open read-only search index handle, searching via the writable one: {e}")
+            return self.ix
+
+    def _get_epoch_from_iso(self, iso_timestamp_str: Optional[str]) -> Optional[int]:
+        """Safely converts an ISO timestamp string to Unix epoch seconds."""
+        return _get_epoch_from_iso(iso_timestamp_str)
 
     def _prepare_article_doc(self, article: Article) -> Dict[str, Any]:
         """Helper function to prepare a dictionary of fields for Whoosh from an Article object."""
-        notes_text = article.get_notes()
-        
-        # Extract highlights and clean them (remove markup)
-        raw_highlights_list = MarkdownHandler.extract_highlights(article.markdown_content)
-        cleaned_highlights_text_parts = []
-        for hl_text in raw_highlights_list:
-            # Basic cleaning: remove start/end tags if they are part of the extracted string.
-            # MarkdownHandler.extract_highlights should return the text *between* the tags.
-            # So, no further cleaning of tags themselves should be needed here for `cleaned_highlights_text_parts`.
-            cleaned_highlights_text_parts.append(hl_text) 
-        cleaned_highlights_text_for_field = " ".join(cleaned_highlights_text_parts)
-
-        main_content_text = article.get_content_without_notes()
-        
-        # Full searchable content for the 'content' field
-        # Combines main body, notes, and the (already cleaned) text of highlights.
-        full_searchable_content = f"{main_content_text}\n\n{notes_text}\n\n{cleaned_highlights_text_for_field}"
-
-        doc = {
-            "id": article.id,
-            "original_url": article.original_url,
-            "title": article.title,
-            "content": full_searchable_content.strip(),
-            "tags": ",".join(article.tags).lower() if article.tags else "",
-            "author": ",".join(article.author).lower() if article.author else "", # Assuming author list is stored as strings
-            "publication_name": article.publication_name,
-            "publication_date": self._get_datetime_obj_from_iso(article.publication_date),
-            "saved_date": self._get_datetime_obj_from_iso(article.saved_date), # Should always exist
-            "status": article.status,
-            "favorite": article.favorite,
-            "notes": notes_text.strip(),
-            "highlights": cleaned_highlights_text_for_field.strip()
-        }
-        # Remove keys where value is None, as Whoosh might not handle them well for all field types
-        # (especially DATETIME if None is passed).
-        return {k: v for k, v in doc.items() if v is not None}
+        return _prepare_article_doc(article)
+
+
+    def _writer_loop(self) -> None:
+        """Writer thread: collects ops for up to COMMIT_DELAY_SECONDS / COMMIT_MAX_PENDING_OPS, then applies and commits them."""
+        while True:
+            batch = [self._ops.get()]
+            deadline = time.monotonic() + COMMIT_DELAY_SECONDS
+            while len(batch) < COMMIT_MAX_PENDING_OPS and batch[-1][0] not in ('flush', 'stop'):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._ops.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            ops: List[tuple] = []
+            for op, payload in batch:
+                if op == 'update_many': # From add_or_update_bulk: committed together with the rest of the batch
+                    ops.extend(('update', doc) for doc in payload)
+                elif op in ('update', 'delete'):
+                    ops.append((op, payload))
+            self._apply_batch(ops)
+            for op, payload in batch:
+                if op == 'optimize':
+                    self._optimize()
+                elif op == 'flush':
+                    payload.set() # Wake the flush() caller: everything queued before it is committed
+                elif op == 'stop':
+                    return
+
+    def _open_writer(self) -> Optional[IndexWriter]:
+        """Opens an index writer, backing off while the lock is busy (LockError). None if it stays busy."""
+        delay = WRITER_LOCK_BACKOFF_SECONDS
+        for attempt in range(WRITER_LOCK_RETRIES):
+            ix = self.ix
+            if ix is None:
+                return None
+            try:
+                return ix.writer()
+            except LockError:
+                if attempt == WRITER_LOCK_RETRIES - 1:
+                    break
+                time.sleep(delay)
+                delay = min(delay * 2, WRITER_LOCK_BACKOFF_MAX_SECONDS)
+        logger.error(f"🛑 Search index at {self.index_dir} stayed locked; dropping pending updates.")
+        return None
+
+    def _apply_batch(self, ops: List[tuple]) -> None:
+        if not ops:
+            return
+        writer = self._open_writer()
+        if writer is None: # Updates are dropped: forget their digests so the next save reindexes them
+            self._forget_digests(ops)
+            return
+        try:
+            for op, payload in ops:
+                if op == 'update':
+                    writer.update_document(**payload) # update_document needs kwargs
+                else:
+                    writer.delete_by_term('id', payload)
+            writer.commit(merge=False) # Leave segment merging to a later (rebuild/optimize) pass
+            self._index_gen += 1 # Next search reopens the searcher to see this commit
+            logger.debug(f"Search index commit: {len(ops)} ops.")
+        except Exception as e:
+            logger.error(f"🛑 Error applying {len(ops)} search index updates: {e}")
+            try: writer.cancel()
+            except Exception: pass
+            self._forget_digests(ops) # So these articles are reindexed on their next save
+
+    def _forget_digests(self, ops: List[tuple]) -> None:
+        for op, payload in ops:
+            self._hash_cache.pop(payload["id"] if op == 'update' else payload, None)
+
+    def _optimize(self) -> None:
+        writer = self._open_writer()
+        if writer is None:
+            return
+        try:
+            writer.commit(optimize=True) # Merges all segments into one
+            self._index_gen += 1
+            logger.info("🟢 Search index optimized.")
+        except Exception as e:
+            logger.error(f"🛑 Error optimizing search index: {e}")
+            try: writer.cancel()
+            except Exception: pass
+
+    def optimize_index(self) -> None:
+        """
+        Queues a merge of all index segments (e.g. the per-process ones left by rebuild_index) for the writer thread.
+        Optional: searches work across segments and Whoosh merges small ones as later commits happen.
+        """
+        if self._writer_thread is None or not self._writer_thread.is_alive():
+            logger.warning("🟡 Search index not available. Cannot optimize.")
+            return
+        self._ops.put(('optimize', None))
+
+    def flush(self) -> None:
+        """Blocks until everything queued so far is committed, instead of within COMMIT_DELAY_SECONDS."""
+        if self._writer_thread is None or not self._writer_thread.is_alive():
+            return
+        done = threading.Event()
+        self._ops.put(('flush', done))
+        if not done.wait(WRITER_FLUSH_TIMEOUT_SECONDS):
+            logger.warning("🟡 Timed out waiting for pending search index updates to commit.")
 
+    def _indexed_digest(self, article_id: str) -> Optional[str]:
+        """The content_hash stored with the article's indexed doc, or None if it isn't indexed (or predates the field)."""
+        try:
+            with self._shared_searcher() as searcher:
+                return self._stored_digest(searcher, article_id)
+        except Exception as e:
+            logger.debug(f"Could not read indexed content hash for {article_id}: {e}")
+            return None
+
+    @staticmethod
+    def _stored_digest(searcher: Searcher, article_id: str) -> Optional[str]:
+        """_indexed_digest with a searcher the caller already holds (see _shared_searcher)."""
+        try:
+            docnum = searcher.document_number(id=article_id)
+            return None if docnum is None else searcher.stored_fields(docnum).get("content_hash")
+        except Exception as e:
+            logger.debug(f"Could not read indexed content hash for {article_id}: {e}")
+            return None
 
     def add_or_update_article(self, article: Article) -> None:
         if not self.ix:
             logger.warning("🟡 Search index not available. Cannot add/update article.")
             return
         
-        logger.debug(f"Indexing article: {article.id} - {article.title}")
+        doc_data = self._doc_if_changed(article, self._indexed_digest)
+        if doc_data is not None:
+            self._ops.put(('update', doc_data)) # Applied and committed by the writer thread
+            logger.info(f"🟢 Article '{article.title}' (ID: {article.id}) queued for indexing.")
+
+    def add_or_update_bulk(self, articles: Iterable[Article]) -> bool:
+        """
+        add_or_update_article for many articles (e.g. an import): the unchanged-content checks share one
+        searcher, and the changed articles go to the writer thread as a single op, applied in one commit.
+        Returns False if the index is unavailable or not every article could be checked.
+        """
+        if not self.ix:
+            logger.warning("🟡 Search index not available. Cannot add/update articles.")
+            return False
+
+        ok = True
+        docs: List[Dict[str, Any]] = []
+        try:
+            with self._shared_searcher() as searcher:
+                for article in articles:
+                    doc_data = self._doc_if_changed(article, lambda article_id: self._stored_digest(searcher, article_id))
+                    if doc_data is not None:
+                        docs.append(doc_data)
+        except Exception as e: # Opening the searcher failed; queue what was prepared so far
+            logger.error(f"🛑 Error checking articles against the search index: {e}")
+            ok = False
+        if docs:
+            self._ops.put(('update_many', docs))
+            logger.info(f"🟢 {len(docs)} articles queued for indexing.")
+        return ok
+
+    def _doc_if_changed(self, article: Article, indexed_digest: Callable[[str], Optional[str]]) -> Optional[Dict[str, Any]]:
+        """
+        The article's index document, or None if its content matches what is already indexed/queued (or it
+        failed to prepare). Records the new digest in _hash_cache.
+        """
         try:
-            writer = AsyncWriter(self.ix) # Using AsyncWriter as per workplan
-            doc_data = self._prepare_article_doc(article)
-            writer.update_document(**doc_data) # update_document needs kwargs
-            writer.commit() # Consider committing in batches if many updates happen rapidly.
-            logger.info(f"🟢 Article '{article.title}' (ID: {article.id}) indexed/updated.")
+            digest = _article_index_digest(article)
+            known = self._hash_cache.get(article.id)
+            if known is None:
+                known = indexed_digest(article.id)
+            if known == digest:
+                self._hash_cache[article.id] = digest
+                logger.debug(f"Article {article.id} unchanged since it was indexed; skipping reindex.")
+                return None
+            logger.debug(f"Indexing article: {article.id} - {article.title}")
+            doc_data = _prepare_article_doc(article, digest)
+            # Recorded at enqueue time (not after commit) so a later save of an older version isn't skipped
+            # while this one is still pending; _apply_batch drops it again if the commit fails.
+            self._hash_cache[article.id] = digest
+            return doc_data
         except Exception as e:
             logger.error(f"🛑 Error indexing article {article.id} ('{article.title}'): {e}")
+            return None
 
     def delete_article(self, article_id: str) -> None:
         if not self.ix:
             logger.warning("🟡 Search index not available. Cannot delete article.")
             return
         try:
-            writer = AsyncWriter(self.ix)
-            writer.delete_by_term('id', article_id)
-            writer.commit()
-            logger.info(f"🟢 Article ID '{article_id}' deleted from index.")
+            self._hash_cache.pop(article_id, None)
+            self._ops.put(('delete', article_id))
+            logger.info(f"🟢 Article ID '{article_id}' queued for deletion from index.")
         except Exception as e:
             logger.error(f"🛑 Error deleting article ID {article_id} from index: {e}")
             
-    def rebuild_index(self, articles: List[Article]) -> None:
-        """Clears and rebuilds the entire index from a list of articles."""
+    def rebuild_index(self, articles: Iterable[Article]) -> None:
+        """
+        Clears and rebuilds the entire index from the given articles. Any iterable works and is consumed
+        lazily; pass FileSystemManager.iter_articles() to avoid loading the whole library at once.
+        """
         if not self.index_dir.exists(): # Should have been created by __init__
              self.index_dir.mkdir(parents=True, exist_ok=True)
 
         logger.info(f"Rebuilding search index at {self.index_dir}...")
+        self.flush() # Apply queued updates first so they don't race the re-created index
         try:
             # Re-create index to ensure clean state and apply current schema
+            self._close_searcher() # It reads the segments about to be replaced
             self.ix = index.create_in(self.index_dir, self.SCHEMA)
+            self._hash_cache.clear() # Repopulated lazily from the rebuilt docs' content_hash
             
-            writer = AsyncWriter(self.ix)
+            # Batch writer: parallel sub-writers each build a segment (multisegment skips the final merge).
+            writer = self.ix.writer(procs=REBUILD_WRITER_PROCS, limitmb=REBUILD_WRITER_LIMIT_MB, multisegment=True)
             count = 0
-            for article in articles:
-                doc_data = self._prepare_article_doc(article)
+            for doc_data in _prepare_article_docs(articles):
                 writer.add_document(**doc_data) # Use add_document for fresh build
                 count += 1
                 if count % 100 == 0: # Log progress every 100 articles
                     logger.info(f"Rebuild progress: {count} articles indexed...")
             
-            writer.commit() # Final commit
+            writer.commit(optimize=False) # Keep the per-process segments; optimize_index() merges them later
+            self._index_gen += 1
             logger.info(f"🟢 Search index rebuilt. {count} articles indexed.")
         except Exception as e:
             logger.error(f"🛑 CRITICAL: Failed to rebuild search index: {e}")
             # The index might be in an inconsistent state here.
             # Consider trying to re-open or fallback. For now, self.ix might be invalid.
             self.ix = None # Mark index as potentially unusable
-
-
-    def search(self, query_string: str, fields_to_search: Optional[List[str]] = None, limit: int = 20) -> List[Dict[str, Any]]:
+            self.ix_ro = None
+
+
+    def _get_parser(self, fields_to_search: List[str]) -> MultifieldParser:
+        """Parser for these fields, built on first use and then reused."""
+        key = tuple(fields_to_search)
+        parser = self._parser_cache.get(key)
+        if parser is None:
+            # PRD 5.4: "Boolean operators (AND, OR, NOT), phrase searching."
+            # QueryParser by default supports AND, OR, NOT, phrases.
+            parser = MultifieldParser(list(key), schema=self.SCHEMA)
+            for plugin in self._PLUGINS:
+                parser.add_plugin(plugin)
+            # Consider adding NgramWordAnalyzer or similar for partial word matches if needed later.
+            self._parser_cache[key] = parser
+        return parser
+
+    @contextlib.contextmanager
+    def _shared_searcher(self) -> Iterator[Searcher]:
+        """
+        Yields the cached searcher, reopening it first if the index was committed to since it was opened.
+        The lock is held while the caller uses it, so threads never share a Searcher concurrently.
+        """
+        with self._searcher_lock:
+            searcher = self._searcher
+            if searcher is None or self._searcher_gen != self._index_gen:
+                gen = self._index_gen # Read before opening: a commit landing meanwhile triggers another reopen
+                if searcher is not None:
+                    searcher.close()
+                    self._searcher = None
+                # A new searcher reads the latest TOC, so the read-only handle itself never needs reopening.
+                searcher = self._searcher = self.ix_ro.searcher() # type: ignore[union-attr]
+                self._searcher_gen = gen
+            yield searcher
+
+    def _close_searcher(self) -> None:
+        with self._searcher_lock:
+            if self._searcher is not None:
+                self._searcher.close()
+                self._searcher = None
+
+    def search(self, query_string: str, fields_to_search: Optional[List[str]] = None, limit: int = 20,
+               result_fields: Iterable[str] = DEFAULT_RESULT_FIELDS) -> List[Dict[str, Any]]:
         if not self.ix:
             logger.warning("🟡 Search index not available. Cannot perform search.")
             return []
@@ -183,15 +631,8 @@ class SearchManager:
             fields_to_search = ["title", "content", "tags", "author", "publication_name", "notes", "highlights"]
         
         try:
-            with self.ix.searcher() as searcher:
-                # PRD 5.4: "Boolean operators (AND, OR, NOT), phrase searching."
-                # QueryParser by default supports AND, OR, NOT, phrases.
-                parser = MultifieldParser(fields_to_search, schema=self.SCHEMA)
-                parser.add_plugin(GtLtPlugin())         # For date/numeric range searches (e.g. saved_date:>YYYY-MM-DD)
-                parser.add_plugin(FuzzyTermPlugin())    # For fuzzy searches (e.g. term~)
-                parser.add_plugin(WildcardPlugin())     # For wildcard searches (e.g. wild*card)
-                # Consider adding NgramWordAnalyzer or similar for partial word matches if needed later.
-
+            with self._shared_searcher() as searcher:
+                parser = self._get_parser(fields_to_search)
                 query = parser.parse(query_string)
                 results = searcher.search(query, limit=limit) # Add sort order options later if needed
                 
@@ -200,8 +641,9 @@ class SearchManager:
 
                 found_articles_data: List[Dict[str, Any]] = []
                 for hit in results:
-                    # Store all stored fields from the hit
-                    article_data = {k: v for k, v in hit.items()} # hit.fields() also works
+                    # Copy only the requested stored fields from the hit
+                    stored = hit.fields()
+                    article_data = {f: stored[f] for f in result_fields if f in stored}
                     article_data['score'] = hit.score # Add relevance score
                     found_articles_data.append(article_data)
                 
@@ -219,32 +661,32 @@ class SearchManager:
             return ids
             
         try:
-            with self.ix.reader() as reader:
-                # Iterate over all documents in the index
-                for docnum in reader.all_doc_ids(): # This gives internal doc numbers
-                    stored_fields = reader.stored_fields(docnum) # Fetch stored fields for that doc
-                    if stored_fields and 'id' in stored_fields:
-                        ids.append(stored_fields['id'])
-            return ids
+            with self._shared_searcher() as searcher:
+                reader = searcher.reader()
+                # 'id' is a unique ID field, so its term dictionary is exactly the set of ids: one sequential
+                # scan instead of a stored-fields read per document.
+                terms = reader.lexicon('id')
+                if not reader.has_deletions():
+                    return [t.decode('utf-8') if isinstance(t, bytes) else t for t in terms]
+                # Terms of deleted (not yet merged) docs linger in the dictionary; postings skip deleted docs.
+                return [t.decode('utf-8') if isinstance(t, bytes) else t
+                        for t in terms if reader.postings('id', t).is_active()]
         except Exception as e:
             logger.error(f"🛑 Error retrieving all indexed article IDs: {e}")
             return []
 
 
-    def find_similar_articles(self, article_id: str, num_recommendations: int = 5) -> List[Dict[str, Any]]:
+    def find_similar_articles(self, article_id: str, num_recommendations: int = 5,
+                              result_fields: Iterable[str] = DEFAULT_RESULT_FIELDS) -> List[Dict[str, Any]]:
         """Finds similar articles based on shared keywords in content/tags."""
         if not self.ix:
             logger.warning("🟡 Search index not available. Cannot find similar articles.")
             return []
 
         try:
-            with self.ix.searcher() as searcher:
-                docnum = None
-                # Find the internal document number for the given article_id
-                for dn in searcher.document_numbers(id=article_id): # Iterate as id is unique
-                    docnum = dn
-                    break 
-                
+            with self._shared_searcher() as searcher:
+                # Find the internal document number for the given article_id (id is unique: one term lookup)
+                docnum = searcher.document_number(id=article_id)
                 if docnum is None:
                     logger.warning(f"🟡 Article ID {article_id} not found in index for similarity search.")
                     return []
@@ -255,14 +697,24 @@ class SearchManager:
                 # Using 'content' field for similarity, as it's comprehensive.
                 # `top` for more_like should be num_recommendations + 1 if the source doc itself is included.
                 # Let's fetch a bit more to be safe and filter.
-                results = searcher.more_like(docnum, fieldname="content", top=num_recommendations + 5)
+                # Docs indexed before 'content' got a vector still carry it as a stored field; use that text instead.
+                legacy_text = None
+                if not searcher.reader().has_vector(docnum, "content"):
+                    legacy_text = searcher.stored_fields(docnum).get("content")
+                    if not legacy_text:
+                        logger.warning(f"🟡 Article ID {article_id} has no indexed content vector; rebuild the index for similarity search.")
+                        return []
+                # numterms bounds the generated OR query to the document's strongest terms, whatever its length.
+                results = searcher.more_like(docnum, fieldname="content", text=legacy_text, top=num_recommendations + 5,
+                                             numterms=SIMILAR_ARTICLES_NUM_TERMS)
                 
                 similar_articles_data: List[Dict[str, Any]] = []
                 for hit in results:
                     if hit['id'] == article_id: # Don't recommend the article itself
                         continue
                     if len(similar_articles_data) < num_recommendations:
-                        article_data = {k: v for k, v in hit.items()}
+                        stored = hit.fields()
+                        article_data = {f: stored[f] for f in result_fields if f in stored}
                         article_data['score'] = hit.score # Similarity score
                         similar_articles_data.append(article_data)
                     else:
@@ -277,7 +729,15 @@ class SearchManager:
     def close_index(self) -> None:
         """Closes the Whoosh index, if open."""
         if self.ix:
+            if self._writer_thread is not None and self._writer_thread.is_alive():
+                self._ops.put(('stop', None)) # Writer thread commits what's queued, then exits
+                self._writer_thread.join(WRITER_FLUSH_TIMEOUT_SECONDS)
+            self._writer_thread = None
+            self._close_searcher()
             logger.info(f"Closing Whoosh index at {self.index_dir}")
+            if self.ix_ro is not None and self.ix_ro is not self.ix:
+                self.ix_ro.close()
+            self.ix_ro = None
             self.ix.close()
             self.ix = None
 
@@ -323,6 +783,7 @@ if __name__ == '__main__':
         # Test add_or_update_article
         search_mgr.add_or_update_article(article1)
         search_mgr.add_or_update_article(article2)
+        search_mgr.flush() # Commits are debounced; make the updates searchable right away
 
         # Test search
         logger.info("\n--- Searching for 'Python' ---")
@@ -353,6 +814,7 @@ if __name__ == '__main__':
         # Test delete_article
         logger.info("\n--- Deleting 'uuid1' ---")
         search_mgr.delete_article('uuid1')
+        search_mgr.flush()
         all_ids_after_delete = search_mgr.get_all_indexed_article_ids()
         logger.info(f"All IDs after delete: {all_ids_after_delete}")
         assert 'uuid1' not in all_ids_after_delete
@@ -105,14 +105,14 @@ class SyncManager:
         """
         cloud_files: Dict[str, CloudFileMetadata] = {}
         try:
-            # list_folder with "" path lists the app's configured root folder.
-            # recursive=True gets all files in subdirectories as well.
-            async for cloud_meta in self.cloud_service.list_folder("", recursive=True):
+            # list_tree yields everything under the app's configured root folder, subdirectories included.
+            # Providers with a change feed (OneDrive delta) serve it from a local snapshot.
+            async for cloud_meta in self.cloud_service.list_tree():
                 # Filter for .md files and skip hidden or folder items
                 if not cloud_meta.is_folder and cloud_meta.name.endswith(".md") and \
                    not cloud_meta.name.startswith('.'):
                     # cloud_meta.path_display is already relative to the app's cloud root
-                    # as per BaseCloudService.list_folder yielding it this way.
+                    # as per BaseCloudService.list_tree yielding it this way.
                     cloud_files[cloud_meta.path_display] = cloud_meta
         except Exception as e:
             logger.error(f"🛑 Error listing cloud files for sync: {e}", exc_info=True)
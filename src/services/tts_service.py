@@ -1,20 +1,50 @@
 import pyttsx3
 import logging
 import asyncio
-from typing import Optional, List, Dict, Any, Callable # Added Callable for type hint if needed
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
+from typing import Optional, List, Dict, Any, Callable, Tuple # Added Callable for type hint if needed
 
 logger = logging.getLogger(__name__)
 
+# Flattens line breaks/tabs in the text excerpt logged per utterance (one C-level pass)
+_LOG_SANITIZE = str.maketrans({'\n': ' ', '\r': ' ', '\t': ' '})
+
+# Fetches a pyttsx3.Voice's fields in one C-level call (see get_available_voices)
+_VOICE_ATTRS = attrgetter('id', 'name', 'languages', 'gender', 'age')
+
 class TTSService:
+    # Fixed attribute set: no per-instance __dict__, and attribute reads (e.g. is_speaking) are direct slot loads.
+    __slots__ = (
+        'engine', 'is_speaking', 'current_spoken_text', '_run_and_wait_task', '_tts_executor', '_loop',
+        '_queue', '_worker_task', '_voices_cache', '_last_props', '_idle_event', '_speak_lock',
+    )
+
     def __init__(self):
         self.engine: Optional[pyttsx3.Engine] = None
         self.is_speaking: bool = False
         self.current_spoken_text: Optional[str] = None
-        self._run_and_wait_task: Optional[asyncio.Task] = None # To manage the asyncio task for runAndWait
+        self._run_and_wait_task: Optional[asyncio.Future] = None # To manage the executor future for runAndWait
+        # speak() enqueues (text, props) and returns; _worker (started on first speak) plays them in order.
+        self._queue: "asyncio.Queue[Tuple[str, Dict[str, Any]]]" = asyncio.Queue()
+        self._worker_task: Optional[asyncio.Task] = None
+        self._voices_cache: Optional[List[Dict[str, Any]]] = None # Filled by the first get_available_voices()
+        # Last value sent to the engine per property ('voice'/'rate'/'volume'); repeats skip the native setProperty.
+        self._last_props: Dict[str, Any] = {}
+        # The app's event loop, bound on first async use (see _get_loop); engine callbacks hand state changes to it.
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Set while nothing is being spoken or queued; shutdown() waits on it.
+        self._idle_event = asyncio.Event()
+        self._idle_event.set()
+        # Serializes speak() and stop(): queueing new text never interleaves with stop() dropping the queue.
+        self._speak_lock = asyncio.Lock()
+        # pyttsx3 engines aren't thread-safe and some drivers must stay on the thread that created them: the engine
+        # is created on, and driven from, this one dedicated thread (not the default executor shared with to_thread).
+        self._tts_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="purse-tts")
 
         try:
             logger.debug("Initializing TTS engine (pyttsx3)...")
-            self.engine = pyttsx3.init()
+            self.engine = self._tts_executor.submit(pyttsx3.init).result()
             if self.engine:
                 # Connect engine events to callbacks
                 self.engine.connect('finished-utterance', self._on_speech_finish_sync)
@@ -27,185 +57,216 @@ class TTSService:
                 # but returns None, though it typically raises RuntimeError on failure.
                 logger.error("🛑 pyttsx3.init() returned None. TTS will be unavailable.")
         except RuntimeError as e: # pyttsx3.init() can raise RuntimeError
-            logger.error(f"🛑 Failed to initialize TTS engine (pyttsx3): {e}. TTS will be unavailable.", exc_info=True)
+            logger.error("🛑 Failed to initialize TTS engine (pyttsx3): %s. TTS will be unavailable.", e, exc_info=True)
             self.engine = None # Ensure engine is None if init fails
         except Exception as e: # Catch any other unexpected init errors
-            logger.error(f"🛑 An unexpected error occurred during TTS engine initialization: {e}. TTS will be unavailable.", exc_info=True)
+            logger.error("🛑 An unexpected error occurred during TTS engine initialization: %s. TTS will be unavailable.", e, exc_info=True)
             self.engine = None
 
 
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """The event loop the service runs on, looked up once (the service is built before the loop runs)."""
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        return self._loop
+
+    def _mark_finished(self, completed: bool) -> None:
+        """Runs on the event loop: the current utterance ended (completed=False if interrupted or failed)."""
+        self.is_speaking = False
+        self.current_spoken_text = None
+        if self._queue.empty(): # Otherwise the worker is about to start the next utterance
+            self._idle_event.set()
+
+    def _mark_finished_threadsafe(self, completed: bool) -> None:
+        # Engine callbacks run on the TTS thread; state the event loop reads (including the asyncio.Event, which
+        # must not be set from another thread) is only changed on the loop itself.
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._mark_finished, completed)
+
     # Synchronous callbacks called by pyttsx3 engine thread
     def _on_speech_finish_sync(self, name: str, completed: bool):
         """Callback executed by pyttsx3 when an utterance finishes."""
-        logger.debug(f"TTS callback: finished-utterance (Name: {name}, Completed: {completed})")
-        if completed:
-            # These state changes should ideally be done in the main asyncio event loop
-            # if they affect asyncio-managed state or trigger UI updates.
-            # Using call_soon_threadsafe if TTSService methods are called from main loop.
-            # For now, direct state change, assuming speak/stop methods manage concurrency.
-            self.is_speaking = False
-            self.current_spoken_text = None 
-            # If there's an asyncio task running runAndWait, it should now complete.
-            # No direct way to signal it from here other than state change.
-        # If not completed (e.g. stop() was called), is_speaking is handled by stop()
+        logger.debug("TTS callback: finished-utterance (Name: %s, Completed: %s)", name, completed)
+        self._mark_finished_threadsafe(completed) # Not completed: stop() was called (it also resets the state)
 
     def _on_speech_error_sync(self, name: str, exception: Exception):
         """Callback executed by pyttsx3 on a speech error."""
-        logger.error(f"🛑 TTS callback: error (Name: {name}, Exception: {exception})")
-        self.is_speaking = False
-        self.current_spoken_text = None
+        logger.error("🛑 TTS callback: error (Name: %s, Exception: %s)", name, exception)
+        self._mark_finished_threadsafe(False)
         # If an error occurs, the runAndWait task might also terminate or hang.
         # Additional cleanup or task cancellation might be needed if runAndWait task is robustly managed.
 
     # Optional: started-utterance callback
     # def _on_speech_start_sync(self, name: str):
-    #     logger.debug(f"TTS callback: started-utterance (Name: {name})")
+    #     logger.debug("TTS callback: started-utterance (Name: %s)", name)
     #     self.is_speaking = True # Could also be set here
 
 
     async def speak(self, text: str, voice_id: Optional[str] = None, rate: Optional[int] = None, volume: Optional[float] = None) -> bool:
+        """
+        Queues text to be spoken and returns right away (True if queued). Utterances play one after another,
+        in order, via the _worker task; stop() drops whatever is still queued.
+        """
         if not self.engine:
             logger.warning("🟡 TTS engine not available. Cannot speak.")
             return False
-        
-        if self.is_speaking or (self._run_and_wait_task and not self._run_and_wait_task.done()):
-            logger.warning("🟡 TTS engine is already speaking or processing. Call stop() first or wait.")
-            return False
 
         try:
-            if voice_id: self.engine.setProperty('voice', voice_id)
-            if rate: self.engine.setProperty('rate', rate) 
-            if volume is not None: # Volume can be 0.0, so check for None explicitly
-                if 0.0 <= volume <= 1.0:
-                    self.engine.setProperty('volume', volume)
-                else:
-                    logger.warning(f"TTS volume {volume} out of range [0.0, 1.0]. Not set.")
-            
-            self.current_spoken_text = text
-            self.is_speaking = True # Set before starting the blocking task
-            logger.info(f"TTS starting to speak: \"{text[:70].replace(chr(10), ' ')}...\"")
-            
-            self.engine.say(text)
-            
-            # runAndWait is blocking. Run in a separate thread managed by asyncio.
-            # Store the task in case we need to check its status or attempt cancellation (though cancelling thread tasks is tricky).
-            loop = asyncio.get_running_loop()
-            self._run_and_wait_task = loop.create_task(asyncio.to_thread(self.engine.runAndWait))
-            
-            # Wait for the task to complete. This makes speak() effectively blocking until speech finishes or errors.
-            # If non-blocking speak is desired (fire-and-forget), don't await here.
-            # Callbacks will handle state changes.
-            # The subtask says "Return True if speech was initiated (actual completion is async via callback)"
-            # This implies speak() should return quickly. So, don't await here.
-            # The _run_and_wait_task will run in the background.
-            # Callbacks _on_speech_finish_sync and _on_speech_error_sync will update state.
-            
-            # If speak() is to return immediately:
-            # asyncio.create_task(asyncio.to_thread(self.engine.runAndWait)) # Fire and forget background task
-            # However, managing self.is_speaking becomes more critical.
-            # Let's assume the callbacks are reliable for is_speaking state.
-            # The current `is_speaking` is set to True here. Callbacks set to False.
-
-            # If self.engine.runAndWait() itself can be interrupted by self.engine.stop(),
-            # then self.is_speaking will be correctly set by stop() or callbacks.
-            # The task _run_and_wait_task is mainly to offload the blocking call.
-            
-            # No await here: return True to indicate speech was queued.
+            # Waits out a stop() in progress, so new text is queued after the old queue was dropped and the engine
+            # stopped, never in between.
+            async with self._speak_lock:
+                if self._worker_task is None or self._worker_task.done():
+                    # Started on first use: the service is constructed before the app's event loop is running.
+                    self._worker_task = self._get_loop().create_task(self._worker())
+                await self._queue.put((text, {'voice_id': voice_id, 'rate': rate, 'volume': volume}))
             return True
-
         except Exception as e:
-            logger.error(f"🛑 Error during TTS speak call for text '{text[:50]}...': {e}", exc_info=True)
-            self.is_speaking = False # Ensure reset on error during setup
-            self.current_spoken_text = None
-            if self._run_and_wait_task and not self._run_and_wait_task.done():
-                # Attempt to cancel if task was created but error occurred before it ran far
-                # This is speculative, as to_thread tasks are not directly cancellable mid-execution.
-                self._run_and_wait_task.cancel() 
+            logger.error("🛑 Error during TTS speak call for text '%s...': %s", text[:50], e, exc_info=True)
             return False
 
+    async def _worker(self) -> None:
+        """Speaks queued utterances one at a time on the TTS thread."""
+        loop = self._get_loop()
+        while True:
+            text, props = await self._queue.get()
+            if not self.engine:
+                continue
+            self.current_spoken_text = text
+            self.is_speaking = True # Set before starting the blocking call
+            self._idle_event.clear()
+            logger.info('TTS starting to speak: "%s..."', text[:70].translate(_LOG_SANITIZE))
+            try:
+                # say + runAndWait block until the utterance ends (or stop() interrupts it), so run them on the
+                # TTS thread. The future is kept so stop()/shutdown() can see whether speech is still running.
+                self._run_and_wait_task = loop.run_in_executor(self._tts_executor, self._say_blocking, text, props)
+                await self._run_and_wait_task
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("🛑 Error during TTS speech for text '%s...': %s", text[:50], e, exc_info=True)
+            finally:
+                # runAndWait has returned (or the worker is being cancelled); usually the callback got here first
+                self._mark_finished(False)
+
+    def _say_blocking(self, text: str, props: Dict[str, Any]) -> None:
+        """Runs on the TTS thread: applies per-utterance properties, then speaks the text to completion."""
+        voice_id, rate, volume = props['voice_id'], props['rate'], props['volume']
+        if voice_id: self._set_engine_property('voice', voice_id)
+        if rate: self._set_engine_property('rate', rate)
+        if volume is not None: # Volume can be 0.0, so check for None explicitly
+            if 0.0 <= volume <= 1.0:
+                self._set_engine_property('volume', volume)
+            else:
+                logger.warning("TTS volume %s out of range [0.0, 1.0]. Not set.", volume)
+        self.engine.say(text)
+        self.engine.runAndWait()
+
+    def _set_engine_property(self, name: str, value: Any) -> None:
+        # Each setProperty is a round-trip into the native driver (SAPI5/NSSS); the UI usually resends the same values.
+        if self._last_props.get(name) != value:
+            self.engine.setProperty(name, value)
+            self._last_props[name] = value
+
     async def stop(self) -> None:
         if not self.engine:
             logger.debug("TTS engine not available. Nothing to stop.")
             return
         
-        # Check is_speaking first. If pyttsx3 has a queue and isBusy(), that's more robust.
-        # pyttsx3's engine.isBusy() might be useful but not standard across all backends.
-        if self.is_speaking or (self._run_and_wait_task and not self._run_and_wait_task.done()):
-            logger.info("TTS attempting to stop speech.")
-            try:
-                # engine.stop() should clear the command queue and stop current speech.
-                # This call is synchronous.
-                await asyncio.to_thread(self.engine.stop)
-                # Some backends might need runAndWait to process the stop command fully.
-                # This is tricky. If runAndWait is already running in its task, calling it again is problematic.
-                # Typically, stop() is enough. The callback _on_speech_finish_sync should fire with completed=False.
-            except Exception as e:
-                logger.error(f"🛑 Error during TTS engine.stop(): {e}", exc_info=True)
-            finally:
-                # Ensure state is reset regardless of stop() success, as intent is to stop.
-                self.is_speaking = False
-                self.current_spoken_text = None
-                if self._run_and_wait_task and not self._run_and_wait_task.done():
-                    # If the runAndWait task is still around (e.g., stop() didn't make it exit quickly),
-                    # cancelling it might be attempted, though direct cancellation of to_thread task is not effective.
-                    # The task should complete once runAndWait finishes (due to stop or natural end).
-                    logger.debug("TTS runAndWait task might still be finishing up after stop().")
-        else:
-            logger.debug("TTS not speaking or no active speech task. Nothing to stop.")
-
-
-    def get_available_voices(self) -> List[Dict[str, Any]]:
+        # Held for the whole stop so a concurrent speak() can't queue text that this stop then drops or cuts off.
+        async with self._speak_lock:
+            # Drop utterances that haven't started yet, so stopping doesn't just move on to the next one.
+            while not self._queue.empty():
+                self._queue.get_nowait()
+
+            # Check is_speaking first. If pyttsx3 has a queue and isBusy(), that's more robust.
+            # pyttsx3's engine.isBusy() might be useful but not standard across all backends.
+            if self.is_speaking or (self._run_and_wait_task and not self._run_and_wait_task.done()):
+                logger.info("TTS attempting to stop speech.")
+                try:
+                    # engine.stop() should clear the command queue and stop current speech.
+                    # This call is synchronous. It deliberately bypasses the TTS thread: that thread is busy inside
+                    # runAndWait while speaking, and stop() is the one call pyttsx3 expects from another thread.
+                    await asyncio.to_thread(self.engine.stop)
+                    # Some backends might need runAndWait to process the stop command fully.
+                    # This is tricky. If runAndWait is already running in its task, calling it again is problematic.
+                    # Typically, stop() is enough. The callback _on_speech_finish_sync should fire with completed=False.
+                except Exception as e:
+                    logger.error("🛑 Error during TTS engine.stop(): %s", e, exc_info=True)
+                finally:
+                    # Ensure state is reset regardless of stop() success, as intent is to stop.
+                    self.is_speaking = False
+                    self.current_spoken_text = None
+                    if self._run_and_wait_task and not self._run_and_wait_task.done():
+                        # If the runAndWait task is still around (e.g., stop() didn't make it exit quickly),
+                        # cancelling it might be attempted, though direct cancellation of to_thread task is not effective.
+                        # The task should complete once runAndWait finishes (due to stop or natural end).
+                        logger.debug("TTS runAndWait task might still be finishing up after stop().")
+            else:
+                logger.debug("TTS not speaking or no active speech task. Nothing to stop.")
+
+
+    async def get_available_voices(self) -> List[Dict[str, Any]]:
+        """
+        Installed voices as dicts. Enumerated once (a round-trip into the OS speech service) and then served
+        from a cache, since voices don't change while the app runs; see invalidate_voices_cache().
+        """
         if not self.engine:
             logger.warning("🟡 TTS engine not available. Cannot get voices.")
             return []
+        if self._voices_cache is not None:
+            return self._voices_cache
         
-        voices_data: List[Dict[str, Any]] = []
         try:
-            voices = self.engine.getProperty('voices')
-            for voice in voices:
-                # Common attributes: id, name. Others might not be present on all platforms/engines.
-                lang_list: List[str] = []
-                # voice.languages is not a standard pyttsx3 attribute, handle potential AttributeError
-                if hasattr(voice, 'languages') and isinstance(voice.languages, list):
-                    lang_list = [str(lang) for lang in voice.languages] # Ensure strings
-
-                voices_data.append({
-                    'id': str(voice.id),
-                    'name': str(getattr(voice, 'name', 'Unknown Name')),
-                    'languages': lang_list,
-                    'gender': str(getattr(voice, 'gender', 'Unknown Gender')),
-                    'age': getattr(voice, 'age', None) # Age might be int or None
-                })
+            # On the TTS thread, like every other engine call; awaiting keeps the event loop free meanwhile.
+            voices = await self._get_loop().run_in_executor(self._tts_executor, self.engine.getProperty, 'voices')
+            # pyttsx3.Voice always defines these attributes (None when the driver doesn't know the value);
+            # languages isn't reliably a list on every driver, so anything else is reported as no languages.
+            voices_data: List[Dict[str, Any]] = [
+                {
+                    'id': str(voice_id),
+                    'name': str(name) if name else 'Unknown Name',
+                    'languages': [str(lang) for lang in languages] if isinstance(languages, list) else [],
+                    'gender': str(gender) if gender else 'Unknown Gender',
+                    'age': age, # Age might be int or None
+                }
+                for voice_id, name, languages, gender, age in map(_VOICE_ATTRS, voices)
+            ]
+            self._voices_cache = voices_data
             return voices_data
         except Exception as e:
-            logger.error(f"🛑 Could not retrieve TTS voices: {e}", exc_info=True)
+            logger.error("🛑 Could not retrieve TTS voices: %s", e, exc_info=True)
             return []
 
+    def invalidate_voices_cache(self) -> None:
+        """Makes the next get_available_voices() enumerate voices again (e.g. after installing new ones)."""
+        self._voices_cache = None
+
     def set_property(self, name: str, value: Any) -> None:
         if not self.engine:
-            logger.warning(f"🟡 TTS engine not available. Cannot set property '{name}'.")
+            logger.warning("🟡 TTS engine not available. Cannot set property '%s'.", name)
             return
         try:
             self.engine.setProperty(name, value)
-            logger.debug(f"TTS property '{name}' set to '{value}'.")
+            self._last_props[name] = value # Keep _say_blocking's skip-if-unchanged check accurate
+            logger.debug("TTS property '%s' set to '%s'.", name, value)
         except Exception as e:
-            logger.error(f"🛑 Error setting TTS property '{name}' to '{value}': {e}", exc_info=True)
+            logger.error("🛑 Error setting TTS property '%s' to '%s': %s", name, value, e, exc_info=True)
 
     async def shutdown(self):
         """Cleanly stop any ongoing speech and prepare for app exit."""
         logger.info("Shutting down TTS service...")
-        if self.is_speaking:
+        if self.is_speaking or not self._queue.empty():
             await self.stop()
-        # Wait for the run_and_wait_task to finish if it exists
-        if self._run_and_wait_task and not self._run_and_wait_task.done():
-            logger.debug("Waiting for TTS runAndWait task to complete during shutdown...")
+        # Wait for the utterance in progress to wind down (stop() only asks the engine to stop)
+        if not self._idle_event.is_set():
+            logger.debug("Waiting for TTS speech to finish during shutdown...")
             try:
-                await asyncio.wait_for(self._run_and_wait_task, timeout=2.0) # Wait a bit
+                await asyncio.wait_for(self._idle_event.wait(), timeout=2.0) # Wait a bit
             except asyncio.TimeoutError:
-                logger.warning("TTS runAndWait task did not complete within timeout during shutdown.")
-            except Exception as e:
-                logger.error(f"Error waiting for TTS task during shutdown: {e}")
+                logger.warning("TTS speech did not finish within timeout during shutdown.")
+        if self._worker_task and not self._worker_task.done():
+            self._worker_task.cancel()
         self.engine = None # Release engine reference
+        # Don't block exit on a runAndWait that ignored stop(); the thread ends with it.
+        self._tts_executor.shutdown(wait=False, cancel_futures=True)
         logger.info("TTS service shutdown complete.")
-
-```
@@ -1,5 +1,6 @@
 # src/purse/utils/constants.py
-from typing import Dict
+from sys import intern
+from typing import Dict, Tuple
 import logging
 
 # Log Emojis (as per PRD 5.10, workplan specifies these)
@@ -15,19 +16,24 @@ LOG_EMOJI_MAP: Dict[int, str] = {
     logging.CRITICAL: LOG_EMOJI_ERROR, # CRITICAL also uses error emoji
     logging.DEBUG: LOG_EMOJI_DEBUG,
 }
+# Same emojis indexed by levelno // 10 (NOTSET, DEBUG, INFO, WARNING, ERROR, CRITICAL), for per-record lookups
+LOG_EMOJI_TUPLE: Tuple[str, ...] = tuple(LOG_EMOJI_MAP.get(i * 10, "") for i in range(logging.CRITICAL // 10 + 1))
+
+# Status, source and frontmatter key strings are interned, so comparisons/dict lookups against the values
+# Article.from_dict interns at load time resolve by identity instead of comparing characters.
 
 # Article Statuses (as per PRD 5.2)
-STATUS_UNREAD: str = "unread"
-STATUS_IN_PROGRESS: str = "in-progress"
-STATUS_READ: str = "read"
-STATUS_ARCHIVED: str = "archived"
+STATUS_UNREAD: str = intern("unread")
+STATUS_IN_PROGRESS: str = intern("in-progress")
+STATUS_READ: str = intern("read")
+STATUS_ARCHIVED: str = intern("archived")
 
 # Source Applications (as per PRD 5.2)
-SOURCE_WEB_PARSER: str = "web_parser"
-SOURCE_PDF_IMPORT: str = "pdf_import"
-SOURCE_DOCX_IMPORT: str = "docx_import"
-SOURCE_POCKET_MIGRATION: str = "pocket_migration"
-SOURCE_BOOKMARK: str = "bookmark"
+SOURCE_WEB_PARSER: str = intern("web_parser")
+SOURCE_PDF_IMPORT: str = intern("pdf_import")
+SOURCE_DOCX_IMPORT: str = intern("docx_import")
+SOURCE_POCKET_MIGRATION: str = intern("pocket_migration")
+SOURCE_BOOKMARK: str = intern("bookmark")
 
 # Default settings if settings.yml is not found or incomplete (PRD 5.3, 5.9)
 DEFAULT_FONT_FAMILY: str = "sans-serif" # Toga will resolve to platform default sans-serif
@@ -39,31 +45,34 @@ APP_NAME: str = "Purse"
 APP_AUTHOR: str = "Christopher Penn"
 APP_ID: str = "com.christopherspenn.purse" # Bundle ID / Reverse domain
 
+# Number of status bar messages kept in AppState (older ones are dropped)
+MAX_STATUS_MESSAGES: int = 200
+
 # Average words per minute for reading time estimation (PRD 5.2)
 WORDS_PER_MINUTE: int = 200
 
 # YAML Frontmatter Keys (PRD 5.2, to ensure consistency)
-KEY_ID: str = "id"
-KEY_POCKET_ID: str = "pocket_id"
-KEY_ORIGINAL_URL: str = "original_url"
-KEY_TITLE: str = "title"
-KEY_AUTHOR: str = "author"
-KEY_PUBLICATION_NAME: str = "publication_name"
-KEY_PUBLICATION_DATE: str = "publication_date"
-KEY_SAVED_DATE: str = "saved_date"
-KEY_LAST_MODIFIED_DATE: str = "last_modified_date"
-KEY_STATUS: str = "status"
-KEY_FAVORITE: str = "favorite"
-KEY_TAGS: str = "tags"
-KEY_ESTIMATED_READ_TIME: str = "estimated_read_time_minutes"
-KEY_WORD_COUNT: str = "word_count"
-KEY_LANGUAGE: str = "language"
-KEY_EXCERPT: str = "excerpt"
-KEY_SOURCE_APPLICATION: str = "source_application"
-KEY_ARCHIVED_FROM_FALLBACK: str = "archived_from_fallback"
-KEY_THUMBNAIL_URL_LOCAL: str = "thumbnail_url_local"
+KEY_ID: str = intern("id")
+KEY_POCKET_ID: str = intern("pocket_id")
+KEY_ORIGINAL_URL: str = intern("original_url")
+KEY_TITLE: str = intern("title")
+KEY_AUTHOR: str = intern("author")
+KEY_PUBLICATION_NAME: str = intern("publication_name")
+KEY_PUBLICATION_DATE: str = intern("publication_date")
+KEY_SAVED_DATE: str = intern("saved_date")
+KEY_LAST_MODIFIED_DATE: str = intern("last_modified_date")
+KEY_STATUS: str = intern("status")
+KEY_FAVORITE: str = intern("favorite")
+KEY_TAGS: str = intern("tags")
+KEY_ESTIMATED_READ_TIME: str = intern("estimated_read_time_minutes")
+KEY_WORD_COUNT: str = intern("word_count")
+KEY_LANGUAGE: str = intern("language")
+KEY_EXCERPT: str = intern("excerpt")
+KEY_SOURCE_APPLICATION: str = intern("source_application")
+KEY_ARCHIVED_FROM_FALLBACK: str = intern("archived_from_fallback")
+KEY_THUMBNAIL_URL_LOCAL: str = intern("thumbnail_url_local")
 # Optional: A potential source URL for a thumbnail, not for YAML, but for internal Article state
-KEY_POTENTIAL_THUMBNAIL_SOURCE_URL: str = "potential_thumbnail_source_url"
+KEY_POTENTIAL_THUMBNAIL_SOURCE_URL: str = intern("potential_thumbnail_source_url")
 
 
 # Markdown structure constants (PRD 5.2)
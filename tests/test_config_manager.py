@@ -0,0 +1,33 @@
+from types import MappingProxyType
+
+from src.config_manager import _freeze, _thaw
+
+
+def test_freeze_makes_lists_immutable():
+    frozen = _freeze({"onedrive": {"scopes": ["a", "b"]}, "n": 1})
+    assert type(frozen) is MappingProxyType
+    assert frozen["onedrive"]["scopes"] == ("a", "b")
+
+
+def test_thaw_restores_plain_dicts_and_lists():
+    data = {"onedrive": {"scopes": ["a", {"x": [1]}]}, "n": 1}
+    thawed = _thaw(_freeze(data))
+    assert thawed == data
+    assert type(thawed["onedrive"]["scopes"]) is list
+    assert type(thawed["onedrive"]["scopes"][1]["x"]) is list
+
+
+def test_failed_settings_save_removes_temp_file(tmp_path, monkeypatch):
+    from src import config_manager
+
+    manager = config_manager.ConfigManager()
+    settings_path = tmp_path / "settings.yml"
+    manager.load_settings(settings_path)
+    manager.settings = {"cloud": {"provider_name": "onedrive"}}
+
+    def failing_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(config_manager.os, "replace", failing_replace)
+    manager.save_settings()
+    assert list(tmp_path.iterdir()) == []
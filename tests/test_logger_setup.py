@@ -0,0 +1,19 @@
+import logging
+from types import SimpleNamespace
+
+from src import logger_setup
+
+
+def test_records_after_stop_logging_still_reach_the_log_file(tmp_path):
+    config = SimpleNamespace(get=lambda key, default=None: default)
+    root = logging.getLogger()
+    logs_dir = logger_setup.setup_logging(config, logs_base_path=tmp_path)
+    try:
+        logger_setup.stop_logging()
+        assert not any(isinstance(h, logging.handlers.QueueHandler) for h in root.handlers)
+        logging.getLogger("late").warning("logged after stop_logging")
+    finally:
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+            handler.close()
+    assert "logged after stop_logging" in (logs_dir / logger_setup.LOG_FILE_NAME).read_text(encoding="utf-8")
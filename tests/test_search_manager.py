@@ -0,0 +1,62 @@
+import pytest
+from whoosh.fields import KEYWORD, NUMERIC
+
+from src.services import search_manager
+from src.services.search_manager import NORMALIZED_KEYWORD_ANALYZER, SearchManager
+
+
+def test_schema_builds_with_normalized_keyword_fields():
+    schema = SearchManager.SCHEMA
+    for name in ("tags", "author"):
+        assert isinstance(schema[name], KEYWORD)
+        assert schema[name].analyzer is NORMALIZED_KEYWORD_ANALYZER
+    assert not schema["tags"].stored
+    assert schema["author"].stored
+
+
+def test_date_fields_are_numeric():
+    for name in ("saved_date", "publication_date"):
+        assert isinstance(SearchManager.SCHEMA[name], NUMERIC)
+
+
+def test_keyword_analyzer_lowercases_queries_only():
+    index_tokens = [t.text for t in NORMALIZED_KEYWORD_ANALYZER("Python,web dev", mode="index")]
+    query_tokens = [t.text for t in NORMALIZED_KEYWORD_ANALYZER("Python,Web Dev", mode="query")]
+    assert index_tokens == ["Python", "web dev"]
+    assert query_tokens == ["python", "web dev"]
+    assert search_manager._normalized_keyword().analyzer is NORMALIZED_KEYWORD_ANALYZER
+
+
+def test_dropped_batch_forgets_digests():
+    manager = SearchManager.__new__(SearchManager) # Writer-thread internals only; no index on disk
+    manager._hash_cache = {"a": "digest-a", "b": "digest-b", "c": "digest-c"}
+    manager._open_writer = lambda: None # Lock stayed busy
+    manager._apply_batch([("update", {"id": "a"}), ("delete", "b")])
+    assert manager._hash_cache == {"c": "digest-c"}
+
+
+def test_stale_date_fields_trigger_rebuild(tmp_path):
+    from types import SimpleNamespace
+
+    import whoosh.index
+    from whoosh.fields import DATETIME, ID, Schema
+
+    whoosh.index.create_in(tmp_path, Schema(id=ID(stored=True, unique=True), saved_date=DATETIME(stored=True)))
+    rebuilt_from = []
+    fs_manager = SimpleNamespace(search_index_dir=tmp_path, iter_articles=lambda: rebuilt_from.append(True) or iter(()))
+    manager = SearchManager(fs_manager)
+    try:
+        assert rebuilt_from == [True]
+        assert isinstance(whoosh.index.open_dir(tmp_path).schema["saved_date"], NUMERIC)
+    finally:
+        manager.close_index()
+
+
+def test_current_schema_is_not_rebuilt(tmp_path):
+    from types import SimpleNamespace
+
+    import whoosh.index
+
+    whoosh.index.create_in(tmp_path, SearchManager.SCHEMA)
+    fs_manager = SimpleNamespace(search_index_dir=tmp_path, iter_articles=lambda: pytest.fail("unexpected rebuild"))
+    SearchManager(fs_manager).close_index()